@@ -1,16 +1,49 @@
 # publicaciones_app/src/assembly.py
 
 from src.modulos.alianzas.domain.use_cases.create_contrato_use_case import CreateContratoUseCase
+from src.modulos.alianzas.domain.use_cases.create_many_contratos_use_case import CreateManyContratosUseCase
 from src.modulos.alianzas.domain.use_cases.process_revision_contrato_use_case import ProcessRevisionContratoUseCase
+from src.modulos.alianzas.domain.use_cases.get_contrato_use_case import GetContratoUseCase
+from src.modulos.alianzas.domain.use_cases.list_contratos_use_case import ListContratosUseCase
 from src.modulos.alianzas.domain.use_cases.base_use_case import BaseUseCase
 from src.modulos.alianzas.adapters.postgres.contrato_postgres_adapter import PostgresContratoRepository
+from src.modulos.sagas.infraestructura.repositorios import (
+    SagaEstadoConsultasAsync, SagaEstadisticasConsultasAsync, SagaLogRepositoryAsync
+)
 
 repository: PostgresContratoRepository = PostgresContratoRepository()
+saga_estado_consultas: SagaEstadoConsultasAsync = SagaEstadoConsultasAsync()
+saga_log_repository_async: SagaLogRepositoryAsync = SagaLogRepositoryAsync()
+saga_estadisticas_consultas: SagaEstadisticasConsultasAsync = SagaEstadisticasConsultasAsync()
 
 def build_create_contrato_use_case() -> BaseUseCase:
     """Get create contrato use case."""
     return CreateContratoUseCase(repository)
 
+def build_create_many_contratos_use_case() -> BaseUseCase:
+    """Get create many contratos use case."""
+    return CreateManyContratosUseCase(repository)
+
 def build_process_revision_contrato_use_case() -> BaseUseCase:
     """Get process revision contrato use case."""
     return ProcessRevisionContratoUseCase(repository)
+
+def build_get_contrato_use_case() -> BaseUseCase:
+    """Get contrato by id use case."""
+    return GetContratoUseCase(repository)
+
+def build_list_contratos_use_case() -> BaseUseCase:
+    """Get list contratos use case."""
+    return ListContratosUseCase(repository)
+
+def build_saga_estado_consultas() -> SagaEstadoConsultasAsync:
+    """Get saga state queries."""
+    return saga_estado_consultas
+
+def build_saga_log_repository_async() -> SagaLogRepositoryAsync:
+    """Get async saga log repository."""
+    return saga_log_repository_async
+
+def build_saga_estadisticas_consultas() -> SagaEstadisticasConsultasAsync:
+    """Get saga outcome statistics queries."""
+    return saga_estadisticas_consultas
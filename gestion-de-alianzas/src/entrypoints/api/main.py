@@ -6,6 +6,9 @@ import logging
 from src.exceptions import setup_exception_handlers
 from src.config import Settings
 from src.entrypoints.api.routers.contrato_router import router as contrato_router
+from src.entrypoints.api.routers.contrato_query_router import router as contrato_query_router
+from src.entrypoints.api.routers.saga_router import router as saga_router
+from src.entrypoints.api.routers.metricas_router import router as metricas_router
 from src.modulos.alianzas.infrastructure.pulsar_integration import PulsarContratoConsumer, PulsarContratoPublisher
 from src.modulos.alianzas.infrastructure.revision_contrato_consumer import RevisionContratoConsumer
 from src.modulos.alianzas.adapters.postgres.contrato_postgres_adapter import PostgresContratoRepository
@@ -81,4 +84,7 @@ app = FastAPI(
 )
 
 app.include_router(contrato_router)
+app.include_router(contrato_query_router)
+app.include_router(saga_router)
+app.include_router(metricas_router)
 setup_exception_handlers(app)
\ No newline at end of file
@@ -0,0 +1,77 @@
+# gestion-de-alianzas/src/entrypoints/api/routers/contrato_query_router.py
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+
+from src.assembly import build_get_contrato_use_case, build_list_contratos_use_case
+from src.entrypoints.api.routers.paginacion import codificar_cursor, decodificar_cursor
+from src.modulos.alianzas.domain.models.contrato import Contrato, EstadoContrato, TipoContrato
+from src.modulos.alianzas.domain.ports.contrato_repository_port import cursor_of
+from src.modulos.alianzas.domain.use_cases.base_use_case import BaseUseCase
+
+router = APIRouter()
+
+
+class PaginaContratosRespuesta(BaseModel):
+    contratos: List[Contrato]
+    siguiente_cursor: Optional[str] = Field(None, description="Cursor de la siguiente página")
+
+
+def _decodificar_cursor_contrato(cursor: Optional[str]):
+    despues_de = decodificar_cursor(cursor)
+    if despues_de is not None:
+        try:
+            UUID(despues_de[1])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+    return despues_de
+
+
+async def _pagina(use_case: BaseUseCase, partner_id, estado, tipo, limit: int, cursor: Optional[str]) -> dict:
+    # Se pide una fila extra para saber si existe una página siguiente
+    contratos = await use_case.execute(
+        partner_id=str(partner_id) if partner_id else None,
+        estado=estado.value if estado else None,
+        tipo=tipo.value if tipo else None,
+        limit=limit + 1,
+        after=_decodificar_cursor_contrato(cursor),
+    )
+    siguiente = codificar_cursor(cursor_of(contratos[limit - 1])) if len(contratos) > limit else None
+    return {"contratos": contratos[:limit], "siguiente_cursor": siguiente}
+
+
+@router.get("/contratos", response_model=PaginaContratosRespuesta)
+async def list_contratos(
+    partner_id: Optional[UUID] = None,
+    estado: Optional[EstadoContrato] = None,
+    tipo: Optional[TipoContrato] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    use_case: BaseUseCase = Depends(build_list_contratos_use_case),
+):
+    """List contratos by partner, status and type, ordered by creation date."""
+    return await _pagina(use_case, partner_id, estado, tipo, limit, cursor)
+
+
+@router.get("/contratos/{contrato_id}", response_model=Contrato)
+async def get_contrato(contrato_id: str, use_case: BaseUseCase = Depends(build_get_contrato_use_case)):
+    """Get a contrato by id."""
+    contrato = await use_case.execute(contrato_id)
+    if contrato is None:
+        raise HTTPException(status_code=404, detail=f"Contrato {contrato_id} no encontrado")
+    return contrato
+
+
+@router.get("/partners/{partner_id}/contratos", response_model=PaginaContratosRespuesta)
+async def list_partner_contratos(
+    partner_id: UUID,
+    estado: Optional[EstadoContrato] = None,
+    tipo: Optional[TipoContrato] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    use_case: BaseUseCase = Depends(build_list_contratos_use_case),
+):
+    """List the contratos of a partner, ordered by creation date."""
+    return await _pagina(use_case, partner_id, estado, tipo, limit, cursor)
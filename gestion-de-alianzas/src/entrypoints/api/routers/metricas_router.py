@@ -0,0 +1,14 @@
+# gestion-de-alianzas/src/entrypoints/api/routers/metricas_router.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+# Misma ruta de import que el coordinador de sagas, para leer su instancia del histograma
+from modulos.sagas.infraestructura.metricas_latencia import latencias_sagas
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus metrics: saga step latency histograms."""
+    return PlainTextResponse(latencias_sagas.exportar(), media_type="text/plain; version=0.0.4")
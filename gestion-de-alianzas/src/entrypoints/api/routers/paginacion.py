@@ -0,0 +1,23 @@
+# gestion-de-alianzas/src/entrypoints/api/routers/paginacion.py
+import base64
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+def codificar_cursor(cursor) -> str:
+    """Cursor opaco para la API a partir de (instante, identificador)."""
+    instante, identificador = cursor
+    return base64.urlsafe_b64encode(f"{instante.isoformat()}|{identificador}".encode()).decode()
+
+
+def decodificar_cursor(cursor: Optional[str]):
+    """(instante, identificador) de un cursor de la API; 400 si no es válido."""
+    if cursor is None:
+        return None
+    try:
+        instante, identificador = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(instante), identificador
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
@@ -0,0 +1,164 @@
+# gestion-de-alianzas/src/entrypoints/api/routers/saga_router.py
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import BaseModel, Field
+
+from src.assembly import (
+    build_saga_estado_consultas, build_saga_estadisticas_consultas, build_saga_log_repository_async
+)
+from src.entrypoints.api.routers.paginacion import codificar_cursor, decodificar_cursor
+from src.modulos.sagas.config.settings import SAGA_API_CACHE_MAX, SAGA_API_CACHE_TTL_SEGUNDOS
+from src.modulos.sagas.infraestructura.cache import CacheLRU
+from src.modulos.sagas.infraestructura.repositorios import (
+    SagaEstadoConsultasAsync, SagaEstadisticasConsultasAsync, SagaLogRepositoryAsync
+)
+from src.modulos.sagas.infraestructura.repositorios.saga_estado_consultas_async import cursor_de_estado
+from src.modulos.sagas.infraestructura.repositorios.saga_log_consultas import cursor_de
+
+router = APIRouter(prefix="/sagas")
+
+# Respuestas recientes por ruta y parámetros: el sondeo frecuente de operadores y del
+# BFF se atiende en memoria y llega a la base de datos a lo sumo una vez por TTL.
+_cache = CacheLRU(SAGA_API_CACHE_MAX, SAGA_API_CACHE_TTL_SEGUNDOS)
+
+
+class SagaRespuesta(BaseModel):
+    """Estado actual de la saga de un partner"""
+    saga_id: str
+    partner_id: str
+    estado: str = Field(..., description="INICIADA, COMPLETADA, FALLIDA o EXPIRADA")
+    ultimo_evento: Optional[str] = None
+    iniciada_en: datetime
+    actualizada_en: datetime
+    finalizada_en: Optional[datetime] = None
+
+
+class SagaLogRespuesta(BaseModel):
+    """Evento registrado en saga_logs"""
+    id: str
+    saga_id: str
+    tipo_evento: str
+    estado: str
+    timestamp: datetime
+    intentos: int
+    mensaje_error: Optional[str] = None
+    contrato_id: Optional[str] = None
+    evento_data: str
+
+
+class SagaDetalleRespuesta(BaseModel):
+    saga: Optional[SagaRespuesta] = None
+    historial: List[SagaLogRespuesta]
+    siguiente_cursor: Optional[str] = Field(None, description="Cursor de la siguiente página del historial")
+
+
+class PaginaSagasRespuesta(BaseModel):
+    sagas: List[SagaRespuesta]
+    siguiente_cursor: Optional[str] = Field(None, description="Cursor de la siguiente página")
+
+
+class ConteosHoraRespuesta(BaseModel):
+    hora: datetime
+    conteos: Dict[str, int]
+
+
+class EstadisticasSagasRespuesta(BaseModel):
+    """Conteos de resultados de sagas en una ventana de horas"""
+    desde: datetime
+    hasta: datetime
+    totales: Dict[str, int] = Field(..., description="iniciadas, completadas, fallidas, expiradas, rechazadas, pendientes_revision")
+    validacion_fallida: Dict[str, int] = Field(..., description="Rechazos por validación fallida")
+    por_hora: List[ConteosHoraRespuesta]
+
+
+def _responder(response: Response, valor):
+    response.headers["Cache-Control"] = f"max-age={int(SAGA_API_CACHE_TTL_SEGUNDOS)}"
+    return valor
+
+
+@router.get("/", response_model=PaginaSagasRespuesta)
+async def list_sagas(
+    response: Response,
+    estado: Optional[str] = Query(None, max_length=30),
+    since: Optional[datetime] = Query(None, description="Solo sagas actualizadas desde este instante"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    consultas: SagaEstadoConsultasAsync = Depends(build_saga_estado_consultas),
+):
+    """List sagas by status, ordered by last update."""
+    clave = ("sagas", estado, since, limit, cursor)
+    pagina = _cache.obtener(clave)
+    if pagina is not None:
+        return _responder(response, pagina)
+
+    # Se pide una fila extra para saber si existe una página siguiente
+    sagas = await consultas.listar(estado, since, limit + 1, decodificar_cursor(cursor))
+    siguiente = codificar_cursor(cursor_de_estado(sagas[limit - 1])) if len(sagas) > limit else None
+    pagina = {"sagas": sagas[:limit], "siguiente_cursor": siguiente}
+    _cache.guardar(clave, pagina)
+    return _responder(response, pagina)
+
+
+@router.get("/stats", response_model=EstadisticasSagasRespuesta)
+async def get_saga_stats(
+    response: Response,
+    since: Optional[datetime] = Query(None, description="Inicio de la ventana; por defecto 24 horas atrás"),
+    until: Optional[datetime] = Query(None, description="Fin de la ventana; por defecto ahora"),
+    consultas: SagaEstadisticasConsultasAsync = Depends(build_saga_estadisticas_consultas),
+):
+    """Get hourly saga outcome counts."""
+    hasta = until or datetime.utcnow()
+    desde = since or hasta - timedelta(hours=24)
+    if desde >= hasta or hasta - desde > timedelta(days=31):
+        raise HTTPException(status_code=400, detail="La ventana debe ser positiva y de a lo sumo 31 días")
+
+    clave = ("stats", since, until)
+    estadisticas = _cache.obtener(clave)
+    if estadisticas is not None:
+        return _responder(response, estadisticas)
+
+    estadisticas = await consultas.obtener(desde, hasta)
+    _cache.guardar(clave, estadisticas)
+    return _responder(response, estadisticas)
+
+
+@router.get("/{partner_id}", response_model=SagaDetalleRespuesta)
+async def get_saga(
+    partner_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    consultas: SagaEstadoConsultasAsync = Depends(build_saga_estado_consultas),
+    saga_logs: SagaLogRepositoryAsync = Depends(build_saga_log_repository_async),
+):
+    """Get the saga status of a partner and a page of its event history."""
+    clave = ("saga", partner_id, limit, cursor)
+    detalle = _cache.obtener(clave)
+    if detalle is not None:
+        return _responder(response, detalle)
+
+    saga = await consultas.obtener_por_partner_id(partner_id)
+    logs = await saga_logs.obtener_por_partner_id(partner_id, limit + 1, decodificar_cursor(cursor))
+    if saga is None and not logs:
+        raise HTTPException(status_code=404, detail=f"No hay sagas para el partner {partner_id}")
+
+    historial = [
+        {
+            "id": str(log.id),
+            "saga_id": str(log.saga_id),
+            "tipo_evento": log.tipo_evento,
+            "estado": log.estado.value,
+            "timestamp": log.timestamp,
+            "intentos": log.intentos,
+            "mensaje_error": log.mensaje_error,
+            "contrato_id": log.contrato_id,
+            "evento_data": log.evento_data,
+        }
+        for log in logs[:limit]
+    ]
+    siguiente = codificar_cursor(cursor_de(logs[limit - 1])) if len(logs) > limit else None
+    detalle = {"saga": saga, "historial": historial, "siguiente_cursor": siguiente}
+    _cache.guardar(clave, detalle)
+    return _responder(response, detalle)
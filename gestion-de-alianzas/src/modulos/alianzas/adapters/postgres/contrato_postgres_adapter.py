@@ -1,13 +1,16 @@
 # publicaciones_app/src/infra/repositories.py
 from datetime import datetime, timezone
-from typing import Iterable, Sequence, Optional, List
-from sqlalchemy import and_, func, select, delete
+from typing import AsyncIterator, Iterable, Sequence, Optional, List
+from sqlalchemy import and_, case, func, or_, select, delete, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from src.modulos.alianzas.infrastructure.models import ContratoRow
-from src.modulos.alianzas.domain.models.contrato import Contrato
-from src.modulos.alianzas.domain.ports.contrato_repository_port import ContratoRepositoryPort
+from src.modulos.alianzas.domain.models.contrato import Contrato, EstadoContrato
+from src.modulos.alianzas.domain.ports.contrato_repository_port import (
+    ContratoCursor, ContratoRepositoryPort, PAGE_LIMIT, STREAM_BATCH_SIZE
+)
 from src.modulos.alianzas.infrastructure.db import SessionFactory
-from src.modulos.alianzas.infrastructure.mappers import _domain_to_row, _row_to_domain
+from src.modulos.alianzas.infrastructure.mappers import _domain_to_row, _domain_to_values, _row_to_domain
 from uuid import UUID
 
 class PostgresContratoRepository(ContratoRepositoryPort):
@@ -17,15 +20,49 @@ class PostgresContratoRepository(ContratoRepositoryPort):
         self._session_factory = session_factory
 
     async def create(self, contrato: Contrato) -> Contrato:
-        print(f"Creating contrato in DB: {contrato}")
+        """Create the partner's contrato, or return the existing one (idempotent per partner)."""
+        # uq_contratos_partner_id: una reentrega de PartnerCreado no inserta un segundo contrato
+        stmt = (
+            insert(ContratoRow)
+            .values(_domain_to_values(contrato))
+            .on_conflict_do_nothing(index_elements=[ContratoRow.partner_id])
+            .returning(ContratoRow)
+        )
         async with self._session_factory() as session:
             async with session.begin():
-                row = _domain_to_row(contrato)
-                session.add(row)
-            await session.commit()
-            await session.refresh(row)
+                row = (await session.execute(stmt)).scalar_one_or_none()
+                if row is None:
+                    row = (await session.execute(
+                        select(ContratoRow).where(ContratoRow.partner_id == UUID(contrato.partner_id))
+                    )).scalar_one()
         return _row_to_domain(row)
 
+    async def create_many(self, contratos: List[Contrato]) -> List[Contrato]:
+        """Create several contratos with one multi-row INSERT ... RETURNING in one transaction.
+
+        Idempotent per partner like ``create``: partners that already have a contrato keep
+        it, and the result holds, in input order, the contrato of each partner.
+        """
+        if not contratos:
+            return []
+        stmt = (
+            insert(ContratoRow)
+            .on_conflict_do_nothing(index_elements=[ContratoRow.partner_id])
+            .returning(ContratoRow)
+        )
+        async with self._session_factory() as session:
+            async with session.begin():
+                result = await session.execute(stmt, [_domain_to_values(c) for c in contratos])
+                por_partner = {row.partner_id: row for row in result.scalars()}
+                # DO NOTHING no retorna las filas en conflicto: se leen las que ya existían
+                faltantes = {UUID(c.partner_id) for c in contratos} - por_partner.keys()
+                if faltantes:
+                    existentes = await session.execute(
+                        select(ContratoRow).where(ContratoRow.partner_id.in_(faltantes))
+                    )
+                    por_partner.update((row.partner_id, row) for row in existentes.scalars())
+        return [_row_to_domain(por_partner[UUID(c.partner_id)]) for c in contratos]
+
     async def get_by_id(self, contrato_id: str) -> Optional[Contrato]:
         """Get contrato by ID."""
         async with self._session_factory() as session:
@@ -63,6 +100,45 @@ class PostgresContratoRepository(ContratoRepositoryPort):
             await session.refresh(merged_row)
             return _row_to_domain(merged_row)
 
+    async def reject_by_partner_id(self, partner_id: str, revision_note: Optional[str] = None) -> Optional[Contrato]:
+        """Reject the partner's latest contrato with one UPDATE ... RETURNING (no prior SELECT)."""
+        try:
+            partner_uuid = UUID(partner_id)
+        except ValueError:
+            return None
+
+        valores = {
+            ContratoRow.estado: EstadoContrato.RECHAZADO.value,
+            ContratoRow.fecha_actualizacion: datetime.now(timezone.utc),
+        }
+        if revision_note:
+            # La nota se agrega a las condiciones existentes, o las reemplaza si están vacías
+            valores[ContratoRow.condiciones] = case(
+                (func.coalesce(ContratoRow.condiciones, '') == '', revision_note),
+                else_=ContratoRow.condiciones + '. ' + revision_note,
+            )
+
+        # Solo el contrato más reciente del partner (usa idx_contratos_partner_fecha_creacion)
+        ultimo = (
+            select(ContratoRow.id)
+            .where(ContratoRow.partner_id == partner_uuid)
+            .order_by(ContratoRow.fecha_creacion.desc(), ContratoRow.id.desc())
+            .limit(1)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(ContratoRow)
+            .where(ContratoRow.id == ultimo)
+            .values(valores)
+            .returning(ContratoRow)
+            .execution_options(synchronize_session=False)
+        )
+        async with self._session_factory() as session:
+            async with session.begin():
+                result = await session.execute(stmt)
+                row = result.scalar_one_or_none()
+        return _row_to_domain(row) if row else None
+
     async def delete(self, contrato_id: str) -> bool:
         """Delete contrato by ID."""
         async with self._session_factory() as session:
@@ -75,10 +151,39 @@ class PostgresContratoRepository(ContratoRepositoryPort):
                 except ValueError:
                     return False
 
-    async def list_all(self) -> List[Contrato]:
-        """List all contratos."""
+    async def list_page(
+        self,
+        partner_id: Optional[str] = None,
+        estado: Optional[str] = None,
+        tipo: Optional[str] = None,
+        limit: int = PAGE_LIMIT,
+        after: Optional[ContratoCursor] = None,
+    ) -> List[Contrato]:
+        """List one page of contratos with keyset pagination on (fecha_creacion, id)."""
+        stmt = select(ContratoRow)
+        if partner_id is not None:
+            stmt = stmt.where(ContratoRow.partner_id == UUID(partner_id))
+        if estado is not None:
+            stmt = stmt.where(ContratoRow.estado == estado)
+        if tipo is not None:
+            stmt = stmt.where(ContratoRow.tipo == tipo)
+        if after is not None:
+            fecha_creacion, contrato_id = after
+            # fecha_creacion >= :ts acota el rango del índice; el OR desempata por id
+            stmt = stmt.where(
+                ContratoRow.fecha_creacion >= fecha_creacion,
+                or_(ContratoRow.fecha_creacion > fecha_creacion, ContratoRow.id > UUID(contrato_id)),
+            )
+        stmt = stmt.order_by(ContratoRow.fecha_creacion, ContratoRow.id).limit(limit)
+
         async with self._session_factory() as session:
-            stmt = select(ContratoRow)
             result = await session.execute(stmt)
-            rows = result.scalars().all()
-            return [_row_to_domain(row) for row in rows]
+            return [_row_to_domain(row) for row in result.scalars()]
+
+    async def stream_all(self, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Contrato]:
+        """Stream all contratos through a server-side cursor, ``batch_size`` rows at a time."""
+        stmt = select(ContratoRow).execution_options(yield_per=batch_size)
+        async with self._session_factory() as session:
+            result = await session.stream_scalars(stmt)
+            async for row in result:
+                yield _row_to_domain(row)
@@ -1,16 +1,34 @@
 # contrato_repository_port.py
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
 from uuid import UUID
 from src.modulos.alianzas.domain.models.contrato import Contrato
 
+# Posición del último contrato leído: (fecha_creacion, id)
+ContratoCursor = Tuple[datetime, str]
+
+PAGE_LIMIT = 50
+STREAM_BATCH_SIZE = 500
+
+
+def cursor_of(contrato: Contrato) -> ContratoCursor:
+    """Cursor to request the page that follows ``contrato``."""
+    return contrato.fecha_creacion, contrato.id
+
+
 class ContratoRepositoryPort(ABC):
     """Contrato repository interface."""
 
     @abstractmethod
     async def create(self, contrato: Contrato) -> Contrato:
-        """Create a new contrato."""
+        """Create the partner's contrato, or return the one it already has."""
+        pass
+
+    @abstractmethod
+    async def create_many(self, contratos: List[Contrato]) -> List[Contrato]:
+        """Create several contratos in one transaction, idempotent per partner like ``create``."""
         pass
 
     @abstractmethod
@@ -28,12 +46,29 @@ class ContratoRepositoryPort(ABC):
         """Update an existing contrato."""
         pass
 
+    @abstractmethod
+    async def reject_by_partner_id(self, partner_id: str, revision_note: Optional[str] = None) -> Optional[Contrato]:
+        """Mark the partner's latest contrato as RECHAZADO, appending the revision note to its condiciones."""
+        pass
+
     @abstractmethod
     async def delete(self, contrato_id: str) -> bool:
         """Delete contrato by ID."""
         pass
 
     @abstractmethod
-    async def list_all(self) -> List[Contrato]:
-        """List all contratos."""
+    async def list_page(
+        self,
+        partner_id: Optional[str] = None,
+        estado: Optional[str] = None,
+        tipo: Optional[str] = None,
+        limit: int = PAGE_LIMIT,
+        after: Optional[ContratoCursor] = None,
+    ) -> List[Contrato]:
+        """List one page of contratos ordered by (fecha_creacion, id), starting after ``after``."""
+        pass
+
+    @abstractmethod
+    def stream_all(self, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[Contrato]:
+        """Iterate over all contratos, holding at most ``batch_size`` rows in memory."""
         pass
@@ -0,0 +1,17 @@
+# gestion-de-alianzas/src/domain/use_cases/create_many_contratos_use_case.py
+from typing import List
+
+from src.modulos.alianzas.domain.models.contrato import Contrato
+from src.modulos.alianzas.domain.ports.contrato_repository_port import ContratoRepositoryPort
+from src.modulos.alianzas.domain.use_cases.base_use_case import BaseUseCase
+
+
+class CreateManyContratosUseCase(BaseUseCase):
+    """Use case for saving a batch of contratos in one transaction."""
+
+    def __init__(self, contrato_repository: ContratoRepositoryPort):
+        self.contrato_repository = contrato_repository
+
+    async def execute(self, contratos: List[Contrato]) -> List[Contrato]:
+        """Create several contratos at once."""
+        return await self.contrato_repository.create_many(contratos)
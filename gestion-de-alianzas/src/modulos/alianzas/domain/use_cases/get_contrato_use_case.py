@@ -0,0 +1,17 @@
+# gestion-de-alianzas/src/domain/use_cases/get_contrato_use_case.py
+from typing import Optional
+
+from src.modulos.alianzas.domain.models.contrato import Contrato
+from src.modulos.alianzas.domain.ports.contrato_repository_port import ContratoRepositoryPort
+from src.modulos.alianzas.domain.use_cases.base_use_case import BaseUseCase
+
+
+class GetContratoUseCase(BaseUseCase):
+    """Use case for reading a contrato by id."""
+
+    def __init__(self, contrato_repository: ContratoRepositoryPort):
+        self.contrato_repository = contrato_repository
+
+    async def execute(self, contrato_id: str) -> Optional[Contrato]:
+        """Get a contrato, or None if it does not exist."""
+        return await self.contrato_repository.get_by_id(contrato_id)
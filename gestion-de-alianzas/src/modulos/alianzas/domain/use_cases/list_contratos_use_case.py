@@ -0,0 +1,26 @@
+# gestion-de-alianzas/src/domain/use_cases/list_contratos_use_case.py
+from typing import List, Optional
+
+from src.modulos.alianzas.domain.models.contrato import Contrato
+from src.modulos.alianzas.domain.ports.contrato_repository_port import (
+    ContratoCursor, ContratoRepositoryPort, PAGE_LIMIT
+)
+from src.modulos.alianzas.domain.use_cases.base_use_case import BaseUseCase
+
+
+class ListContratosUseCase(BaseUseCase):
+    """Use case for listing contratos page by page."""
+
+    def __init__(self, contrato_repository: ContratoRepositoryPort):
+        self.contrato_repository = contrato_repository
+
+    async def execute(
+        self,
+        partner_id: Optional[str] = None,
+        estado: Optional[str] = None,
+        tipo: Optional[str] = None,
+        limit: int = PAGE_LIMIT,
+        after: Optional[ContratoCursor] = None,
+    ) -> List[Contrato]:
+        """List one page of contratos matching the filters."""
+        return await self.contrato_repository.list_page(partner_id, estado, tipo, limit, after)
@@ -4,7 +4,7 @@ import logging
 from typing import Optional
 from src.modulos.alianzas.domain.use_cases.base_use_case import BaseUseCase
 from src.modulos.alianzas.domain.ports.contrato_repository_port import ContratoRepositoryPort
-from src.modulos.alianzas.domain.models.contrato import Contrato, EstadoContrato
+from src.modulos.alianzas.domain.models.contrato import Contrato
 
 logger = logging.getLogger(__name__)
 
@@ -19,28 +19,15 @@ class ProcessRevisionContratoUseCase(BaseUseCase):
         try:
             logger.info(f"🔄 Processing revision-contrato for partner: {partner_id}")
             
-            # Buscar el contrato por partner_id
-            contrato = await self.contrato_repository.get_by_partner_id(partner_id)
+            revision_note = f"REVISION: {comentarios_revision}" if comentarios_revision else None
             
-            if not contrato:
+            # Rechazar el contrato y agregar la nota en un único UPDATE ... RETURNING
+            contrato_actualizado = await self.contrato_repository.reject_by_partner_id(partner_id, revision_note)
+            
+            if not contrato_actualizado:
                 logger.warning(f"⚠️ No contrato found for partner_id: {partner_id}")
                 return None
             
-            logger.info(f"📄 Found contrato: {contrato.id} for partner: {partner_id}")
-            logger.info(f"📊 Current estado: {contrato.estado}")
-            
-            contrato.estado = EstadoContrato.RECHAZADO
-            
-            if comentarios_revision:
-                revision_note = f"REVISION: {comentarios_revision}"
-                if contrato.condiciones:
-                    contrato.condiciones = f"{contrato.condiciones}. {revision_note}"
-                else:
-                    contrato.condiciones = revision_note
-            
-            # Guardar el contrato actualizado
-            contrato_actualizado = await self.contrato_repository.update(contrato)
-            
             logger.info(f"✅ Contrato {contrato_actualizado.id} updated to estado: {contrato_actualizado.estado}")
             logger.info(f"🔄 Revision processing completed for partner: {partner_id}")
             
@@ -18,6 +18,22 @@ def _domain_to_row(c: Contrato) -> ContratoRow:
         fecha_actualizacion=c.fecha_actualizacion
     )
 
+def _domain_to_values(c: Contrato) -> dict:
+    """Column values for a bulk INSERT; the id is assigned here so every row has the same keys."""
+    return {
+        "id": uuid.UUID(c.id) if c.id else uuid.uuid4(),
+        "partner_id": uuid.UUID(c.partner_id),
+        "tipo": c.tipo.value if isinstance(c.tipo, TipoContrato) else str(c.tipo),
+        "fecha_inicio": c.fecha_inicio,
+        "fecha_fin": c.fecha_fin,
+        "monto": c.monto,
+        "moneda": c.moneda,
+        "condiciones": c.condiciones,
+        "estado": c.estado.value if isinstance(c.estado, EstadoContrato) else str(c.estado),
+        "fecha_creacion": c.fecha_creacion,
+        "fecha_actualizacion": c.fecha_actualizacion
+    }
+
 def _row_to_domain(r: ContratoRow) -> Contrato:
     return Contrato(
         id=str(r.id) if r.id else None,
@@ -2,13 +2,25 @@
 import uuid
 from datetime import datetime, date
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import String, DateTime, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from src.modulos.alianzas.infrastructure.db import Base
 
 
 class ContratoRow(Base):
     __tablename__ = "contratos"
+    # Índices de la paginación por (fecha_creacion, id): cada filtro de la API de
+    # lectura recorre un rango de su índice. El de partner también atiende las
+    # búsquedas por partner_id, por eso la columna ya no tiene índice propio.
+    __table_args__ = (
+        Index('idx_contratos_fecha_creacion', 'fecha_creacion', 'id'),
+        Index('idx_contratos_partner_fecha_creacion', 'partner_id', 'fecha_creacion', 'id'),
+        Index('idx_contratos_estado_fecha_creacion', 'estado', 'fecha_creacion', 'id'),
+        Index('idx_contratos_tipo_fecha_creacion', 'tipo', 'fecha_creacion', 'id'),
+        # Un contrato por partner: la creación desde PartnerCreado es idempotente
+        # (INSERT ... ON CONFLICT DO NOTHING) ante reentregas del mensaje
+        Index('uq_contratos_partner_id', 'partner_id', unique=True),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -20,7 +32,6 @@ class ContratoRow(Base):
     partner_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         nullable=False,
-        index=True,
         doc="Referencia al socio (Partner) relacionado"
     )
 
@@ -6,7 +6,9 @@ from src.modulos.alianzas.adapters.postgres.contrato_postgres_adapter import Pos
 from datetime import date, datetime
 from src.modulos.alianzas.domain.models.contrato import TipoContrato, EstadoContrato
 from src.modulos.alianzas.domain.use_cases.create_contrato_use_case import CreateContratoUseCase
-from src.assembly import build_create_contrato_use_case
+from src.assembly import build_create_contrato_use_case, build_create_many_contratos_use_case
+from src.modulos.alianzas.infrastructure.db import DB_POOL_SIZE
+from src.modulos.sagas.infraestructura.partner_id import leer_partner_creado
 import os
 import asyncio
 import random, uuid
@@ -20,6 +22,22 @@ PULSAR_SERVICE_URL = os.getenv('BROKER_URL', 'pulsar://localhost:6650')
 TOPIC = 'gestion-de-integraciones'
 TOPIC_PARTNERCREADO = 'PartnerCreado'
 
+# Creaciones de contrato en vuelo a la vez; por defecto, una por conexión del pool
+CONTRATO_CONSUMER_CONCURRENCIA = int(os.getenv('CONTRATO_CONSUMER_CONCURRENCIA', str(DB_POOL_SIZE)))
+RECEIVE_TIMEOUT_MS = int(os.getenv('CONTRATO_CONSUMER_RECEIVE_TIMEOUT_MS', '1000'))
+
+# Modo lote: hasta LOTE_MAX mensajes o LOTE_MS de espera por lote, creados en una transacción
+MODO_INDIVIDUAL = 'individual'
+MODO_LOTE = 'lote'
+CONTRATO_CONSUMER_MODO = os.getenv('CONTRATO_CONSUMER_MODO', MODO_INDIVIDUAL)
+CONTRATO_CONSUMER_LOTE_MAX = int(os.getenv('CONTRATO_CONSUMER_LOTE_MAX', '100'))
+CONTRATO_CONSUMER_LOTE_MS = int(os.getenv('CONTRATO_CONSUMER_LOTE_MS', '50'))
+
+# Producer de ContratoCreado con batching: espera máxima y tamaño máximo de cada lote
+TOPIC_CONTRATOCREADO = 'ContratoCreado'
+CONTRATO_PRODUCER_BATCH_DELAY_MS = int(os.getenv('CONTRATO_PRODUCER_BATCH_DELAY_MS', '10'))
+CONTRATO_PRODUCER_BATCH_MAX = int(os.getenv('CONTRATO_PRODUCER_BATCH_MAX', '100'))
+
 # Publisher
 class PulsarContratoPublisher:
     def __init__(self):
@@ -44,97 +62,238 @@ class PulsarContratoPublisher:
 
 # Consumer
 class PulsarContratoConsumer:
-    def __init__(self):
+    """
+    Consume PartnerCreado y crea un contrato por mensaje en un loop asyncio propio.
+
+    Hasta ``concurrencia`` creaciones quedan en vuelo a la vez (semáforo), por defecto
+    el tamaño del pool del engine async, de modo que el throughput escala con la
+    capacidad de la base de datos.
+
+    ContratoCreado se publica con un único producer con batching creado al inicio;
+    ``send_async`` saca la publicación del camino crítico y el mensaje de entrada se
+    confirma en el callback, solo cuando el broker persistió el de salida. Si la
+    publicación falla, el mensaje se rechaza: la creación es idempotente por partner,
+    así que la reentrega vuelve a publicar el contrato existente sin insertar otro.
+
+    En modo ``lote`` cada unidad de trabajo es un lote de hasta ``lote_max`` mensajes
+    (o los que lleguen en ``lote_ms``) recibido con ``batch_receive``: sus contratos se
+    insertan con un único INSERT multi-fila en una transacción y, si falla, el lote
+    completo se rechaza para reentrega.
+    """
+
+    def __init__(
+        self,
+        concurrencia: int = CONTRATO_CONSUMER_CONCURRENCIA,
+        modo: str = CONTRATO_CONSUMER_MODO,
+        lote_max: int = CONTRATO_CONSUMER_LOTE_MAX,
+        lote_ms: int = CONTRATO_CONSUMER_LOTE_MS,
+    ):
+        if modo not in (MODO_INDIVIDUAL, MODO_LOTE):
+            raise ValueError(f"Modo de consumer desconocido: {modo}")
         try:
             logger.info(f"🔌 Connecting Pulsar consumer to {PULSAR_SERVICE_URL}")
             self.client = pulsar.Client(PULSAR_SERVICE_URL)
-            self.consumer = self.client.subscribe(TOPIC_PARTNERCREADO, subscription_name='contrato-sub')
+            self.consumer = self.client.subscribe(
+                TOPIC_PARTNERCREADO,
+                subscription_name='contrato-sub',
+                # Solo la usa batch_receive(); 10 MB es el límite de bytes por defecto del cliente
+                batch_receive_policy=pulsar.ConsumerBatchReceivePolicy(lote_max, 10 * 1024 * 1024, lote_ms)
+            )
+            self.producer = self.client.create_producer(
+                TOPIC_CONTRATOCREADO,
+                batching_enabled=True,
+                batching_max_publish_delay_ms=CONTRATO_PRODUCER_BATCH_DELAY_MS,
+                batching_max_messages=CONTRATO_PRODUCER_BATCH_MAX,
+                # Con la cola de envíos llena, send_async espera en lugar de fallar
+                block_if_queue_full=True
+            )
             self.use_case = build_create_contrato_use_case()
+            self.many_use_case = build_create_many_contratos_use_case()
+            self.concurrencia = concurrencia
+            self.modo = modo
+            self._running = False
             logger.info(f"✅ Pulsar consumer initialized successfully")
         except Exception as e:
             logger.error(f"❌ Failed to initialize Pulsar consumer: {e}")
             raise
 
     def listen(self):
+        """Ejecuta el loop asyncio del consumer en el hilo actual hasta ``close``."""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            logger.info(f"📡 Subscribed to topic: {TOPIC_PARTNERCREADO}")
-
-            while True:
-                logger.info("⏳ Waiting for messages...")
-                msg = self.consumer.receive()
-                try:
-                    logger.info(f"📨 Message received, processing...")
-                    content = msg.data().decode('utf-8')
-                    
-                    # Try to parse as JSON first, if fails assume it's just the partner_id
-                    try:
-                        data = json.loads(content)
-                        partner_id = data.get("partner_id")
-                    except json.JSONDecodeError:
-                        raw_content = content.strip()
-                        
-                        clean_content = ''.join(char for char in raw_content if char.isprintable())
-                        logger.info(f'📥 Cleaned content: {clean_content}')
-                        
-                        if clean_content and clean_content[0] == 'H':
-                            partner_id = clean_content[1:]  # Remove the 'H' prefix
-                            logger.info(f'📥 Extracted partner_id from prefixed message: {partner_id}')
-                        else:
-                            partner_id = clean_content
-                            logger.info(f'📥 Plain text partner_id: {partner_id}')
-                    
-                    if not partner_id:
-                        error_msg = f"❌ No partner_id found in message: {content}"
-                        logger.error(error_msg)
-                        raise ValueError(error_msg)
-                    
-                    tipos = list(TipoContrato)
-                    estados = list(EstadoContrato)
-                    monedas = ["USD", "EUR", "COP", "MXN"]
-                    condiciones_list = ["Condición A", "Condición B", "Condición C", "Condición D"]
-                    
-                    # Lógica para estado: 80% ACTIVO, 20% aleatorio entre otros estados
-                    if random.random() < 0.8:
-                        estado_contrato = EstadoContrato.ACTIVO
-                    else:
-                        # Obtener todos los estados excepto ACTIVO para el 20% restante
-                        otros_estados = [estado for estado in estados if estado != EstadoContrato.ACTIVO]
-                        estado_contrato = random.choice(otros_estados)
-                    
-                    contrato = Contrato(
-                        partner_id=partner_id,
-                        tipo=random.choice(tipos),
-                        fecha_inicio=date.today(),
-                        fecha_fin=None if random.random() < 0.5 else date.today(),
-                        monto=round(random.uniform(100, 10000), 2),
-                        moneda=random.choice(monedas),
-                        condiciones=random.choice(condiciones_list),
-                        estado=estado_contrato,
-                        fecha_creacion=datetime.utcnow(),
-                        fecha_actualizacion=None
-                    )
-                    # Use persistent event loop for async DB operation
-                    result = loop.run_until_complete(self.use_case.execute(contrato))
-                    logger.info(f'✅ Contrato created: {result}')
-
-                    # Publish to ContratoCreado topic
-                    compliance_producer = self.client.create_producer('ContratoCreado')
-                    contrato_json = contrato.model_dump_json() if hasattr(contrato, 'model_dump_json') else json.dumps(contrato.dict(), default=str)
-                    compliance_producer.send(contrato_json.encode('utf-8'))
-                    logger.info(f'📤 Contrato published to ContratoCreado: {contrato_json}')
-
-                    self.consumer.acknowledge(msg)
-                except Exception as e:
-                    logger.error(f'❌ Error processing message: {e}')
-                    self.consumer.negative_acknowledge(msg)
-                    
+            asyncio.run(self.listen_async())
         except Exception as e:
             logger.error(f'💥 Fatal error in consumer loop: {e}')
             raise
 
+    async def listen_async(self):
+        loop = asyncio.get_running_loop()
+        semaforo = asyncio.Semaphore(self.concurrencia)
+        en_vuelo = set()
+        self._running = True
+        if self.modo == MODO_LOTE:
+            recibir, procesar = self._receive_batch, self._process_batch
+        else:
+            recibir, procesar = self._receive, self._process_message
+        logger.info(f"📡 Subscribed to topic: {TOPIC_PARTNERCREADO} ({self.concurrencia} {self.modo} units in flight)")
+
+        try:
+            while self._running:
+                # Sin cupo no se recibe: los mensajes esperan en la cola del consumer de Pulsar
+                await semaforo.acquire()
+                try:
+                    # La recepción es bloqueante y con timeout, para poder detener el loop
+                    recibido = await loop.run_in_executor(None, recibir)
+                except Exception:
+                    semaforo.release()
+                    if not self._running:
+                        break  # close() cerró el cliente durante el receive
+                    raise
+                if not recibido:
+                    semaforo.release()
+                    continue
+
+                tarea = asyncio.create_task(procesar(recibido))
+                en_vuelo.add(tarea)
+                tarea.add_done_callback(en_vuelo.discard)
+                tarea.add_done_callback(lambda _: semaforo.release())
+        finally:
+            if en_vuelo:
+                logger.info(f"⏳ Waiting for {len(en_vuelo)} contracts in flight...")
+                await asyncio.gather(*en_vuelo, return_exceptions=True)
+
+    def _receive(self):
+        try:
+            return self.consumer.receive(RECEIVE_TIMEOUT_MS)
+        except pulsar.Timeout:
+            return None
+
+    def _receive_batch(self):
+        # Retorna al completar lote_max mensajes o al vencer lote_ms, vacío si no llegó ninguno
+        return list(self.consumer.batch_receive())
+
+    async def _process_message(self, msg):
+        try:
+            logger.info(f"📨 Message received, processing...")
+            content = msg.data().decode('utf-8')
+            partner_id = self._extract_partner_id(content)
+            contrato = self._build_contrato(partner_id)
+
+            result = await self.use_case.execute(contrato)
+            logger.info(f'✅ Contrato created: {result}')
+
+            # Publish the created contrato (with its id); the input message is acked in the callback
+            self._publish_contrato_creado(result, msg)
+        except Exception as e:
+            logger.error(f'❌ Error processing message: {e}')
+            self.consumer.negative_acknowledge(msg)
+
+    async def _process_batch(self, msgs):
+        logger.info(f"📨 Batch of {len(msgs)} messages received, processing...")
+        validos, contratos = [], []
+        for msg in msgs:
+            try:
+                partner_id = self._extract_partner_id(msg.data().decode('utf-8'))
+                contratos.append(self._build_contrato(partner_id))
+                validos.append(msg)
+            except Exception as e:
+                logger.error(f'❌ Error processing message: {e}')
+                self.consumer.negative_acknowledge(msg)
+        if not contratos:
+            return
+
+        try:
+            creados = await self.many_use_case.execute(contratos)
+        except Exception as e:
+            logger.error(f'❌ Error creating batch of {len(contratos)} contratos: {e}')
+            for msg in validos:
+                self.consumer.negative_acknowledge(msg)
+            return
+        logger.info(f'✅ {len(contratos)} contratos created')
+
+        # RETURNING conserva el orden de entrada: cada contrato creado (con su id) va con su mensaje.
+        # Las publicaciones caen en los mismos lotes del producer y sus callbacks confirman las entradas
+        for contrato, msg in zip(creados, validos):
+            self._publish_contrato_creado(contrato, msg)
+
+    def _extract_partner_id(self, content: str) -> str:
+        # Try to parse as JSON first, if fails assume it's just the partner_id
+        try:
+            data = json.loads(content)
+            partner_id = data.get("partner_id")
+        except json.JSONDecodeError:
+            # PartnerCreado llega en Avro: se decodifica con su esquema de escritura
+            payload = leer_partner_creado(content)
+            if payload and payload['partner_id']:
+                return payload['partner_id']
+
+            raw_content = content.strip()
+            
+            clean_content = ''.join(char for char in raw_content if char.isprintable())
+            logger.info(f'📥 Cleaned content: {clean_content}')
+            
+            if clean_content and clean_content[0] == 'H':
+                partner_id = clean_content[1:]  # Remove the 'H' prefix
+                logger.info(f'📥 Extracted partner_id from prefixed message: {partner_id}')
+            else:
+                partner_id = clean_content
+                logger.info(f'📥 Plain text partner_id: {partner_id}')
+        
+        if not partner_id:
+            error_msg = f"❌ No partner_id found in message: {content}"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        return partner_id
+
+    def _build_contrato(self, partner_id: str) -> Contrato:
+        tipos = list(TipoContrato)
+        estados = list(EstadoContrato)
+        monedas = ["USD", "EUR", "COP", "MXN"]
+        condiciones_list = ["Condición A", "Condición B", "Condición C", "Condición D"]
+        
+        # Lógica para estado: 80% ACTIVO, 20% aleatorio entre otros estados
+        if random.random() < 0.8:
+            estado_contrato = EstadoContrato.ACTIVO
+        else:
+            # Obtener todos los estados excepto ACTIVO para el 20% restante
+            otros_estados = [estado for estado in estados if estado != EstadoContrato.ACTIVO]
+            estado_contrato = random.choice(otros_estados)
+        
+        return Contrato(
+            partner_id=partner_id,
+            tipo=random.choice(tipos),
+            fecha_inicio=date.today(),
+            fecha_fin=None if random.random() < 0.5 else date.today(),
+            monto=round(random.uniform(100, 10000), 2),
+            moneda=random.choice(monedas),
+            condiciones=random.choice(condiciones_list),
+            estado=estado_contrato,
+            fecha_creacion=datetime.utcnow(),
+            fecha_actualizacion=None
+        )
+
+    def _publish_contrato_creado(self, contrato: Contrato, msg):
+        contrato_json = contrato.model_dump_json() if hasattr(contrato, 'model_dump_json') else json.dumps(contrato.dict(), default=str)
+
+        def confirmar(resultado, _message_id):
+            # Corre en el hilo de I/O de Pulsar; acknowledge es thread-safe
+            if resultado == pulsar.Result.Ok:
+                logger.info(f'📤 Contrato published to ContratoCreado: {contrato_json}')
+                self.consumer.acknowledge(msg)
+            else:
+                # La reentrega encuentra el contrato ya creado y solo lo vuelve a publicar
+                logger.error(f'❌ Error publishing ContratoCreado ({resultado}): {contrato_json}')
+                self.consumer.negative_acknowledge(msg)
+
+        self.producer.send_async(contrato_json.encode('utf-8'), confirmar)
+
     def close(self):
+        self._running = False
+        if hasattr(self, 'producer'):
+            # Envía los lotes pendientes para que sus callbacks confirmen las entradas
+            try:
+                self.producer.flush()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not flush ContratoCreado producer: {e}")
         if hasattr(self, 'client'):
             self.client.close()
-            logger.info("🎧 Pulsar consumer closed")
\ No newline at end of file
+            logger.info("🎧 Pulsar consumer closed")
@@ -6,7 +6,9 @@ import sys
 import os
 import logging
 import uuid
-from typing import Optional
+from dataclasses import fields
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
 
 # Agregar paths para imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
@@ -24,18 +26,87 @@ from src.modulos.sagas.dominio.eventos import (
 
 from modulos.sagas.aplicacion.servicios.saga_log_service import SagaLogService
 from modulos.sagas.infraestructura.repositorios.saga_log_repository import SagaLogRepository
+from modulos.sagas.infraestructura.repositorios.saga_log_write_behind import SagaLogRepositoryWriteBehind
+from modulos.sagas.config.settings import (
+    SAGA_ESTADO_CACHE_MAX, SAGA_LOG_WRITE_BEHIND, SAGA_REORDEN_MAX_PARTNERS, SAGA_REORDEN_MAX_POR_PARTNER, SAGA_REORDEN_TTL_SEGUNDOS,
+    SAGA_TIMEOUT_SEGUNDOS, SAGA_DESALOJO_GRACIA_SEGUNDOS, SAGA_RUEDA_RESOLUCION_SEGUNDOS, SAGA_RUEDA_RANURAS
+)
+from modulos.sagas.infraestructura.repositorios.saga_estado_repository import SagaEstadoRepository
+from modulos.sagas.infraestructura.buffer_reordenamiento import BufferReordenamiento
+from modulos.sagas.infraestructura.cache import CacheLRU
+from modulos.sagas.infraestructura.rueda_temporizadores import RuedaTemporizadores
+from modulos.sagas.infraestructura.estadisticas_sagas import (
+    AcumuladorEstadisticasSagas, INICIADAS, COMPLETADAS, FALLIDAS, EXPIRADAS, RECHAZADAS,
+    PENDIENTES_REVISION, VALIDACION_FALLIDA
+)
+from modulos.sagas.infraestructura.metricas_latencia import latencias_sagas
 
 logger = logging.getLogger(__name__)
 
+ESTADOS_TERMINALES = ('COMPLETADA', 'FALLIDA', 'EXPIRADA')
+
+# Clave del temporizador que purga los eventos en espera vencidos (no colisiona con partner_ids)
+_PURGA_EN_ESPERA = 'purga-eventos-en-espera'
+
+
+class EventoEnEspera(NamedTuple):
+    """Evento estacionado y la confirmación de su mensaje, que se resuelve al aplicarlo o descartarlo"""
+    evento: EventoDominio
+    confirmacion: Any  # confirmar()/rechazar() del mensaje de origen, o None
+
+
+def saga_id_de_correlacion(correlacion_id: str) -> str:
+    """
+    saga_id estable para un id de correlación: el propio id si ya es un UUID
+    (el BFF genera uuid4) o un UUID5 derivado de él en otro caso
+    """
+    try:
+        return str(uuid.UUID(correlacion_id))
+    except ValueError:
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, correlacion_id))
+
 
 class CoordinadorPartnersCoreografico(CoordinadorCoreografia):
 
-    def __init__(self, saga_log_service=None):
-        self.estado_saga = {} 
-        
+    def __init__(self, saga_log_service=None, saga_estado_repository=None, estadisticas_sagas=None,
+                 metricas_latencia=None):
+        # Estado de sagas persistido en saga_estados con cache LRU acotada delante
+        self.estado_saga = saga_estado_repository or SagaEstadoRepository()
+
+        # Conteos horarios de resultados, volcados por lotes a saga_estadisticas_horarias
+        self.estadisticas = estadisticas_sagas or AcumuladorEstadisticasSagas()
+        self.estadisticas.iniciar()
+
+        # Latencia por paso y de extremo a extremo, expuesta en /metrics
+        self.latencias = metricas_latencia or latencias_sagas
+
+        # Instante de cada ComandoCrearPartner por id de correlación. El listener lo anota al
+        # recibirlo, antes de encolarlo, porque su PartnerCreado corre en otro worker (el del
+        # partner) y puede adelantarse al worker del comando. La entrada vence por TTL
+        self.comandos_pendientes = CacheLRU(SAGA_ESTADO_CACHE_MAX, SAGA_TIMEOUT_SEGUNDOS)
+
+        # Eventos que llegaron antes que su predecesor, a la espera de poder aplicarse.
+        # Su mensaje se confirma al aplicarlos y se rechaza (reentrega) si se descartan
+        self.eventos_en_espera = BufferReordenamiento(
+            SAGA_REORDEN_MAX_PARTNERS, SAGA_REORDEN_MAX_POR_PARTNER, SAGA_REORDEN_TTL_SEGUNDOS,
+            al_descartar=self._devolver_evento_en_espera
+        )
+
+        # Un temporizador por saga: vencimiento si está activa, desalojo si ya terminó
+        self.temporizadores = RuedaTemporizadores(
+            SAGA_RUEDA_RESOLUCION_SEGUNDOS, SAGA_RUEDA_RANURAS, nombre='saga-temporizadores'
+        )
+        self.temporizadores.iniciar()
+        self._programar_purga_en_espera()
+
+        # Ejecutor por partner del listener; los temporizadores vencidos se aplican en él
+        self.ejecutor = None
+
         if saga_log_service is None:
             try:
                 repository = SagaLogRepository()
+                if SAGA_LOG_WRITE_BEHIND:
+                    repository = SagaLogRepositoryWriteBehind(repository)
                 self.saga_log_service = SagaLogService(repository)
                 logger.info("✅ Saga log service initialized directly")
             except Exception as e:
@@ -50,29 +121,49 @@ class CoordinadorPartnersCoreografico(CoordinadorCoreografia):
         """
         Define las reglas de coreografía - qué eventos pueden seguir a otros
         """
-        self.reglas_coreografia = {
-            CreatePartner: [PartnerCreated, PartnerCreationFailed],
-            PartnerCreated: [ContratoCreado, ContratoCreadoFailed],
-            PartnerCreationFailed: [],  # Fin de saga en caso de error
-            ContratoCreado: [ContratoAprobado, ContratoRechazado],  # Compliance después del contrato
-            ContratoCreadoFailed: [],  # Fin de saga en caso de error
-            ContratoAprobado: [],  # Fin exitoso de saga - contrato aprobado
-            ContratoRechazado: [RevisionContrato],  # Si se rechaza, se puede revisar
-            RevisionContrato: []  # Fin de saga - pendiente de revisión manual
+        # Definición de la saga: tipo de evento -> (eventos que pueden seguirlo, manejador)
+        definicion = {
+            CreatePartner: ([PartnerCreated, PartnerCreationFailed], self._procesar_create_partner),
+            PartnerCreated: ([ContratoCreado, ContratoCreadoFailed], self._procesar_partner_created),
+            PartnerCreationFailed: ([], self._procesar_partner_creation_failed),  # Fin de saga en caso de error
+            ContratoCreado: ([ContratoAprobado, ContratoRechazado], self._procesar_contrato_creado),  # Compliance después del contrato
+            ContratoCreadoFailed: ([], self._procesar_contrato_creado_failed),  # Fin de saga en caso de error
+            ContratoAprobado: ([], self._procesar_contrato_aprobado),  # Fin exitoso de saga - contrato aprobado
+            ContratoRechazado: ([RevisionContrato], self._procesar_contrato_rechazado),  # Si se rechaza, se puede revisar
+            RevisionContrato: ([], self._procesar_revision_contrato),  # Fin de saga - pendiente de revisión manual
         }
+        self.reglas_coreografia = {tipo: siguientes for tipo, (siguientes, _) in definicion.items()}
+        self.manejadores = {tipo: manejador for tipo, (_, manejador) in definicion.items()}
+        self.tipos_por_nombre = {tipo.__name__: tipo for tipo in self.reglas_coreografia}
         logger.info("� Initialized choreography rules for partner-contract saga")
 
-    def iniciar(self, partner_id: str):
-        """Inicia una nueva saga para un partner"""
-        saga_id = str(uuid.uuid4())
+    def iniciar(self, partner_id: str, correlacion_id: Optional[str] = None):
+        """
+        Inicia una nueva saga para un partner. Con id de correlación, la saga conserva el
+        saga_id y el instante de inicio del ComandoCrearPartner que la originó
+        """
+        ahora = datetime.utcnow()
+        iniciada_en = ahora
+        if correlacion_id:
+            saga_id = saga_id_de_correlacion(correlacion_id)
+            # No se elimina: si el CreatePartner aún espera en su worker, lo encuentra anotado
+            iniciada_en = self.comandos_pendientes.obtener(correlacion_id) or ahora
+            self.latencias.reasignar(correlacion_id, partner_id)
+        else:
+            saga_id = str(uuid.uuid4())
         logger.info(f"🚀 Starting choreographic saga for partner: {partner_id} (saga_id: {saga_id})")
         
-        self.estado_saga[partner_id] = {
+        self.estado_saga.guardar(partner_id, {
             'saga_id': saga_id,
             'estado': 'INICIADA',
             'eventos': [],
-            'timestamp': None
-        }
+            'ultimo_evento': None,
+            'iniciada_en': iniciada_en,
+            'actualizada_en': ahora,
+            'finalizada_en': None
+        })
+        self._programar_vencimiento(partner_id)
+        self.estadisticas.contar(INICIADAS, instante=ahora)
         
         # Registrar inicio de saga en el log
         if self.saga_log_service:
@@ -80,30 +171,38 @@ class CoordinadorPartnersCoreografico(CoordinadorCoreografia):
                 self.saga_log_service.registrar_evento_recibido(
                     saga_id=saga_id,
                     tipo_evento="SAGA_INICIADA",
-                    evento_data={"partner_id": partner_id, "action": "saga_start"}
+                    evento_data={"partner_id": partner_id, "action": "saga_start", "correlacion_id": correlacion_id}
                 )
                 logger.info(f"📝 Saga iniciada registrada en BD: {saga_id}")
             except Exception as e:
                 logger.error(f"❌ Error registrando inicio de saga: {e}")
 
-    def terminar(self, partner_id: str, exitoso: bool = True):
-        """Termina la saga para un partner"""
+    def terminar(self, partner_id: str, exitoso: bool = True) -> bool:
+        """Termina la saga para un partner; retorna False si no existe o ya había terminado"""
         estado_final = 'COMPLETADA' if exitoso else 'FALLIDA'
         
         # Validar que la saga existe y no está ya finalizada
-        if partner_id not in self.estado_saga:
+        estado_saga = self.estado_saga.obtener(partner_id)
+        if estado_saga is None:
             logger.warning(f"⚠️ Intentando terminar saga inexistente para partner: {partner_id}")
-            return
+            return False
         
-        estado_actual = self.estado_saga[partner_id].get('estado', 'INICIADA')
-        if estado_actual in ['COMPLETADA', 'FALLIDA']:
+        estado_actual = estado_saga.get('estado', 'INICIADA')
+        if estado_actual in ESTADOS_TERMINALES:
             logger.warning(f"⚠️ Saga ya finalizada para partner {partner_id} en estado: {estado_actual}")
-            return
+            return False
         
         logger.info(f"🏁 Partner saga {estado_final.lower()} for: {partner_id}")
         
-        saga_id = self.estado_saga[partner_id].get('saga_id')
-        self.estado_saga[partner_id]['estado'] = estado_final
+        saga_id = estado_saga.get('saga_id')
+        ahora = datetime.utcnow()
+        estado_saga['estado'] = estado_final
+        estado_saga['actualizada_en'] = ahora
+        estado_saga['finalizada_en'] = ahora
+        self.estado_saga.guardar(partner_id, estado_saga)
+        self._programar_desalojo(partner_id)
+        self.estadisticas.contar(COMPLETADAS if exitoso else FALLIDAS, instante=ahora)
+        self.latencias.finalizar_saga(partner_id)
         
         # Registrar fin de saga en el log
         if self.saga_log_service and saga_id:
@@ -120,6 +219,97 @@ class CoordinadorPartnersCoreografico(CoordinadorCoreografia):
                 logger.info(f"📝 Finalización de saga registrada en BD: {saga_id}")
             except Exception as e:
                 logger.error(f"❌ Error registrando finalización de saga: {e}")
+        return True
+
+    def asignar_ejecutor(self, ejecutor):
+        """
+        Usa el EjecutorPorClave del listener para aplicar vencimientos y desalojos en el
+        worker del partner, en orden con sus eventos; None los aplica en el hilo de la rueda
+        """
+        self.ejecutor = ejecutor
+
+    def _despachar(self, partner_id: str, tarea):
+        ejecutor = self.ejecutor
+        if ejecutor is None:
+            tarea(partner_id)
+        else:
+            ejecutor.enviar(partner_id, tarea, partner_id)
+
+    def _programar_vencimiento(self, partner_id: str, retardo_segundos: float = SAGA_TIMEOUT_SEGUNDOS):
+        """(Re)inicia el plazo tras el cual una saga sin actividad se da por vencida"""
+        self.temporizadores.programar(
+            partner_id, retardo_segundos, lambda: self._despachar(partner_id, self._vencer_saga)
+        )
+
+    def rearmar_vencimiento(self, partner_id: str, actualizada_en: datetime):
+        """Programa el vencimiento de una saga activa descontando el tiempo que ya lleva sin eventos"""
+        inactiva = (datetime.utcnow() - actualizada_en).total_seconds()
+        self._programar_vencimiento(partner_id, max(0.0, SAGA_TIMEOUT_SEGUNDOS - inactiva))
+
+    def _programar_desalojo(self, partner_id: str):
+        """Libera de memoria una saga finalizada tras el periodo de gracia"""
+        self.temporizadores.programar(
+            partner_id, SAGA_DESALOJO_GRACIA_SEGUNDOS,
+            lambda: self._despachar(partner_id, self.estado_saga.desalojar)
+        )
+
+    def _vencer_saga(self, partner_id: str):
+        """Marca como EXPIRADA una saga que no recibió eventos dentro del plazo"""
+        estado_saga = self.estado_saga.obtener(partner_id)
+        if estado_saga is None or estado_saga.get('estado') in ESTADOS_TERMINALES:
+            return
+        actualizada_en = estado_saga.get('actualizada_en')
+        if actualizada_en and (datetime.utcnow() - actualizada_en).total_seconds() < SAGA_TIMEOUT_SEGUNDOS - SAGA_RUEDA_RESOLUCION_SEGUNDOS:
+            # Otra réplica registró actividad después de programado este temporizador
+            self.rearmar_vencimiento(partner_id, actualizada_en)
+            return
+
+        logger.warning(f"⌛ Saga vencida para partner {partner_id} tras {SAGA_TIMEOUT_SEGUNDOS}s sin eventos")
+        saga_id = estado_saga.get('saga_id')
+        ahora = datetime.utcnow()
+        estado_saga['estado'] = 'EXPIRADA'
+        estado_saga['actualizada_en'] = ahora
+        estado_saga['finalizada_en'] = ahora
+        self.estado_saga.guardar(partner_id, estado_saga)
+        self._programar_desalojo(partner_id)
+        self.estadisticas.contar(EXPIRADAS, instante=ahora)
+        self.latencias.finalizar_saga(partner_id)
+
+        if self.saga_log_service and saga_id:
+            try:
+                self.saga_log_service.registrar_evento_recibido(
+                    saga_id=saga_id,
+                    tipo_evento="SAGA_TIMEOUT",
+                    evento_data={
+                        "partner_id": partner_id,
+                        "ultimo_evento": estado_saga.get('ultimo_evento'),
+                        "timeout_segundos": SAGA_TIMEOUT_SEGUNDOS
+                    }
+                )
+            except Exception as e:
+                logger.error(f"❌ Error registrando timeout de saga: {e}")
+
+    def _programar_purga_en_espera(self):
+        """Purga periódica: un evento en espera vencido se devuelve aunque no lleguen más eventos"""
+        self.temporizadores.programar(_PURGA_EN_ESPERA, SAGA_RUEDA_RESOLUCION_SEGUNDOS, self._purgar_eventos_en_espera)
+
+    def _purgar_eventos_en_espera(self):
+        try:
+            self.eventos_en_espera.purgar()
+        finally:
+            self._programar_purga_en_espera()
+
+    def cerrar(self):
+        """
+        Libera recursos del coordinador, persistiendo estados, saga logs y conteos pendientes.
+        Los eventos aún en espera se rechazan para que el broker los reentregue.
+        """
+        self.temporizadores.detener()
+        self.eventos_en_espera.vaciar()
+        self.estado_saga.cerrar()
+        self.estadisticas.detener()
+        if self.saga_log_service:
+            self.saga_log_service.cerrar()
 
     def persistir_en_saga_log(self, mensaje):
         logger.info(f"📝 Choreography log: {mensaje}")
@@ -134,7 +324,12 @@ class CoordinadorPartnersCoreografico(CoordinadorCoreografia):
         
         return evento_actual in self.reglas_coreografia.get(evento_anterior, [])
 
-    def procesar_evento(self, evento: EventoDominio):
+    def procesar_evento(self, evento: EventoDominio, confirmacion=None):
+        """
+        Aplica el evento en su saga. ``confirmacion`` (confirmar()/rechazar()/retener()) es
+        la del mensaje de origen: si el evento queda en espera se retiene con él y se
+        resuelve al aplicarlo o descartarlo; si no, la resuelve el llamador
+        """
         logger.info(f"📨 Processing choreographic event: {type(evento).__name__}")
         
         try:
@@ -147,84 +342,162 @@ class CoordinadorPartnersCoreografico(CoordinadorCoreografia):
             logger.info(f"🆔 Partner ID extracted: {partner_id}")
 
             if isinstance(evento, CreatePartner):
-                logger.info(f"📝 CreatePartner recibido - solo logging: {partner_id}")
-                self._log_evento_sin_saga(evento)
+                logger.info(f"📝 CreatePartner recibido - correlación: {evento.correlacion_id or 'N/A'}")
+                self._registrar_comando(evento)
                 self._procesar_evento_interno(evento)
                 return
             
-            if partner_id not in self.estado_saga:
-                if isinstance(evento, PartnerCreated):
-                    self.iniciar(partner_id)  # Usar el ID real del partner creado
-                    logger.info(f"🚀 Saga iniciada por PartnerCreated para partner: {partner_id}")
-            
-            saga_id = self.estado_saga[partner_id].get('saga_id')
-            self.estado_saga[partner_id]['eventos'].append(type(evento).__name__)
-            
-            # Registrar evento en el saga log si el servicio está disponible
-            if self.saga_log_service and saga_id:
-                try:
-                    evento_data = {
-                        'partner_id': partner_id, 
-                        'evento_tipo': type(evento).__name__,
-                        'timestamp': str(getattr(evento, 'fecha_evento', 'N/A'))
-                    }
-                    
-                    if hasattr(evento, 'contrato_id'):
-                        evento_data['contrato_id'] = getattr(evento, 'contrato_id', None)
-                    if hasattr(evento, 'monto'):
-                        evento_data['monto'] = getattr(evento, 'monto', None)
-                    if hasattr(evento, 'error_message'):
-                        evento_data['error_message'] = getattr(evento, 'error_message', None)
-                    
-                    self.saga_log_service.registrar_evento_recibido(
-                        saga_id=saga_id,
-                        tipo_evento=type(evento).__name__,
-                        evento_data=evento_data
-                    )
-                    logger.info(f"📝 Evento {type(evento).__name__} registrado en BD para saga: {saga_id}")
-                    
-                except Exception as e:
-                    # Warning en lugar de error para que continúe el procesamiento
-                    logger.warning(f"⚠️ Base de datos no disponible para logging de saga, continuando procesamiento: {e}")
-                    logger.info(f"📄 Evento {type(evento).__name__} procesado en memoria para saga: {saga_id}")
-            
-            # Procesar el evento normalmente
-            self._procesar_evento_interno(evento)
+            estado_saga = self.estado_saga.obtener(partner_id)
+            if estado_saga is None and isinstance(evento, PartnerCreated):
+                self.iniciar(partner_id, evento.correlacion_id or None)  # Usar el ID real del partner creado
+                logger.info(f"🚀 Saga iniciada por PartnerCreated para partner: {partner_id}")
+                estado_saga = self.estado_saga.obtener(partner_id)
+
+            if not self._es_aplicable(estado_saga, evento):
+                self._estacionar_evento(partner_id, evento, confirmacion)
+                return
+
+            self._aplicar_evento(partner_id, estado_saga, evento)
+            self._liberar_eventos_en_espera(partner_id)
                 
         except Exception as e:
             logger.error(f"💥 Error processing choreographic event: {type(e).__name__}: {str(e)}")
             logger.error(f"📍 Event type: {type(evento).__name__} for partner: {getattr(evento, 'partner_id', 'unknown')}")
             raise
 
+    def _es_aplicable(self, estado_saga: Optional[dict], evento: EventoDominio) -> bool:
+        """Indica si el evento puede aplicarse dado el último evento de la saga"""
+        if estado_saga is None:
+            return False
+        tipo_anterior = self.tipos_por_nombre.get(estado_saga.get('ultimo_evento'))
+        if tipo_anterior is None:
+            return True
+        return self.puede_procesar_evento(tipo_anterior, type(evento))
+
+    def _estacionar_evento(self, partner_id: str, evento: EventoDominio, confirmacion=None):
+        """
+        Deja el evento en espera de su predecesor junto con la confirmación de su mensaje,
+        que queda retenida hasta aplicarlo; si no hay espacio se rechaza para reentrega
+        """
+        if not self.eventos_en_espera.estacionar(partner_id, EventoEnEspera(evento, confirmacion)):
+            raise KeyError(f"Evento {type(evento).__name__} fuera de orden para partner {partner_id} y buffer de espera lleno")
+        if confirmacion is not None:
+            confirmacion.retener()
+        logger.info(f"⏸️ {type(evento).__name__} llegó antes que su predecesor, en espera para partner: {partner_id}")
+
+    def _liberar_eventos_en_espera(self, partner_id: str):
+        """Aplica en orden los eventos en espera que ya tienen su predecesor y confirma su mensaje"""
+        while True:
+            estado_saga = self.estado_saga.obtener(partner_id)
+            en_espera = self.eventos_en_espera.extraer(
+                partner_id, lambda pendiente: self._es_aplicable(estado_saga, pendiente.evento)
+            )
+            if en_espera is None:
+                return
+            evento, confirmacion = en_espera
+            logger.info(f"▶️ Aplicando {type(evento).__name__} que estaba en espera para partner: {partner_id}")
+            try:
+                self._aplicar_evento(partner_id, estado_saga, evento)
+            except Exception as e:
+                logger.error(f"💥 Error aplicando evento en espera {type(evento).__name__} para partner {partner_id}: {e}")
+                if confirmacion is not None:
+                    confirmacion.rechazar()
+                continue
+            if confirmacion is not None:
+                confirmacion.confirmar()
+
+    def _devolver_evento_en_espera(self, partner_id: str, en_espera: EventoEnEspera):
+        """Evento descartado del buffer sin aplicarse: se rechaza su mensaje para que el broker lo reentregue"""
+        logger.warning(f"↩️ {type(en_espera.evento).__name__} en espera descartado para partner {partner_id}, se reentregará")
+        if en_espera.confirmacion is not None:
+            en_espera.confirmacion.rechazar()
+
+    def _aplicar_evento(self, partner_id: str, estado_saga: dict, evento: EventoDominio):
+        """Registra el evento en el estado y el log de la saga, y lo procesa"""
+        saga_id = estado_saga.get('saga_id')
+        estado_saga['eventos'].append(type(evento).__name__)
+        estado_saga['ultimo_evento'] = type(evento).__name__
+        estado_saga['actualizada_en'] = datetime.utcnow()
+        self.estado_saga.guardar(partner_id, estado_saga)
+        if estado_saga.get('estado') not in ESTADOS_TERMINALES:
+            self._programar_vencimiento(partner_id)
+            self.latencias.registrar_paso(partner_id, type(evento).__name__)
+        
+        # Procesar el evento y registrar su resultado en el saga log. El evento ya quedó
+        # aplicado al estado, así que un fallo del manejador no se reentrega por Pulsar:
+        # queda en ERROR y lo retoma el reintentador de saga logs
+        recibido_en = datetime.utcnow()
+        try:
+            self._procesar_evento_interno(evento)
+        except Exception as e:
+            logger.error(f"💥 {type(evento).__name__} falló para partner {partner_id}, queda pendiente de reintento: {e}")
+            self._registrar_evento_aplicado(saga_id, evento, recibido_en, mensaje_error=str(e))
+            return
+        self._registrar_evento_aplicado(saga_id, evento, recibido_en)
+
+    def _registrar_evento_aplicado(self, saga_id: str, evento: EventoDominio, recibido_en: datetime,
+                                   mensaje_error: Optional[str] = None):
+        """Registra en el saga log un evento aplicado, con su resultado"""
+        if not (self.saga_log_service and saga_id):
+            return
+        try:
+            self.saga_log_service.registrar_evento_aplicado(
+                saga_id=saga_id,
+                tipo_evento=type(evento).__name__,
+                evento_data=self._datos_evento(evento),
+                timestamp=recibido_en,
+                mensaje_error=mensaje_error
+            )
+            logger.info(f"📝 Evento {type(evento).__name__} registrado en BD para saga: {saga_id}")
+        except Exception as e:
+            # Warning en lugar de error para que continúe el procesamiento
+            logger.warning(f"⚠️ Base de datos no disponible para logging de saga, continuando procesamiento: {e}")
+            logger.info(f"📄 Evento {type(evento).__name__} procesado en memoria para saga: {saga_id}")
+
+    def _datos_evento(self, evento: EventoDominio) -> dict:
+        """Campos del evento guardados en el saga log, suficientes para reprocesarlo"""
+        evento_data = {
+            'partner_id': evento.partner_id,
+            'evento_tipo': type(evento).__name__,
+            'timestamp': str(getattr(evento, 'fecha_evento', 'N/A'))
+        }
+        for campo in ('contrato_id', 'monto', 'error_message'):
+            if hasattr(evento, campo):
+                evento_data[campo] = getattr(evento, campo, None)
+        return evento_data
+
+    def tipos_reprocesables(self) -> list:
+        """Nombres de los eventos cuyo manejador puede reejecutarse desde el saga log"""
+        return [nombre for nombre, tipo in self.tipos_por_nombre.items() if tipo is not CreatePartner]
+
+    def reprocesar_evento(self, tipo_evento: str, evento_data: dict):
+        """
+        Vuelve a ejecutar el manejador de un evento registrado en el saga log.
+        El estado de la saga no se modifica: el evento ya fue aplicado en su momento.
+
+        Si la saga ya terminó, el manejador no se ejecuta: su efecto (terminar la saga y
+        contar el resultado) ya se aplicó en un intento anterior.
+        """
+        tipo = self.tipos_por_nombre.get(tipo_evento)
+        if tipo is None:
+            raise ValueError(f"Tipo de evento no reprocesable: {tipo_evento}")
+        campos = {campo.name for campo in fields(tipo) if campo.init} - {'id', 'fecha_evento'}
+        evento = tipo(**{clave: valor for clave, valor in evento_data.items() if clave in campos})
+        estado_saga = self.estado_saga.obtener(evento.partner_id)
+        if estado_saga is not None and estado_saga.get('estado') in ESTADOS_TERMINALES:
+            logger.info(f"⏭️ {tipo_evento} no se reprocesa: la saga de {evento.partner_id} ya está {estado_saga.get('estado')}")
+            return
+        logger.info(f"🔁 Reprocesando {tipo_evento} para partner: {evento.partner_id}")
+        self._procesar_evento_interno(evento)
+
     def _procesar_evento_interno(self, evento: EventoDominio):
         """Procesamiento interno del evento sin logging"""
         try:
-            if isinstance(evento, CreatePartner):
-                self._procesar_create_partner(evento)
-                
-            elif isinstance(evento, PartnerCreated):
-                self._procesar_partner_created(evento)
-                
-            elif isinstance(evento, PartnerCreationFailed):
-                self._procesar_partner_creation_failed(evento)
-                
-            elif isinstance(evento, ContratoCreado):
-                self._procesar_contrato_creado(evento)
-                
-            elif isinstance(evento, ContratoCreadoFailed):
-                self._procesar_contrato_creado_failed(evento)
-                
-            elif isinstance(evento, ContratoAprobado):
-                self._procesar_contrato_aprobado(evento)
-                
-            elif isinstance(evento, ContratoRechazado):
-                self._procesar_contrato_rechazado(evento)
-                
-            elif isinstance(evento, RevisionContrato):
-                self._procesar_revision_contrato(evento)
-                
-            else:
+            manejador = self.manejadores.get(type(evento))
+            if manejador is None:
                 logger.warning(f"⚠️  Unknown event type in choreographic saga: {type(evento).__name__}")
+                return
+            manejador(evento)
                 
         except Exception as e:
             logger.error(f"💥 Error in _procesar_evento_interno for {type(evento).__name__}: {type(e).__name__}: {str(e)}")
@@ -274,7 +547,10 @@ class CoordinadorPartnersCoreografico(CoordinadorCoreografia):
         logger.error(f"🔍 Compliance rejection reason: {evento.causa_rechazo}")
         logger.info("🔚 Saga terminates due to compliance rejection")
         
-        self.terminar(evento.partner_id, exitoso=False)
+        # Se cuenta solo si este evento terminó la saga: un reintento no lo cuenta dos veces
+        if self.terminar(evento.partner_id, exitoso=False):
+            self.estadisticas.contar(RECHAZADAS)
+            self.estadisticas.contar(VALIDACION_FALLIDA, evento.validacion_fallida or 'sin_detalle')
 
     def _procesar_revision_contrato(self, evento: RevisionContrato):
         logger.warning(f"⚠️ [CHOREOGRAPHY] RevisionContrato for partner: {evento.partner_id}")
@@ -283,49 +559,66 @@ class CoordinadorPartnersCoreografico(CoordinadorCoreografia):
         logger.warning(f"⚠️ Validation failed: {evento.validacion_fallida}")
         logger.info("⏳ Saga maintains PENDING_REVISION state - awaiting manual intervention")
         logger.info("⏭️ Next expected: Manual resolution or new ContratoAprobado/ContratoRechazado")
+        self.estadisticas.contar(PENDIENTES_REVISION)
 
     def obtener_estado_saga(self, partner_id: str) -> dict:
-        return self.estado_saga.get(partner_id, {})
+        return self.estado_saga.obtener(partner_id) or {}
     
     def obtener_historial_saga(self, partner_id: str) -> list:
         if not self.saga_log_service:
             return []
         
-        saga_data = self.estado_saga.get(partner_id, {})
+        saga_data = self.estado_saga.obtener(partner_id) or {}
         saga_id = saga_data.get('saga_id')
         
         if saga_id:
             return self.saga_log_service.obtener_historial_saga(saga_id)
         return []
 
-    def _log_evento_sin_saga(self, evento: EventoDominio):
-        """Log evento sin saga con manejo robusto de errores de conectividad"""
+    def anotar_comando(self, evento: CreatePartner) -> Optional[datetime]:
+        """
+        Anota el instante del ComandoCrearPartner bajo su id de correlación y retorna el
+        instante anotado. El listener la llama al recibir el mensaje, antes de encolarlo en
+        el worker del comando, para que el PartnerCreado la encuentre aunque su worker se
+        adelante; es idempotente, así que procesar_evento puede volver a llamarla
+        """
+        if not evento.correlacion_id:
+            return None
+        recibido_en = self.comandos_pendientes.obtener(evento.correlacion_id)
+        if recibido_en is None:
+            recibido_en = datetime.utcnow()
+            self.comandos_pendientes.guardar(evento.correlacion_id, recibido_en)
+            self.latencias.registrar_paso(evento.correlacion_id, type(evento).__name__)
+        return recibido_en
+
+    def _registrar_comando(self, evento: CreatePartner):
+        """
+        Registra el ComandoCrearPartner bajo el saga_id derivado de su id de correlación,
+        el mismo con el que se iniciará la saga al llegar su PartnerCreado
+        """
+        if not evento.correlacion_id:
+            logger.info(f"📄 CreatePartner sin id de correlación, no se registra en el saga log")
+            return
+
+        recibido_en = self.anotar_comando(evento)
+
         if self.saga_log_service:
+            saga_id = saga_id_de_correlacion(evento.correlacion_id)
             try:
-                # Generar un ID único para este evento sin saga
-                evento_id = str(uuid.uuid4())
-                
-                evento_data = {
-                    'partner_id': getattr(evento, 'partner_id', 'unknown'),
-                    'evento_tipo': type(evento).__name__,
-                    'timestamp': str(getattr(evento, 'fecha_evento', 'N/A')),
-                    'sin_saga': True  # Marcar que este evento no tiene saga asociada
-                }
-                
-                self.saga_log_service.registrar_evento_recibido(
-                    saga_id=evento_id,  # Usar evento_id como saga_id para eventos sin saga
+                self.saga_log_service.registrar_evento_aplicado(
+                    saga_id=saga_id,
                     tipo_evento=type(evento).__name__,
-                    evento_data=evento_data
+                    evento_data={
+                        'correlacion_id': evento.correlacion_id,
+                        'evento_tipo': type(evento).__name__,
+                        'timestamp': str(getattr(evento, 'fecha_evento', 'N/A'))
+                    },
+                    timestamp=recibido_en
                 )
-                logger.info(f"📝 Evento {type(evento).__name__} registrado en BD sin saga: {evento_id}")
-                
+                logger.info(f"📝 Comando {type(evento).__name__} registrado en BD para saga: {saga_id}")
             except Exception as e:
                 # Log del error pero continuar el procesamiento
                 logger.warning(f"⚠️ Base de datos no disponible para logging, continuando procesamiento: {e}")
-                logger.info(f"📄 Evento {type(evento).__name__} procesado en memoria para partner: {getattr(evento, 'partner_id', 'unknown')}")
-        else:
-            # Si no hay servicio de logging, solo hacer log en console
-            logger.info(f"📄 Evento {type(evento).__name__} procesado sin persistencia para partner: {getattr(evento, 'partner_id', 'unknown')}")
 
 def oir_mensaje(mensaje, saga_log_service=None):
     logger.info(f"👂 Received choreographic message: {type(mensaje).__name__}")
@@ -0,0 +1,47 @@
+"""
+Registro de tópicos de saga: tópico -> parser -> tipo de evento -> manejador
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+from src.seedwork.dominio.eventos import EventoDominio
+
+
+@dataclass(frozen=True)
+class EntradaRegistro:
+    """Cómo convertir y a quién entregar los mensajes de un tópico"""
+    topico: str
+    tipo_evento: type
+    parser: Callable[[str], EventoDominio]
+    manejador: Callable[..., None]  # (evento, confirmacion del mensaje)
+
+
+class RegistroSagas:
+    """
+    Tabla de despacho construida una vez al arrancar a partir de las definiciones
+    de cada saga. Agregar una saga nueva consiste en registrar sus tópicos; el
+    despacho de cada mensaje es una sola búsqueda en diccionario.
+    """
+
+    def __init__(self):
+        self._por_topico: Dict[str, EntradaRegistro] = {}
+
+    def registrar(self, topico: str, tipo_evento: type, parser: Callable, manejador: Callable) -> None:
+        if topico in self._por_topico:
+            raise ValueError(f"El tópico {topico} ya está registrado para {self._por_topico[topico].tipo_evento.__name__}")
+        self._por_topico[topico] = EntradaRegistro(topico, tipo_evento, parser, manejador)
+
+    def registrar_saga(self, definicion: List[tuple]) -> None:
+        """Registra una saga completa a partir de tuplas (tópico, tipo de evento, parser, manejador)"""
+        for topico, tipo_evento, parser, manejador in definicion:
+            self.registrar(topico, tipo_evento, parser, manejador)
+
+    def entrada(self, topico: str) -> EntradaRegistro:
+        try:
+            return self._por_topico[topico]
+        except KeyError:
+            raise ValueError(f"Tópico no registrado en ninguna saga: {topico}")
+
+    def topicos(self) -> Dict[str, type]:
+        """Tópicos registrados y el tipo de evento que producen"""
+        return {topico: entrada.tipo_evento for topico, entrada in self._por_topico.items()}
@@ -28,58 +28,88 @@ class SagaLogService:
         # Serializar los datos del evento a JSON
         evento_data_json = self._serializar_evento_data(evento_data)
         
+        partner_id, contrato_id = self._extraer_correlacion(evento_data)
         saga_log = SagaLog(
             id=log_id,
             saga_id=saga_id,
             tipo_evento=tipo_evento,
             evento_data=evento_data_json,
             estado=EstadoEvento.RECIBIDO,
-            timestamp=datetime.utcnow()
+            timestamp=datetime.utcnow(),
+            partner_id=partner_id,
+            contrato_id=contrato_id
         )
         
         self.saga_log_repository.agregar(saga_log)
         return saga_log
     
-    def marcar_evento_procesando(self, log_id: str) -> bool:
-        """Marca un evento como en procesamiento."""
-        saga_log = self.saga_log_repository.obtener_por_id(log_id)
-        if saga_log and saga_log.es_procesable():
-            saga_log.marcar_como_procesando()
-            self.saga_log_repository.actualizar(saga_log)
-            return True
-        return False
+    def registrar_evento_aplicado(
+        self,
+        saga_id: str,
+        tipo_evento: str,
+        evento_data: Any,
+        timestamp: datetime,
+        mensaje_error: Optional[str] = None
+    ) -> SagaLog:
+        """
+        Registra un evento ya procesado con su resultado (PROCESADO o ERROR) en un
+        único INSERT; los ERROR quedan disponibles para el reintentador.
+        """
+        partner_id, contrato_id = self._extraer_correlacion(evento_data)
+        saga_log = SagaLog(
+            id=str(uuid.uuid4()),
+            saga_id=saga_id,
+            tipo_evento=tipo_evento,
+            evento_data=self._serializar_evento_data(evento_data),
+            estado=EstadoEvento.ERROR if mensaje_error else EstadoEvento.PROCESADO,
+            timestamp=timestamp,
+            mensaje_error=mensaje_error,
+            procesado_en=None if mensaje_error else datetime.utcnow(),
+            partner_id=partner_id,
+            contrato_id=contrato_id
+        )
+        
+        self.saga_log_repository.agregar(saga_log)
+        return saga_log
     
-    def marcar_evento_procesado(self, log_id: str) -> bool:
+    # ``timestamp`` es el del log: con él la transición toca solo su partición de saga_logs
+
+    def marcar_evento_procesando(self, log_id: str, timestamp: Optional[datetime] = None) -> bool:
+        """Marca un evento como en procesamiento (solo desde RECIBIDO o ERROR)."""
+        return self.saga_log_repository.transicionar(log_id, EstadoEvento.PROCESANDO, timestamp=timestamp) is not None
+    
+    def marcar_evento_procesado(self, log_id: str, timestamp: Optional[datetime] = None) -> bool:
         """Marca un evento como procesado exitosamente."""
-        saga_log = self.saga_log_repository.obtener_por_id(log_id)
-        if saga_log:
-            saga_log.marcar_como_procesado()
-            self.saga_log_repository.actualizar(saga_log)
-            return True
-        return False
-    
-    def marcar_evento_error(self, log_id: str, mensaje_error: str) -> bool:
-        """Marca un evento con error."""
-        saga_log = self.saga_log_repository.obtener_por_id(log_id)
-        if saga_log:
-            saga_log.marcar_como_error(mensaje_error)
-            self.saga_log_repository.actualizar(saga_log)
-            return True
-        return False
-    
-    def obtener_historial_saga(self, saga_id: str, limit: int = 100) -> List[SagaLog]:
-        """Obtiene el historial completo de una saga."""
-        return self.saga_log_repository.obtener_historial_saga(saga_id, limit)
-    
-    def obtener_eventos_pendientes(self, max_intentos: int = 3) -> List[SagaLog]:
-        """Obtiene eventos que pueden ser reprocesados."""
-        return self.saga_log_repository.obtener_eventos_pendientes(max_intentos)
+        return self.saga_log_repository.transicionar(log_id, EstadoEvento.PROCESADO, timestamp=timestamp) is not None
+    
+    def marcar_evento_error(self, log_id: str, mensaje_error: str, timestamp: Optional[datetime] = None) -> bool:
+        """Marca un evento con error e incrementa sus intentos."""
+        return self.saga_log_repository.transicionar(
+            log_id, EstadoEvento.ERROR, mensaje_error, timestamp=timestamp
+        ) is not None
+    
+    def obtener_historial_saga(self, saga_id: str, limit: int = 100, despues_de=None) -> List[SagaLog]:
+        """Obtiene una página del historial de una saga; ``despues_de`` es el cursor de la página anterior."""
+        return self.saga_log_repository.obtener_historial_saga(saga_id, limit, despues_de)
+    
+    def obtener_eventos_pendientes(self, max_intentos: int = 3, limite: int = 100, despues_de=None) -> List[SagaLog]:
+        """Obtiene una página de eventos que pueden ser reprocesados."""
+        return self.saga_log_repository.obtener_eventos_pendientes(max_intentos, limite, despues_de)
+    
+    def obtener_logs_por_partner(self, partner_id: str, limite: int = 100, despues_de=None) -> List[SagaLog]:
+        """Obtiene una página de logs de todas las sagas de un partner."""
+        return self.saga_log_repository.obtener_por_partner_id(partner_id, limite, despues_de)
+    
+    def obtener_logs_por_contrato(self, contrato_id: str, limite: int = 100, despues_de=None) -> List[SagaLog]:
+        """Obtiene una página de logs de un contrato."""
+        return self.saga_log_repository.obtener_por_contrato_id(contrato_id, limite, despues_de)
     
     def obtener_eventos_por_estado(self, estado: EstadoEvento) -> List[SagaLog]:
         """Obtiene eventos por estado específico."""
         return self.saga_log_repository.obtener_por_estado(estado)
     
     def procesar_evento_con_logging(
+        self,
         saga_id: str, 
         tipo_evento: str, 
         evento_data: Any,
@@ -90,20 +120,34 @@ class SagaLogService:
         
         try:
             # Marcar como procesando
-            self.marcar_evento_procesando(saga_log.id)
+            self.marcar_evento_procesando(saga_log.id, saga_log.timestamp)
             
             # Ejecutar el procesamiento
             procesador_callback(evento_data)
             
             # Marcar como procesado
-            self.marcar_evento_procesado(saga_log.id)
+            self.marcar_evento_procesado(saga_log.id, saga_log.timestamp)
             return True, None
             
         except Exception as e:
             error_msg = f"Error procesando evento {tipo_evento}: {str(e)}"
-            self.marcar_evento_error(saga_log.id, error_msg)
+            self.marcar_evento_error(saga_log.id, error_msg, saga_log.timestamp)
             return False, error_msg
     
+    def cerrar(self) -> None:
+        """Vacía las escrituras pendientes del repositorio, si las difiere."""
+        cerrar = getattr(self.saga_log_repository, 'cerrar', None)
+        if cerrar:
+            cerrar()
+    
+    def _extraer_correlacion(self, evento_data: Any) -> tuple[Optional[str], Optional[str]]:
+        """Obtiene partner_id y contrato_id del evento para las columnas indexadas."""
+        if isinstance(evento_data, dict):
+            partner_id, contrato_id = evento_data.get('partner_id'), evento_data.get('contrato_id')
+        else:
+            partner_id, contrato_id = getattr(evento_data, 'partner_id', None), getattr(evento_data, 'contrato_id', None)
+        return (str(partner_id) if partner_id else None, str(contrato_id) if contrato_id else None)
+    
     def _serializar_evento_data(self, evento_data: Any) -> str:
         """Serializa los datos del evento a JSON."""
         try:
@@ -4,7 +4,6 @@ Configuración de base de datos para el módulo de sagas usando SQLAlchemy puro
 import os
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import StaticPool
 
 SagaBase = declarative_base()
 
@@ -17,11 +16,19 @@ DATABASE_URL = os.getenv(
     f"{os.getenv('POSTGRES_DB', 'gestion_alianzas')}"
 )
 
+# Tamaño del pool: los hilos del listener toman una conexión por unidad de trabajo
+SAGA_DB_POOL_SIZE = int(os.getenv('SAGA_DB_POOL_SIZE', '10'))
+SAGA_DB_MAX_OVERFLOW = int(os.getenv('SAGA_DB_MAX_OVERFLOW', '5'))
+SAGA_DB_POOL_TIMEOUT = float(os.getenv('SAGA_DB_POOL_TIMEOUT', '30'))
+
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # Cambiar a True para debug SQL
     pool_pre_ping=True,
-    pool_recycle=300
+    pool_recycle=300,
+    pool_size=SAGA_DB_POOL_SIZE,
+    max_overflow=SAGA_DB_MAX_OVERFLOW,
+    pool_timeout=SAGA_DB_POOL_TIMEOUT
 )
 
 SagaSessionFactory = sessionmaker(
@@ -0,0 +1,69 @@
+"""
+Parámetros de ejecución del módulo de sagas, configurables por variables de entorno
+"""
+import os
+
+# Cache en memoria del estado de sagas (delante de la tabla saga_estados)
+SAGA_ESTADO_CACHE_MAX = int(os.getenv('SAGA_ESTADO_CACHE_MAX', '10000'))
+SAGA_ESTADO_CACHE_TTL_SEGUNDOS = float(os.getenv('SAGA_ESTADO_CACHE_TTL_SEGUNDOS', '900'))
+# Las transiciones se escriben en saga_estados por lotes cada SAGA_ESTADO_FLUSH_MS
+SAGA_ESTADO_FLUSH_MS = int(os.getenv('SAGA_ESTADO_FLUSH_MS', '250'))
+
+# Escritura diferida (write-behind) de saga_logs
+SAGA_LOG_WRITE_BEHIND = os.getenv('SAGA_LOG_WRITE_BEHIND', 'true').lower() == 'true'
+SAGA_LOG_LOTE_MAX = int(os.getenv('SAGA_LOG_LOTE_MAX', '200'))
+SAGA_LOG_FLUSH_MS = int(os.getenv('SAGA_LOG_FLUSH_MS', '250'))
+SAGA_LOG_COLA_MAX = int(os.getenv('SAGA_LOG_COLA_MAX', '10000'))
+
+# Listener de saga: 'multi-topico' (un consumer y un pool de workers) o 'por-topico' (un hilo por tópico)
+SAGA_LISTENER_MODO = os.getenv('SAGA_LISTENER_MODO', 'multi-topico')
+SAGA_LISTENER_WORKERS = int(os.getenv('SAGA_LISTENER_WORKERS', '4'))
+SAGA_LISTENER_RECEIVE_TIMEOUT_MS = int(os.getenv('SAGA_LISTENER_RECEIVE_TIMEOUT_MS', '1000'))
+SAGA_LISTENER_COLA_MAX = int(os.getenv('SAGA_LISTENER_COLA_MAX', '100'))
+
+# Buffer de reordenamiento para eventos que llegan antes que su predecesor
+SAGA_REORDEN_MAX_PARTNERS = int(os.getenv('SAGA_REORDEN_MAX_PARTNERS', '10000'))
+SAGA_REORDEN_MAX_POR_PARTNER = int(os.getenv('SAGA_REORDEN_MAX_POR_PARTNER', '10'))
+SAGA_REORDEN_TTL_SEGUNDOS = float(os.getenv('SAGA_REORDEN_TTL_SEGUNDOS', '300'))
+
+# Vencimiento de sagas estancadas y desalojo de sagas finalizadas (rueda de temporizadores)
+SAGA_TIMEOUT_SEGUNDOS = float(os.getenv('SAGA_TIMEOUT_SEGUNDOS', '86400'))
+SAGA_DESALOJO_GRACIA_SEGUNDOS = float(os.getenv('SAGA_DESALOJO_GRACIA_SEGUNDOS', '60'))
+SAGA_RUEDA_RESOLUCION_SEGUNDOS = float(os.getenv('SAGA_RUEDA_RESOLUCION_SEGUNDOS', '1'))
+SAGA_RUEDA_RANURAS = int(os.getenv('SAGA_RUEDA_RANURAS', '3600'))
+
+# Reintento de eventos en ERROR del saga log (varias réplicas reparten la carga con SKIP LOCKED)
+SAGA_REINTENTO_HABILITADO = os.getenv('SAGA_REINTENTO_HABILITADO', 'true').lower() == 'true'
+SAGA_REINTENTO_INTERVALO_SEGUNDOS = float(os.getenv('SAGA_REINTENTO_INTERVALO_SEGUNDOS', '5'))
+SAGA_REINTENTO_LOTE = int(os.getenv('SAGA_REINTENTO_LOTE', '50'))
+SAGA_REINTENTO_MAX_INTENTOS = int(os.getenv('SAGA_REINTENTO_MAX_INTENTOS', '3'))
+SAGA_REINTENTO_BACKOFF_BASE_SEGUNDOS = float(os.getenv('SAGA_REINTENTO_BACKOFF_BASE_SEGUNDOS', '2'))
+SAGA_REINTENTO_BACKOFF_MAX_SEGUNDOS = float(os.getenv('SAGA_REINTENTO_BACKOFF_MAX_SEGUNDOS', '300'))
+SAGA_REINTENTO_TIMEOUT_SEGUNDOS = float(os.getenv('SAGA_REINTENTO_TIMEOUT_SEGUNDOS', '30'))
+# Lease de un log reclamado: no se vuelve a reclamar antes aunque su reproceso no termine en el timeout
+SAGA_REINTENTO_LEASE_SEGUNDOS = float(os.getenv('SAGA_REINTENTO_LEASE_SEGUNDOS', '300'))
+
+# Particiones mensuales de saga_logs: creación anticipada, retención y archivo NDJSON.gz
+SAGA_LOGS_PARTICIONES_ADELANTE = int(os.getenv('SAGA_LOGS_PARTICIONES_ADELANTE', '3'))
+SAGA_LOGS_RETENCION_MESES = int(os.getenv('SAGA_LOGS_RETENCION_MESES', '12'))
+SAGA_LOGS_DIRECTORIO_ARCHIVO = os.getenv('SAGA_LOGS_DIRECTORIO_ARCHIVO', '/var/lib/gestion-alianzas/saga-logs-archivo')
+SAGA_LOGS_MANTENIMIENTO_INTERVALO_HORAS = float(os.getenv('SAGA_LOGS_MANTENIMIENTO_INTERVALO_HORAS', '24'))
+
+# Reconstrucción de saga_estados desde saga_logs al iniciar el listener
+SAGA_REPLAY_AL_INICIAR = os.getenv('SAGA_REPLAY_AL_INICIAR', 'false').lower() == 'true'
+SAGA_REPLAY_LOTE = int(os.getenv('SAGA_REPLAY_LOTE', '5000'))
+
+# Cache de respuestas de la API de consulta de sagas (GET /sagas)
+SAGA_API_CACHE_MAX = int(os.getenv('SAGA_API_CACHE_MAX', '5000'))
+SAGA_API_CACHE_TTL_SEGUNDOS = float(os.getenv('SAGA_API_CACHE_TTL_SEGUNDOS', '5'))
+
+# Estadísticas horarias de resultados de sagas: conteos acumulados en memoria y volcados por lotes
+SAGA_ESTADISTICAS_FLUSH_SEGUNDOS = float(os.getenv('SAGA_ESTADISTICAS_FLUSH_SEGUNDOS', '5'))
+
+# Histogramas de latencia por paso de saga (límites superiores de los buckets, en segundos)
+SAGA_LATENCIA_BUCKETS = [
+    float(limite) for limite in os.getenv(
+        'SAGA_LATENCIA_BUCKETS',
+        '0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60,120,300,600,1800,3600,7200,21600,86400'
+    ).split(',')
+]
@@ -15,6 +15,14 @@ class EstadoEvento(Enum):
     ERROR = "ERROR"
 
 
+# Estados desde los que se permite llegar a cada estado
+ORIGENES_TRANSICION = {
+    EstadoEvento.PROCESANDO: (EstadoEvento.RECIBIDO, EstadoEvento.ERROR),
+    EstadoEvento.PROCESADO: (EstadoEvento.RECIBIDO, EstadoEvento.PROCESANDO, EstadoEvento.ERROR),
+    EstadoEvento.ERROR: (EstadoEvento.RECIBIDO, EstadoEvento.PROCESANDO, EstadoEvento.ERROR),
+}
+
+
 @dataclass
 class SagaLog(Entidad):
     """Entidad de dominio que representa un log de evento de saga."""
@@ -34,6 +42,10 @@ class SagaLog(Entidad):
     mensaje_error: Optional[str] = None
     intentos: int = 1
     procesado_en: Optional[datetime] = None
+
+    # Correlación (columnas indexadas, extraídas de evento_data al registrar)
+    partner_id: Optional[str] = None
+    contrato_id: Optional[str] = None
     
     def __post_init__(self):
         """Validaciones post-inicialización."""
@@ -17,7 +17,8 @@ from seedwork.dominio.eventos import EventoDominio
 @dataclass
 class CreatePartner(EventoDominio):
     """Evento que se dispara cuando se necesita crear un partner"""
-    partner_id: str = ""
+    partner_id: str = ""  # Aún desconocido: lo asigna gestion-de-integraciones
+    correlacion_id: str = ""  # id del ComandoCrearPartner
 
     def __post_init__(self):
         self._id = self.siguiente_id()
@@ -27,6 +28,7 @@ class CreatePartner(EventoDominio):
 class PartnerCreated(EventoDominio):
     """Evento que se dispara cuando un partner ha sido creado exitosamente"""
     partner_id: str = ""
+    correlacion_id: str = ""  # id del ComandoCrearPartner que lo originó
 
     def __post_init__(self):
         self._id = self.siguiente_id()
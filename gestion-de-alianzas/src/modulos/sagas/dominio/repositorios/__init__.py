@@ -1,4 +1,5 @@
 """Repositorios de dominio del módulo de sagas."""
 from .saga_log_repository import ISagaLogRepository, ISagaLogRepositorySync
+from .saga_estado_repository import ISagaEstadoRepository
 
-__all__ = ['ISagaLogRepository', 'ISagaLogRepositorySync']
\ No newline at end of file
+__all__ = ['ISagaLogRepository', 'ISagaLogRepositorySync', 'ISagaEstadoRepository']
@@ -0,0 +1,40 @@
+"""Repositorio abstracto para el estado actual de las sagas."""
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+
+class ISagaEstadoRepository(ABC):
+    """Contrato para el almacenamiento del estado de saga por partner."""
+
+    @abstractmethod
+    def obtener(self, partner_id: str) -> Optional[dict]:
+        """Obtiene el estado de la saga de un partner, o None si no existe."""
+        pass
+
+    @abstractmethod
+    def guardar(self, partner_id: str, estado: dict) -> None:
+        """Crea o actualiza el estado de la saga de un partner."""
+        pass
+
+    @abstractmethod
+    def guardar_lote(self, estados: Dict[str, dict]) -> None:
+        """
+        Crea o actualiza el estado de varias sagas, indexado por partner_id. Una saga ya
+        guardada solo se reemplaza si su ``actualizada_en`` es anterior al nuevo.
+        """
+        pass
+
+    @abstractmethod
+    def desalojar(self, partner_id: str) -> None:
+        """Libera el estado de la memoria del proceso sin borrarlo del almacenamiento."""
+        pass
+
+    @abstractmethod
+    def eliminar(self, partner_id: str) -> None:
+        """Elimina el estado de la saga de un partner."""
+        pass
+
+    @abstractmethod
+    def cerrar(self) -> None:
+        """Persiste los cambios pendientes y libera los recursos del repositorio."""
+        pass
@@ -1,8 +1,12 @@
 """Repositorio abstracto para el manejo de logs de saga."""
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from ..entidades.saga_log import SagaLog, EstadoEvento
 
+# Cursor de paginación: (timestamp, id) del último log de la página anterior
+Cursor = Tuple[datetime, str]
+
 
 class ISagaLogRepository(ABC):
     """Contrato para el repositorio de logs de saga."""
@@ -23,8 +27,24 @@ class ISagaLogRepository(ABC):
         pass
     
     @abstractmethod
-    async def obtener_por_estado(self, estado: EstadoEvento) -> List[SagaLog]:
-        """Obtiene logs por estado específico."""
+    async def obtener_por_partner_id(
+        self, partner_id: str, limite: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs de un partner, de todas sus sagas."""
+        pass
+    
+    @abstractmethod
+    async def obtener_por_contrato_id(
+        self, contrato_id: str, limite: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs de un contrato."""
+        pass
+    
+    @abstractmethod
+    async def obtener_por_estado(
+        self, estado: EstadoEvento, limite: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs por estado específico."""
         pass
     
     @abstractmethod
@@ -33,13 +53,28 @@ class ISagaLogRepository(ABC):
         pass
     
     @abstractmethod
-    async def obtener_eventos_pendientes(self, max_intentos: int = 3) -> List[SagaLog]:
-        """Obtiene eventos que pueden ser reprocesados."""
+    async def transicionar(
+        self, log_id: str, estado: EstadoEvento, mensaje_error: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[SagaLog]:
+        """
+        Cambia el estado de un log si la transición es válida; retorna el log actualizado o None.
+        ``timestamp`` (el del log) completa la llave primaria y limita el UPDATE a su partición.
+        """
+        pass
+    
+    @abstractmethod
+    async def obtener_eventos_pendientes(
+        self, max_intentos: int = 3, limite: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de eventos que pueden ser reprocesados."""
         pass
     
     @abstractmethod
-    async def obtener_historial_saga(self, saga_id: str, limit: int = 100) -> List[SagaLog]:
-        """Obtiene el historial completo de una saga ordenado por timestamp."""
+    async def obtener_historial_saga(
+        self, saga_id: str, limit: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página del historial de una saga ordenado por timestamp."""
         pass
 
 
@@ -63,8 +98,24 @@ class ISagaLogRepositorySync(ABC):
         pass
     
     @abstractmethod
-    def obtener_por_estado(self, estado: EstadoEvento) -> List[SagaLog]:
-        """Obtiene logs por estado específico."""
+    def obtener_por_partner_id(
+        self, partner_id: str, limite: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs de un partner, de todas sus sagas."""
+        pass
+    
+    @abstractmethod
+    def obtener_por_contrato_id(
+        self, contrato_id: str, limite: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs de un contrato."""
+        pass
+    
+    @abstractmethod
+    def obtener_por_estado(
+        self, estado: EstadoEvento, limite: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs por estado específico."""
         pass
     
     @abstractmethod
@@ -73,11 +124,26 @@ class ISagaLogRepositorySync(ABC):
         pass
     
     @abstractmethod
-    def obtener_eventos_pendientes(self, max_intentos: int = 3) -> List[SagaLog]:
-        """Obtiene eventos que pueden ser reprocesados."""
+    def transicionar(
+        self, log_id: str, estado: EstadoEvento, mensaje_error: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[SagaLog]:
+        """
+        Cambia el estado de un log si la transición es válida; retorna el log actualizado o None.
+        ``timestamp`` (el del log) completa la llave primaria y limita el UPDATE a su partición.
+        """
+        pass
+    
+    @abstractmethod
+    def obtener_eventos_pendientes(
+        self, max_intentos: int = 3, limite: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de eventos que pueden ser reprocesados."""
         pass
     
     @abstractmethod
-    def obtener_historial_saga(self, saga_id: str, limit: int = 100) -> List[SagaLog]:
-        """Obtiene el historial completo de una saga ordenado por timestamp."""
+    def obtener_historial_saga(
+        self, saga_id: str, limit: int = 100, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página del historial de una saga ordenado por timestamp."""
         pass
\ No newline at end of file
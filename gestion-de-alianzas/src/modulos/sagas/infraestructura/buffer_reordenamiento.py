@@ -0,0 +1,137 @@
+"""
+Buffer acotado para eventos de saga que llegan antes que su predecesor
+"""
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Hashable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BufferReordenamiento:
+    """
+    Estaciona eventos por clave (partner_id) hasta que puedan aplicarse.
+
+    Cada evento estacionado expira tras ``ttl_segundos``. El buffer está acotado
+    en número de claves y en eventos por clave; cuando no hay espacio ``estacionar``
+    retorna False y el llamador decide qué hacer con el evento.
+
+    Los vencimientos de todas las claves se llevan en un heap, así que los eventos
+    expirados se descartan en orden de vencimiento sin importar su clave. Cada
+    descartado (por vencimiento o al vaciar el buffer) se entrega a ``al_descartar``
+    fuera del lock, para que el llamador pueda devolverlo a su origen.
+    """
+
+    def __init__(self, max_claves: int, max_por_clave: int, ttl_segundos: float,
+                 reloj: Callable[[], float] = time.monotonic,
+                 al_descartar: Optional[Callable[[Hashable, Any], None]] = None):
+        self.max_claves = max_claves
+        self.max_por_clave = max_por_clave
+        self.ttl_segundos = ttl_segundos
+        self._reloj = reloj
+        self._al_descartar = al_descartar
+        self._pendientes: "dict[Hashable, list[tuple[float, Any]]]" = {}
+        # (expira_en, secuencia, clave); puede contener entradas ya extraídas
+        self._vencimientos: "list[tuple[float, int, Hashable]]" = []
+        self._secuencia = itertools.count()
+        self._lock = threading.Lock()
+
+    def estacionar(self, clave: Hashable, elemento: Any) -> bool:
+        with self._lock:
+            ahora = self._reloj()
+            descartados = self._purgar(ahora)
+
+            entradas = self._pendientes.get(clave)
+            if entradas is None:
+                aceptado = len(self._pendientes) < self.max_claves
+                if aceptado:
+                    entradas = self._pendientes[clave] = []
+            else:
+                aceptado = len(entradas) < self.max_por_clave
+
+            if aceptado:
+                expira_en = ahora + self.ttl_segundos
+                entradas.append((expira_en, elemento))
+                heapq.heappush(self._vencimientos, (expira_en, next(self._secuencia), clave))
+        self._notificar(descartados)
+        return aceptado
+
+    def extraer(self, clave: Hashable, es_aplicable: Callable[[Any], bool]) -> Optional[Any]:
+        """Retira y retorna el primer elemento vigente de la clave que cumpla ``es_aplicable``."""
+        encontrado = None
+        with self._lock:
+            entradas = self._pendientes.get(clave)
+            if not entradas:
+                return None
+            descartados = self._descartar_expirados(clave, self._reloj())
+            entradas = self._pendientes.get(clave, [])
+            for i, (expira_en, elemento) in enumerate(entradas):
+                if es_aplicable(elemento):
+                    del entradas[i]
+                    if not entradas:
+                        del self._pendientes[clave]
+                    encontrado = elemento
+                    break
+        self._notificar(descartados)
+        return encontrado
+
+    def purgar(self) -> int:
+        """Descarta los eventos expirados de todas las claves; retorna cuántos descartó."""
+        with self._lock:
+            descartados = self._purgar(self._reloj())
+        self._notificar(descartados)
+        return len(descartados)
+
+    def vaciar(self) -> int:
+        """Descarta todos los eventos en espera, vigentes o no; retorna cuántos descartó."""
+        with self._lock:
+            descartados = [
+                (clave, elemento)
+                for clave, entradas in self._pendientes.items()
+                for _, elemento in entradas
+            ]
+            self._pendientes.clear()
+            self._vencimientos.clear()
+        self._notificar(descartados)
+        return len(descartados)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(entradas) for entradas in self._pendientes.values())
+
+    def _purgar(self, ahora: float) -> List[tuple]:
+        """Retira los eventos expirados de todas las claves, en orden de vencimiento."""
+        descartados = []
+        while self._vencimientos and self._vencimientos[0][0] <= ahora:
+            _, _, clave = heapq.heappop(self._vencimientos)
+            descartados.extend(self._descartar_expirados(clave, ahora))
+        return descartados
+
+    def _descartar_expirados(self, clave: Hashable, ahora: float) -> List[tuple]:
+        entradas = self._pendientes.get(clave)
+        if not entradas:
+            return []
+        # Las entradas de una clave están en orden de llegada, y por tanto de vencimiento
+        vencidas = 0
+        while vencidas < len(entradas) and entradas[vencidas][0] <= ahora:
+            vencidas += 1
+        if not vencidas:
+            return []
+        descartados = [(clave, elemento) for _, elemento in entradas[:vencidas]]
+        logger.warning(f"⌛ {vencidas} evento(s) en espera expiraron sin su predecesor para {clave}")
+        del entradas[:vencidas]
+        if not entradas:
+            del self._pendientes[clave]
+        return descartados
+
+    def _notificar(self, descartados: List[tuple]) -> None:
+        if self._al_descartar is None:
+            return
+        for clave, elemento in descartados:
+            try:
+                self._al_descartar(clave, elemento)
+            except Exception as e:
+                logger.error(f"❌ Error devolviendo evento en espera descartado para {clave}: {e}")
@@ -0,0 +1,69 @@
+"""
+Cache LRU en memoria con expiración por TTL para el módulo de sagas
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class CacheLRU:
+    """
+    Cache acotada por tamaño y por tiempo de vida de cada entrada.
+
+    Todas las operaciones son O(1) y seguras entre hilos; cuando se supera
+    ``max_elementos`` se descarta la entrada usada hace más tiempo.
+    """
+
+    def __init__(self, max_elementos: int, ttl_segundos: float, reloj: Callable[[], float] = time.monotonic):
+        if max_elementos <= 0:
+            raise ValueError("max_elementos debe ser mayor que cero")
+        self.max_elementos = max_elementos
+        self.ttl_segundos = ttl_segundos
+        self._reloj = reloj
+        self._datos: "OrderedDict[Hashable, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave: Hashable) -> Optional[Any]:
+        """Retorna el valor asociado o None si no existe o ya expiró."""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return None
+            valor, expira_en = entrada
+            if expira_en <= self._reloj():
+                del self._datos[clave]
+                return None
+            self._datos.move_to_end(clave)
+            return valor
+
+    def guardar(self, clave: Hashable, valor: Any) -> None:
+        """Inserta o reemplaza una entrada, reiniciando su TTL."""
+        with self._lock:
+            ahora = self._reloj()
+            self._datos[clave] = (valor, ahora + self.ttl_segundos)
+            self._datos.move_to_end(clave)
+            self._desalojar(ahora)
+
+    def eliminar(self, clave: Hashable) -> None:
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def __contains__(self, clave: Hashable) -> bool:
+        return self.obtener(clave) is not None
+
+    def __len__(self) -> int:
+        return len(self._datos)
+
+    def _desalojar(self, ahora: float) -> None:
+        """Descarta entradas expiradas al inicio y las menos usadas si se excede el tamaño."""
+        while self._datos:
+            _, (_, expira_en) = next(iter(self._datos.items()))
+            if len(self._datos) > self.max_elementos or expira_en <= ahora:
+                self._datos.popitem(last=False)
+            else:
+                break
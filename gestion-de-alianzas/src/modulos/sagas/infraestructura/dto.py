@@ -1,5 +1,5 @@
 """Modelos de base de datos para el módulo de sagas."""
-from sqlalchemy import Column, String, Text, DateTime, Integer, Enum, Index
+from sqlalchemy import Column, String, Text, DateTime, Integer, BigInteger, Enum, Index
 from sqlalchemy.dialects.postgresql import UUID
 from modulos.alianzas.infrastructure.db import Base
 import uuid
@@ -21,9 +21,15 @@ class SagaLog(Base):
     __tablename__ = "saga_logs"
     __table_args__ = (
         Index('idx_saga_logs_saga_id_timestamp', 'saga_id', 'timestamp'),
-        Index('idx_saga_logs_estado', 'estado'),
+        Index('idx_saga_logs_estado', 'estado', 'timestamp'),
         Index('idx_saga_logs_tipo_evento', 'tipo_evento'),
-        {'extend_existing': True}  # Permitir redefinir la tabla si ya existe
+        Index('idx_saga_logs_partner_id_timestamp', 'partner_id', 'timestamp'),
+        Index('idx_saga_logs_contrato_id_timestamp', 'contrato_id', 'timestamp'),
+        {
+            'extend_existing': True,  # Permitir redefinir la tabla si ya existe
+            # Particiones mensuales por timestamp (ver infraestructura/particiones_saga_logs.py)
+            'postgresql_partition_by': 'RANGE (timestamp)',
+        }
     )
     
     # Atributos de identidad
@@ -36,13 +42,57 @@ class SagaLog(Base):
     
     # Información de procesamiento
     estado = Column(Enum(EstadoEventoDTO), nullable=False, default=EstadoEventoDTO.RECIBIDO)
-    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Parte de la llave primaria: en una tabla particionada la llave debe incluir la columna de partición
+    timestamp = Column(DateTime, primary_key=True, nullable=False, default=datetime.utcnow)
     
     # Información adicional
     mensaje_error = Column(Text, nullable=True)
     intentos = Column(Integer, nullable=False, default=1)
     procesado_en = Column(DateTime, nullable=True)
+    # Reintentos: fin del lease del intento en curso o instante desde el que puede reintentarse
+    proximo_intento = Column(DateTime, nullable=True)
+    
+    # Correlación desnormalizada desde evento_data para búsquedas por índice
+    partner_id = Column(String(200), nullable=True)
+    contrato_id = Column(String(200), nullable=True)
     
     # Timestamps de auditoría
     creado_en = Column(DateTime, nullable=False, default=datetime.utcnow)
-    actualizado_en = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    actualizado_en = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class SagaEstado(Base):
+    """Modelo de base de datos con el estado actual de cada saga (una fila por saga)."""
+
+    __tablename__ = "saga_estados"
+    __table_args__ = (
+        Index('idx_saga_estados_estado_actualizada', 'estado', 'actualizada_en', 'saga_id'),
+        Index('idx_saga_estados_actualizada', 'actualizada_en', 'saga_id'),
+        {'extend_existing': True}
+    )
+
+    saga_id = Column(UUID(as_uuid=True), primary_key=True)
+    partner_id = Column(String(200), nullable=False, unique=True, index=True)
+
+    estado = Column(String(30), nullable=False)
+    ultimo_evento = Column(String(200), nullable=True)
+
+    iniciada_en = Column(DateTime, nullable=False, default=datetime.utcnow)
+    actualizada_en = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finalizada_en = Column(DateTime, nullable=True)
+
+
+class SagaEstadisticaHoraria(Base):
+    """Modelo de base de datos con conteos agregados de resultados de sagas por hora."""
+
+    __tablename__ = "saga_estadisticas_horarias"
+    __table_args__ = {'extend_existing': True}
+
+    # Inicio de la hora (UTC) a la que pertenece el conteo
+    hora = Column(DateTime, primary_key=True)
+    # iniciadas, completadas, fallidas, expiradas, rechazadas, pendientes_revision o validacion_fallida
+    metrica = Column(String(50), primary_key=True)
+    # Desglose de la métrica (p. ej. la validación que falló); cadena vacía si no aplica
+    detalle = Column(String(200), primary_key=True, default='')
+
+    cantidad = Column(BigInteger, nullable=False, default=0)
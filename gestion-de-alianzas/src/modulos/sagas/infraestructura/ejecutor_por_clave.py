@@ -0,0 +1,91 @@
+"""
+Ejecutor paralelo que preserva el orden de las tareas con la misma clave
+"""
+import logging
+import queue
+import threading
+import zlib
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+_FIN = object()
+
+
+class EjecutorPorClave:
+    """
+    Reparte tareas en N colas, cada una atendida por un único hilo.
+
+    La clave (p. ej. el partner_id) se asigna siempre a la misma cola, de modo que
+    las tareas de una clave se ejecutan en orden de llegada mientras que claves
+    distintas avanzan en paralelo. Las colas son acotadas: ``enviar`` bloquea al
+    productor cuando la cola destino está llena, propagando backpressure hasta
+    el ``receive()`` del consumer.
+    """
+
+    def __init__(self, workers: int, cola_max: int, nombre: str = 'ejecutor'):
+        if workers <= 0:
+            raise ValueError("workers debe ser mayor que cero")
+        self.nombre = nombre
+        self._colas = [queue.Queue(maxsize=cola_max) for _ in range(workers)]
+        self._procesadas = [0] * workers
+        self._profundidad_max = [0] * workers
+        self._bloqueos = [0] * workers
+        self._hilos = [
+            threading.Thread(target=self._atender, args=(i,), name=f"{nombre}-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for hilo in self._hilos:
+            hilo.start()
+
+    def indice(self, clave: str) -> int:
+        """Cola asignada a la clave (estable entre ejecuciones)."""
+        return zlib.crc32(str(clave).encode('utf-8')) % len(self._colas)
+
+    def enviar(self, clave: str, tarea: Callable, *args) -> None:
+        """Encola la tarea en la cola de su clave, esperando si está llena."""
+        i = self.indice(clave)
+        cola = self._colas[i]
+        try:
+            cola.put_nowait((tarea, args))
+        except queue.Full:
+            self._bloqueos[i] += 1
+            logger.debug(f"⏸️ Cola {self.nombre}-{i} llena ({cola.maxsize}), aplicando backpressure")
+            cola.put((tarea, args))
+        profundidad = cola.qsize()
+        if profundidad > self._profundidad_max[i]:
+            self._profundidad_max[i] = profundidad
+
+    def metricas(self) -> list[dict]:
+        """Profundidad actual y acumulados por cola."""
+        return [
+            {
+                'cola': i,
+                'profundidad': cola.qsize(),
+                'profundidad_max': self._profundidad_max[i],
+                'procesadas': self._procesadas[i],
+                'bloqueos': self._bloqueos[i],
+            }
+            for i, cola in enumerate(self._colas)
+        ]
+
+    def cerrar(self, timeout: float = 10.0) -> None:
+        """Termina los hilos después de ejecutar lo que ya estaba encolado."""
+        for cola in self._colas:
+            cola.put(_FIN)
+        for hilo in self._hilos:
+            hilo.join(timeout)
+
+    def _atender(self, i: int) -> None:
+        cola = self._colas[i]
+        while True:
+            elemento = cola.get()
+            if elemento is _FIN:
+                return
+            tarea, args = elemento
+            try:
+                tarea(*args)
+            except Exception as e:
+                logger.error(f"❌ Error en tarea de {self.nombre}-{i}: {e}")
+            finally:
+                self._procesadas[i] += 1
@@ -0,0 +1,106 @@
+"""
+Conteos horarios de resultados de sagas (tabla saga_estadisticas_horarias)
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert
+
+from ..config.db import SagaSessionFactory
+from ..config.settings import SAGA_ESTADISTICAS_FLUSH_SEGUNDOS
+from .dto import SagaEstadisticaHoraria as SagaEstadisticaHorariaDTO
+
+logger = logging.getLogger(__name__)
+
+INICIADAS = 'iniciadas'
+COMPLETADAS = 'completadas'
+FALLIDAS = 'fallidas'
+EXPIRADAS = 'expiradas'
+RECHAZADAS = 'rechazadas'
+PENDIENTES_REVISION = 'pendientes_revision'
+VALIDACION_FALLIDA = 'validacion_fallida'
+
+
+def inicio_de_hora(instante: datetime) -> datetime:
+    return instante.replace(minute=0, second=0, microsecond=0)
+
+
+class AcumuladorEstadisticasSagas:
+    """
+    Acumula en memoria los conteos de resultados de sagas por (hora, métrica, detalle)
+    y los vuelca cada ``flush_segundos`` con un único upsert por lotes que suma sobre
+    el valor existente, de modo que varias réplicas pueden escribir la misma hora.
+
+    ``contar`` es O(1) y no toca la base de datos. Si un volcado falla, los conteos
+    vuelven al acumulador y se intentan en el siguiente ciclo.
+    """
+
+    def __init__(self, session_factory=SagaSessionFactory, flush_segundos: float = SAGA_ESTADISTICAS_FLUSH_SEGUNDOS):
+        self._session_factory = session_factory
+        self._flush_segundos = flush_segundos
+        self._conteos: Counter = Counter()
+        self._lock = threading.Lock()
+        self._detenido = threading.Event()
+        self._hilo = None
+
+    def contar(self, metrica: str, detalle: Optional[str] = None, instante: Optional[datetime] = None) -> None:
+        clave = (inicio_de_hora(instante or datetime.utcnow()), metrica, (detalle or '')[:200])
+        with self._lock:
+            self._conteos[clave] += 1
+
+    def volcar(self) -> int:
+        """Escribe los conteos acumulados; retorna el número de filas enviadas."""
+        with self._lock:
+            conteos, self._conteos = self._conteos, Counter()
+        if not conteos:
+            return 0
+
+        filas = [
+            {'hora': hora, 'metrica': metrica, 'detalle': detalle, 'cantidad': cantidad}
+            for (hora, metrica, detalle), cantidad in conteos.items()
+        ]
+        stmt = insert(SagaEstadisticaHorariaDTO)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SagaEstadisticaHorariaDTO.hora, SagaEstadisticaHorariaDTO.metrica,
+                            SagaEstadisticaHorariaDTO.detalle],
+            set_={'cantidad': SagaEstadisticaHorariaDTO.cantidad + stmt.excluded.cantidad}
+        )
+        try:
+            with self._session_factory() as session:
+                session.execute(stmt, filas)
+                session.commit()
+        except Exception:
+            with self._lock:
+                self._conteos.update(conteos)
+            raise
+        return len(filas)
+
+    def iniciar(self) -> None:
+        if self._hilo is not None:
+            return
+        self._hilo = threading.Thread(target=self._ejecutar, name='saga-estadisticas', daemon=True)
+        self._hilo.start()
+        atexit.register(self.detener)
+
+    def detener(self, timeout: float = 10.0) -> None:
+        """Detiene el hilo de volcado tras escribir los conteos pendientes."""
+        if self._detenido.is_set():
+            return
+        self._detenido.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+        try:
+            self.volcar()
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudieron volcar las estadísticas de sagas al cerrar: {e}")
+
+    def _ejecutar(self) -> None:
+        while not self._detenido.wait(self._flush_segundos):
+            try:
+                self.volcar()
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudieron volcar las estadísticas de sagas, se reintentará: {e}")
@@ -0,0 +1,155 @@
+"""
+Histogramas de latencia por paso de saga, exportados en formato de texto de Prometheus
+"""
+import bisect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from ..config.settings import SAGA_ESTADO_CACHE_MAX, SAGA_LATENCIA_BUCKETS, SAGA_TIMEOUT_SEGUNDOS
+from .cache import CacheLRU
+
+EXTREMO_A_EXTREMO = 'extremo_a_extremo'
+CUANTILES = (0.5, 0.95, 0.99)
+
+
+class HistogramaLatencia:
+    """
+    Histograma de buckets fijos (límites superiores en segundos). ``observar`` es una
+    búsqueda binaria y un incremento; la memoria no depende del número de muestras.
+    """
+
+    def __init__(self, limites: Sequence[float] = SAGA_LATENCIA_BUCKETS):
+        self.limites = sorted(limites)
+        # Un bucket por límite más el de +Inf
+        self._conteos = [0] * (len(self.limites) + 1)
+        self._suma = 0.0
+        self._lock = threading.Lock()
+
+    def observar(self, segundos: float) -> None:
+        indice = bisect.bisect_left(self.limites, segundos)
+        with self._lock:
+            self._conteos[indice] += 1
+            self._suma += segundos
+
+    def instantanea(self) -> tuple:
+        """(conteos por bucket, suma) consistentes entre sí."""
+        with self._lock:
+            return list(self._conteos), self._suma
+
+    def cuantil(self, q: float, conteos: Optional[List[int]] = None) -> Optional[float]:
+        """Estimación del cuantil ``q`` interpolando linealmente dentro del bucket."""
+        if conteos is None:
+            conteos, _ = self.instantanea()
+        total = sum(conteos)
+        if total == 0:
+            return None
+        objetivo = q * total
+        acumulado = 0
+        for indice, conteo in enumerate(conteos):
+            if conteo and acumulado + conteo >= objetivo:
+                if indice == len(self.limites):
+                    # Bucket +Inf: el mejor valor conocido es el mayor límite
+                    return self.limites[-1]
+                inferior = self.limites[indice - 1] if indice else 0.0
+                superior = self.limites[indice]
+                return inferior + (superior - inferior) * (objetivo - acumulado) / conteo
+            acumulado += conteo
+        return self.limites[-1]
+
+
+class MetricasLatenciaSagas:
+    """
+    Latencia entre pasos consecutivos de cada saga y de extremo a extremo.
+
+    Por saga se guarda solo el último paso con su instante monotónico y el de
+    inicio, en una cache LRU acotada con el TTL de vencimiento de sagas. Los
+    instantes monotónicos son locales al proceso: si dos pasos de una saga los
+    atiende otra réplica, esa transición no se mide en lugar de medirse mal.
+    """
+
+    def __init__(
+        self,
+        limites: Sequence[float] = SAGA_LATENCIA_BUCKETS,
+        max_sagas: int = SAGA_ESTADO_CACHE_MAX,
+        ttl_segundos: float = SAGA_TIMEOUT_SEGUNDOS,
+        reloj: Callable[[], float] = time.monotonic,
+    ):
+        self._limites = limites
+        self._reloj = reloj
+        self._pasos = CacheLRU(max_sagas, ttl_segundos, reloj)
+        self._histogramas: Dict[str, HistogramaLatencia] = {}
+        self._lock = threading.Lock()
+
+    def registrar_paso(self, partner_id: str, paso: str) -> None:
+        """Registra que la saga del partner llegó a ``paso`` y mide la transición desde el anterior."""
+        ahora = self._reloj()
+        anterior = self._pasos.obtener(partner_id)
+        if anterior is None:
+            self._pasos.guardar(partner_id, (paso, ahora, ahora))
+            return
+        paso_anterior, instante_anterior, inicio = anterior
+        self._histograma(f'{paso_anterior}->{paso}').observar(ahora - instante_anterior)
+        self._pasos.guardar(partner_id, (paso, ahora, inicio))
+
+    def reasignar(self, clave_anterior: str, clave_nueva: str) -> None:
+        """
+        Continúa bajo ``clave_nueva`` la saga seguida hasta ahora por ``clave_anterior``:
+        del id de correlación del comando al partner_id, cuando este se conoce.
+        """
+        paso = self._pasos.obtener(clave_anterior)
+        if paso is not None:
+            self._pasos.eliminar(clave_anterior)
+            self._pasos.guardar(clave_nueva, paso)
+
+    def finalizar_saga(self, partner_id: str) -> None:
+        """Mide la duración total de la saga del partner y deja de seguirla."""
+        anterior = self._pasos.obtener(partner_id)
+        self._pasos.eliminar(partner_id)
+        if anterior is not None:
+            self._histograma(EXTREMO_A_EXTREMO).observar(self._reloj() - anterior[2])
+
+    def exportar(self) -> str:
+        """Histogramas y cuantiles p50/p95/p99 estimados en formato de texto de Prometheus."""
+        with self._lock:
+            histogramas = sorted(self._histogramas.items())
+
+        lineas = [
+            '# HELP saga_paso_latencia_segundos Latencia entre pasos consecutivos de una saga.',
+            '# TYPE saga_paso_latencia_segundos histogram',
+        ]
+        cuantiles = [
+            '# HELP saga_paso_latencia_segundos_cuantil Cuantil estimado desde los buckets del histograma.',
+            '# TYPE saga_paso_latencia_segundos_cuantil gauge',
+        ]
+        for transicion, histograma in histogramas:
+            etiqueta = f'transicion="{_escapar(transicion)}"'
+            conteos, suma = histograma.instantanea()
+            acumulado = 0
+            for limite, conteo in zip(histograma.limites, conteos):
+                acumulado += conteo
+                lineas.append(f'saga_paso_latencia_segundos_bucket{{{etiqueta},le="{limite:g}"}} {acumulado}')
+            acumulado += conteos[-1]
+            lineas.append(f'saga_paso_latencia_segundos_bucket{{{etiqueta},le="+Inf"}} {acumulado}')
+            lineas.append(f'saga_paso_latencia_segundos_sum{{{etiqueta}}} {suma}')
+            lineas.append(f'saga_paso_latencia_segundos_count{{{etiqueta}}} {acumulado}')
+            for q in CUANTILES:
+                valor = histograma.cuantil(q, conteos)
+                if valor is not None:
+                    cuantiles.append(f'saga_paso_latencia_segundos_cuantil{{{etiqueta},quantile="{q:g}"}} {valor}')
+        return '\n'.join(lineas + cuantiles) + '\n'
+
+    def _histograma(self, transicion: str) -> HistogramaLatencia:
+        histograma = self._histogramas.get(transicion)
+        if histograma is None:
+            with self._lock:
+                histograma = self._histogramas.setdefault(transicion, HistogramaLatencia(self._limites))
+        return histograma
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Instancia del proceso: la alimenta el coordinador y la lee el endpoint /metrics
+latencias_sagas = MetricasLatenciaSagas()
@@ -0,0 +1,265 @@
+"""
+Mantenimiento de las particiones mensuales de saga_logs
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from datetime import date, datetime
+from typing import List, Sequence
+
+from sqlalchemy import text
+
+from ..config.db import engine as saga_engine
+from ..config.settings import (
+    SAGA_LOGS_PARTICIONES_ADELANTE, SAGA_LOGS_RETENCION_MESES,
+    SAGA_LOGS_DIRECTORIO_ARCHIVO, SAGA_LOGS_MANTENIMIENTO_INTERVALO_HORAS
+)
+
+logger = logging.getLogger(__name__)
+
+TABLA = 'saga_logs'
+PARTICION_DEFAULT = f'{TABLA}_default'
+_NOMBRE_PARTICION = re.compile(rf'^{TABLA}_(\d{{4}})_(\d{{2}})$')
+
+# Evita que dos réplicas mantengan las particiones a la vez
+_LLAVE_LOCK = 0x5A6A_1065
+
+
+def primer_dia_del_mes(fecha: date, meses: int = 0) -> date:
+    """Primer día del mes de ``fecha`` desplazado ``meses`` meses."""
+    indice = fecha.year * 12 + (fecha.month - 1) + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def nombre_particion(mes: date) -> str:
+    return f'{TABLA}_{mes.year:04d}_{mes.month:02d}'
+
+
+def crear_particiones(conn, hoy: date, meses_adelante: int = SAGA_LOGS_PARTICIONES_ADELANTE) -> List[str]:
+    """
+    Crea (si no existen) la partición del mes actual, las de ``meses_adelante`` meses
+    siguientes y una partición DEFAULT que recibe filas fuera de rango.
+
+    Cada mes se crea en su propio SAVEPOINT: si uno falla se registra el error y se
+    sigue con los demás. Retorna las particiones disponibles.
+    """
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {PARTICION_DEFAULT} PARTITION OF {TABLA} DEFAULT"))
+    creadas = []
+    for desplazamiento in range(meses_adelante + 1):
+        desde = primer_dia_del_mes(hoy, desplazamiento)
+        nombre = nombre_particion(desde)
+        try:
+            with conn.begin_nested():
+                _crear_particion(conn, nombre, desde, primer_dia_del_mes(desde, 1))
+            creadas.append(nombre)
+        except Exception as e:
+            logger.error(f"❌ No se pudo crear la partición {nombre}: {e}")
+    return creadas
+
+
+def _crear_particion(conn, nombre: str, desde: date, hasta: date) -> None:
+    if conn.execute(text("SELECT to_regclass(:nombre) IS NOT NULL"), {'nombre': nombre}).scalar():
+        return
+    rango = f"FOR VALUES FROM ('{desde.isoformat()}') TO ('{hasta.isoformat()}')"
+    en_default = conn.execute(text(
+        f"SELECT EXISTS (SELECT 1 FROM {PARTICION_DEFAULT} WHERE timestamp >= :desde AND timestamp < :hasta)"
+    ), {'desde': desde, 'hasta': hasta}).scalar()
+    if not en_default:
+        conn.execute(text(f"CREATE TABLE {nombre} PARTITION OF {TABLA} {rango}"))
+        return
+
+    # Postgres rechaza crear una partición cuyo rango ya tiene filas en la DEFAULT: se
+    # crea como tabla suelta, se le mueven esas filas y recién entonces se adjunta
+    conn.execute(text(f"CREATE TABLE {nombre} (LIKE {TABLA} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    movidas = conn.execute(text(
+        f"WITH movidas AS (DELETE FROM {PARTICION_DEFAULT} WHERE timestamp >= :desde AND timestamp < :hasta RETURNING *) "
+        f"INSERT INTO {nombre} SELECT * FROM movidas"
+    ), {'desde': desde, 'hasta': hasta}).rowcount
+    conn.execute(text(f"ALTER TABLE {TABLA} ATTACH PARTITION {nombre} {rango}"))
+    logger.warning(f"📦 {movidas} filas de {PARTICION_DEFAULT} movidas a la nueva partición {nombre}")
+
+
+def es_particionada(conn) -> bool:
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :tabla)"
+    ), {'tabla': TABLA}).scalar()
+
+
+def particiones(conn) -> List[str]:
+    """Todas las particiones adjuntas a saga_logs, incluida la DEFAULT."""
+    return [nombre for (nombre,) in conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :tabla"
+    ), {'tabla': TABLA})]
+
+
+def particiones_mensuales(conn) -> List[tuple]:
+    """Particiones mensuales adjuntas a saga_logs como (nombre, primer día del mes), en orden."""
+    particiones_por_mes = []
+    for nombre in particiones(conn):
+        match = _NOMBRE_PARTICION.match(nombre)
+        if match:
+            particiones_por_mes.append((nombre, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(particiones_por_mes, key=lambda particion: particion[1])
+
+
+def crear_indice_concurrente(conn, nombre: str, columnas: Sequence[str]) -> None:
+    """
+    Crea un índice de saga_logs sin bloquear escrituras; ``conn`` debe estar en AUTOCOMMIT.
+
+    Postgres no admite CREATE INDEX CONCURRENTLY sobre una tabla particionada: en ese
+    caso se crea el índice solo en la tabla padre (ON ONLY, inválido hasta completarse),
+    se construye CONCURRENTLY en cada partición y se adjunta. Es idempotente y descarta
+    los índices inválidos que haya dejado una ejecución interrumpida.
+    """
+    definicion = ', '.join(columnas)
+    if not es_particionada(conn):
+        _descartar_indice_invalido(conn, nombre)
+        conn.execute(text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {nombre} ON {TABLA} ({definicion})"))
+        return
+
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {nombre} ON ONLY {TABLA} ({definicion})"))
+    sufijo = nombre.removeprefix(f'idx_{TABLA}_')
+    for particion in particiones(conn):
+        adjunto = conn.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_inherits i JOIN pg_index x ON x.indexrelid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:indice AS regclass) AND x.indrelid = CAST(:particion AS regclass))"
+        ), {'indice': nombre, 'particion': particion}).scalar()
+        if adjunto:
+            continue
+        indice_particion = f'{particion}_{sufijo}'[:63]
+        _descartar_indice_invalido(conn, indice_particion)
+        conn.execute(text(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {indice_particion} ON {particion} ({definicion})"
+        ))
+        conn.execute(text(f"ALTER INDEX {nombre} ATTACH PARTITION {indice_particion}"))
+
+
+def _descartar_indice_invalido(conn, nombre: str) -> None:
+    invalido = conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid "
+        "WHERE c.relname = :nombre AND NOT x.indisvalid)"
+    ), {'nombre': nombre}).scalar()
+    if invalido:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}"))
+
+
+def columnas_indice(conn, nombre: str) -> List[str]:
+    """Columnas de un índice en orden, o lista vacía si no existe."""
+    return [columna for (columna,) in conn.execute(text(
+        "SELECT a.attname FROM pg_index x "
+        "JOIN pg_class c ON c.oid = x.indexrelid "
+        "CROSS JOIN LATERAL unnest(x.indkey) WITH ORDINALITY AS k(attnum, orden) "
+        "JOIN pg_attribute a ON a.attrelid = x.indrelid AND a.attnum = k.attnum "
+        "WHERE c.relname = :nombre ORDER BY k.orden"
+    ), {'nombre': nombre})]
+
+
+def particiones_vencidas(conn, hoy: date, retencion_meses: int = SAGA_LOGS_RETENCION_MESES) -> List[str]:
+    """Particiones cuyo mes completo quedó fuera del periodo de retención."""
+    limite = primer_dia_del_mes(hoy, -retencion_meses)
+    return [nombre for nombre, mes in particiones_mensuales(conn) if mes < limite]
+
+
+def archivar_particion(conn, nombre: str, directorio: str = SAGA_LOGS_DIRECTORIO_ARCHIVO) -> str:
+    """
+    Vuelca la partición a ``<directorio>/<nombre>.ndjson.gz`` leyendo con cursor de
+    servidor, de modo que la memoria usada no depende del tamaño de la partición.
+    """
+    os.makedirs(directorio, exist_ok=True)
+    destino = os.path.join(directorio, f'{nombre}.ndjson.gz')
+    temporal = f'{destino}.tmp'
+
+    resultado = conn.execution_options(stream_results=True, yield_per=1000).execute(
+        text(f"SELECT * FROM {nombre} ORDER BY timestamp, id")
+    )
+    filas = 0
+    with gzip.open(temporal, 'wt', encoding='utf-8') as archivo:
+        for fila in resultado.mappings():
+            archivo.write(json.dumps(dict(fila), default=str, ensure_ascii=False))
+            archivo.write('\n')
+            filas += 1
+    # Solo un archivo completo queda con el nombre final
+    os.replace(temporal, destino)
+    logger.info(f"🗄️ Partición {nombre} archivada en {destino} ({filas} filas)")
+    return destino
+
+
+def eliminar_particion(conn, nombre: str) -> None:
+    conn.execute(text(f"ALTER TABLE {TABLA} DETACH PARTITION {nombre}"))
+    conn.execute(text(f"DROP TABLE {nombre}"))
+    logger.info(f"🧹 Partición {nombre} separada y eliminada")
+
+
+class MantenimientoParticionesSagaLogs:
+    """
+    Job periódico que crea las particiones futuras de saga_logs y archiva y elimina
+    las vencidas. Cada partición vencida se archiva, separa y elimina en su propia
+    transacción; si el archivo falla, la partición se conserva para el siguiente ciclo.
+    Un advisory lock de Postgres garantiza que solo una réplica lo ejecute a la vez.
+    """
+
+    def __init__(
+        self,
+        engine=saga_engine,
+        meses_adelante: int = SAGA_LOGS_PARTICIONES_ADELANTE,
+        retencion_meses: int = SAGA_LOGS_RETENCION_MESES,
+        directorio_archivo: str = SAGA_LOGS_DIRECTORIO_ARCHIVO,
+        intervalo_horas: float = SAGA_LOGS_MANTENIMIENTO_INTERVALO_HORAS,
+    ):
+        self.engine = engine
+        self.meses_adelante = meses_adelante
+        self.retencion_meses = retencion_meses
+        self.directorio_archivo = directorio_archivo
+        self.intervalo_segundos = intervalo_horas * 3600
+        self._detenido = threading.Event()
+        self._hilo = None
+
+    def ejecutar(self, hoy: date = None) -> None:
+        hoy = hoy or datetime.utcnow().date()
+        with self.engine.connect() as lock_conn:
+            if not lock_conn.execute(text("SELECT pg_try_advisory_lock(:llave)"), {'llave': _LLAVE_LOCK}).scalar():
+                logger.info("⏭️ Mantenimiento de particiones de saga_logs en curso en otra réplica")
+                return
+            try:
+                with self.engine.begin() as conn:
+                    creadas = crear_particiones(conn, hoy, self.meses_adelante)
+                logger.info(f"📅 Particiones de saga_logs disponibles: {creadas}")
+
+                with self.engine.connect() as conn:
+                    vencidas = particiones_vencidas(conn, hoy, self.retencion_meses)
+                for nombre in vencidas:
+                    try:
+                        with self.engine.begin() as conn:
+                            archivar_particion(conn, nombre, self.directorio_archivo)
+                            eliminar_particion(conn, nombre)
+                    except Exception as e:
+                        logger.error(f"❌ No se pudo archivar/eliminar la partición {nombre}: {e}")
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:llave)"), {'llave': _LLAVE_LOCK})
+
+    def iniciar(self) -> None:
+        if self._hilo is not None:
+            return
+        self._hilo = threading.Thread(target=self._ejecutar, name='saga-logs-particiones', daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 10.0) -> None:
+        self._detenido.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+
+    def _ejecutar(self) -> None:
+        while True:
+            try:
+                self.ejecutar()
+            except Exception as e:
+                logger.error(f"❌ Error en mantenimiento de particiones de saga_logs: {e}")
+            if self._detenido.wait(self.intervalo_segundos):
+                return
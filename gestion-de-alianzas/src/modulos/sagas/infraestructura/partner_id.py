@@ -0,0 +1,268 @@
+"""
+Extracción del partner_id y del id de correlación de los mensajes de saga
+(comando-crear-partner, PartnerCreado)
+"""
+import json
+import logging
+import re
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_UUID = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE)
+_LARGO_UUID = 36
+_GUIONES_UUID = (8, 13, 18, 23)
+
+# Avro codifica la longitud del string como varint zigzag: 36 caracteres -> 'H'
+_PREFIJO_AVRO = 'H'
+
+# Esquemas con los que gestion-de-integraciones publica PartnerCreado (EventoPartnerCreado).
+# pulsar-client declara cada campo como unión con null y respeta el orden de declaración.
+# Una subclase de Record no hereda los campos de EventoIntegracion: solo viaja ``data``.
+# El segundo es el esquema anterior a correlacion_id, para mensajes ya encolados
+_PAYLOAD_PARTNER_CREADO = {
+    'type': 'record', 'name': 'PartnerCreadoPayload',
+    'fields': [
+        {'name': 'partner_id', 'type': ['null', 'string']},
+        {'name': 'correlacion_id', 'type': ['null', 'string']},
+    ],
+}
+ESQUEMAS_PARTNER_CREADO = (
+    {'type': 'record', 'name': 'EventoPartnerCreado',
+     'fields': [{'name': 'data', 'type': ['null', _PAYLOAD_PARTNER_CREADO]}]},
+    {'type': 'record', 'name': 'EventoPartnerCreado',
+     'fields': [{'name': 'data', 'type': ['null', {
+         'type': 'record', 'name': 'PartnerCreadoPayload',
+         'fields': _PAYLOAD_PARTNER_CREADO['fields'][:1],
+     }]}]},
+)
+
+# Esquema con el que partners-bff publica ComandoCrearPartner; el id del comando viaja
+# como ``correlacion_id`` del payload
+ESQUEMA_COMANDO_CREAR_PARTNER = {
+    'type': 'record', 'name': 'ComandoCrearPartner',
+    'fields': [{'name': 'data', 'type': ['null', {
+        'type': 'record', 'name': 'CrearPartnerPayload',
+        'fields': [
+            {'name': campo, 'type': ['null', 'string']}
+            for campo in ('nombre', 'email', 'telefono', 'direccion', 'correlacion_id')
+        ],
+    }]}],
+}
+
+_LARGO_MAXIMO = 200
+_LARGO_TRUNCADO = 50
+
+
+def _parece_uuid(valor: str) -> bool:
+    """Chequeo barato de forma (largo y guiones) antes de recurrir al regex."""
+    return (
+        len(valor) == _LARGO_UUID
+        and valor[8] == '-' and valor[13] == '-' and valor[18] == '-' and valor[23] == '-'
+        and _UUID.fullmatch(valor) is not None
+    )
+
+
+def es_partner_id_valido(partner_id: str) -> bool:
+    """
+    Valida si un partner_id tiene formato válido (UUID o ID corto).
+    Todo UUID es además un ID corto alfanumérico, así que no hace falta el regex.
+    """
+    if len(partner_id) < _LARGO_TRUNCADO and partner_id.replace('-', '').replace('_', '').isalnum():
+        return True
+    return not ('@' in partner_id or '+' in partner_id or ',' in partner_id or ' ' in partner_id)
+
+
+def extraer_uuid(contenido: str) -> Optional[str]:
+    """Busca el primer UUID dentro de contenido malformado."""
+    if len(contenido) < _LARGO_UUID:
+        return None
+    if len(contenido) == _LARGO_UUID:
+        return contenido if _parece_uuid(contenido) else None
+    match = _UUID.search(contenido)
+    return match.group(0) if match else None
+
+
+class _LectorAvro:
+    """Decodificador binario Avro mínimo (record, union, null, string, int/long, boolean)."""
+
+    def __init__(self, datos: bytes):
+        self.datos = datos
+        self.pos = 0
+
+    def leer(self, tipo):
+        if isinstance(tipo, list):
+            rama = self._long()
+            if not 0 <= rama < len(tipo):
+                raise ValueError(f"Rama de unión inválida: {rama}")
+            return self.leer(tipo[rama])
+        if isinstance(tipo, dict):
+            return {campo['name']: self.leer(campo['type']) for campo in tipo['fields']}
+        if tipo == 'null':
+            return None
+        if tipo == 'string':
+            largo = self._long()
+            fin = self.pos + largo
+            if largo < 0 or fin > len(self.datos):
+                raise ValueError("String Avro fuera del mensaje")
+            valor = self.datos[self.pos:fin].decode('utf-8')
+            self.pos = fin
+            return valor
+        if tipo in ('int', 'long'):
+            return self._long()
+        if tipo == 'boolean':
+            return self._byte() == 1
+        raise ValueError(f"Tipo Avro no soportado: {tipo}")
+
+    def _byte(self) -> int:
+        if self.pos >= len(self.datos):
+            raise ValueError("Mensaje Avro truncado")
+        self.pos += 1
+        return self.datos[self.pos - 1]
+
+    def _long(self) -> int:
+        # Varint zigzag
+        valor = desplazamiento = 0
+        while True:
+            byte = self._byte()
+            valor |= (byte & 0x7F) << desplazamiento
+            if not byte & 0x80:
+                return (valor >> 1) ^ -(valor & 1)
+            desplazamiento += 7
+
+
+def decodificar_avro(contenido: Union[str, bytes], esquema) -> Optional[dict]:
+    """Decodifica un mensaje con su esquema de escritura; None si no lo consume completo."""
+    datos = contenido.encode('utf-8') if isinstance(contenido, str) else contenido
+    lector = _LectorAvro(datos)
+    try:
+        valor = lector.leer(esquema)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return valor if lector.pos == len(datos) else None
+
+
+def _leer_data(contenido: Union[str, bytes], esquemas) -> Optional[dict]:
+    # Todo evento de integración empieza con la rama no nula del campo data
+    if contenido[:1] not in ('\x02', b'\x02'):
+        return None
+    for esquema in esquemas:
+        evento = decodificar_avro(contenido, esquema)
+        if evento is not None and evento['data'] is not None:
+            return evento['data']
+    return None
+
+
+def leer_partner_creado(contenido: Union[str, bytes]) -> Optional[dict]:
+    """
+    Payload (``partner_id`` y ``correlacion_id``) de un PartnerCreado en Avro, probando
+    los esquemas publicados del más nuevo al más antiguo; None si no es un PartnerCreado.
+    """
+    payload = _leer_data(contenido, ESQUEMAS_PARTNER_CREADO)
+    return {'correlacion_id': None, **payload} if payload is not None else None
+
+
+def leer_comando_crear_partner(contenido: Union[str, bytes]) -> Optional[dict]:
+    """Payload de un ComandoCrearPartner en Avro; None si no es un ComandoCrearPartner."""
+    return _leer_data(contenido, (ESQUEMA_COMANDO_CREAR_PARTNER,))
+
+
+def _limpiar(contenido: str) -> str:
+    if contenido.isprintable():
+        return contenido
+    return ''.join(filter(str.isprintable, contenido))
+
+
+def extraer_partner_id(contenido: str, tipo_contenido: str = "unknown") -> str:
+    """
+    Extrae partner_id de un mensaje JSON, de un string Avro con prefijo de longitud
+    o de texto plano, recuperando el UUID cuando el valor viene malformado.
+    """
+    partner_id = None
+    inicio = contenido.lstrip()[:1]
+
+    if inicio == '{':
+        try:
+            data = json.loads(contenido)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict):
+            valor = data.get("partner_id")
+            if valor and isinstance(valor, str):
+                if es_partner_id_valido(valor):
+                    return valor
+                extraido = extraer_uuid(valor)
+                if extraido:
+                    logger.warning(f"⚠️ Extracted UUID from malformed partner_id: {extraido}")
+                    return extraido
+            # Si no hay partner_id válido, usar el objeto completo
+            partner_id = str(data)
+
+    if partner_id is None:
+        payload = leer_partner_creado(contenido)
+        if payload and payload['partner_id']:
+            partner_id = payload['partner_id']
+            if _parece_uuid(partner_id) or es_partner_id_valido(partner_id):
+                return partner_id
+
+    if partner_id is None:
+        limpio = _limpiar(contenido)
+        # Camino rápido: string Avro con un UUID ('H' + 36 caracteres)
+        if len(limpio) == _LARGO_UUID + 1 and limpio[0] == _PREFIJO_AVRO and _parece_uuid(limpio[1:]):
+            return limpio[1:]
+        partner_id = limpio[1:] if limpio[:1] == _PREFIJO_AVRO else limpio
+        logger.debug(f'📥 Partner_id from {tipo_contenido} text content: {partner_id[:50]}...')
+
+    if not partner_id:
+        raise ValueError(f"No se pudo extraer partner_id del mensaje: {contenido[:100]}...")
+
+    if len(partner_id) > _LARGO_MAXIMO:
+        logger.warning(f"⚠️ Partner ID muy largo ({len(partner_id)} chars), posiblemente malformado")
+        extraido = extraer_uuid(partner_id)
+        if extraido:
+            return extraido
+        partner_id = partner_id[:_LARGO_TRUNCADO]
+        logger.warning(f"⚠️ Using truncated partner_id: {partner_id}")
+
+    return partner_id
+
+
+def extraer_id_comando(contenido: str) -> Optional[str]:
+    """
+    id de un ComandoCrearPartner: ``correlacion_id`` del payload (en Avro, o en ``data``
+    o la raíz de un JSON) o, en JSON, la clave ``id`` del sobre.
+    """
+    inicio = contenido.lstrip()[:1]
+    if inicio == '{':
+        try:
+            data = json.loads(contenido)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        payload = data.get('data') if isinstance(data.get('data'), dict) else {}
+        valor = payload.get('correlacion_id') or data.get('correlacion_id') or data.get('id')
+        return valor if isinstance(valor, str) and valor else None
+    payload = leer_comando_crear_partner(contenido)
+    return payload['correlacion_id'] if payload and payload['correlacion_id'] else None
+
+
+def extraer_correlacion_id(contenido: str) -> Optional[str]:
+    """
+    Id de correlación de un PartnerCreado: ``correlacion_id`` en JSON (en la raíz o
+    en ``data``) o, en Avro, el campo del payload decodificado con su esquema.
+    """
+    inicio = contenido.lstrip()[:1]
+    if inicio == '{':
+        try:
+            data = json.loads(contenido)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        valor = data.get('correlacion_id')
+        if valor is None and isinstance(data.get('data'), dict):
+            valor = data['data'].get('correlacion_id')
+        return valor if isinstance(valor, str) and valor else None
+    payload = leer_partner_creado(contenido)
+    return payload['correlacion_id'] if payload and payload['correlacion_id'] else None
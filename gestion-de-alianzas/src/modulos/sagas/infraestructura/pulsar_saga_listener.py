@@ -4,7 +4,6 @@ Listener para eventos de Pulsar relacionados con la saga coreográfica de partne
 import pulsar
 import json
 import logging
-import uuid
 from datetime import datetime
 import asyncio
 import os
@@ -20,47 +19,118 @@ from src.modulos.sagas.dominio.eventos import (
     ContratoAprobado, ContratoRechazado, RevisionContrato
 )
 from modulos.sagas.aplicacion.coordinadores.saga_partners import CoordinadorPartnersCoreografico
+from modulos.sagas.aplicacion.registro import RegistroSagas
+from modulos.sagas.config.settings import (
+    SAGA_LISTENER_MODO, SAGA_LISTENER_WORKERS, SAGA_LISTENER_RECEIVE_TIMEOUT_MS, SAGA_LISTENER_COLA_MAX,
+    SAGA_REINTENTO_HABILITADO, SAGA_REPLAY_AL_INICIAR, SAGA_REPLAY_LOTE
+)
+from modulos.sagas.infraestructura.ejecutor_por_clave import EjecutorPorClave
+from modulos.sagas.infraestructura.partner_id import extraer_correlacion_id, extraer_id_comando, extraer_partner_id
+from modulos.sagas.infraestructura.reintentador_saga_logs import ReintentadorSagaLogs
+from modulos.sagas.infraestructura.replay_saga_logs import reconstruir_estado_sagas
 
 # Configurar logging
 logger = logging.getLogger(__name__)
 
+
+class ConfirmacionMensaje:
+    """
+    Ack/nack de un mensaje, resuelto una sola vez. Si el coordinador deja el evento en
+    espera lo retiene: el mensaje se confirma cuando el evento se aplica y se rechaza
+    (el broker lo reentrega) si se descarta por vencimiento o al cerrar
+    """
+
+    def __init__(self, consumer, msg):
+        self.consumer = consumer
+        self.msg = msg
+        self.retenida = False
+        self._resuelta = False
+        self._lock = threading.Lock()
+
+    def retener(self):
+        self.retenida = True
+
+    def confirmar(self):
+        if self._resolver():
+            self.consumer.acknowledge(self.msg)
+
+    def rechazar(self):
+        if self._resolver():
+            self.consumer.negative_acknowledge(self.msg)
+
+    def _resolver(self) -> bool:
+        with self._lock:
+            if self._resuelta:
+                return False
+            self._resuelta = True
+            return True
+
+
 class PulsarSagaChoreographyListener:
     
-    def __init__(self, pulsar_url: str = None):
+    def __init__(self, pulsar_url: str = None, modo: str = None, workers: int = None):
         self.pulsar_url = pulsar_url or os.getenv('BROKER_URL', 'pulsar://localhost:6650')
         
-        # Mapeo de tópicos a tipos de eventos
-        self.topics = {
-            'comando-crear-partner': CreatePartner,  # Topic que inicia la saga
-            'PartnerCreado': PartnerCreated, 
-            'ContratoCreado': ContratoCreado,
-            'contrato-aprobado': ContratoAprobado,   # Nuevo: resultado de compliance
-            'contrato-rechazado': ContratoRechazado, # Nuevo: rechazo de compliance
-            'revision-contrato': RevisionContrato,   # Nuevo: revisión de contrato
-        }
-        
         self.subscription_prefix = 'saga-choreography'
         self.client = None
         self.consumers = {}
         self.revision_producer = None  # Productor para eventos de revisión
 
+        # 'multi-topico': un único consumer para todos los tópicos y un pool fijo de workers
+        # 'por-topico': un consumer y un hilo bloqueante por tópico
+        self.modo = modo or SAGA_LISTENER_MODO
+        self.workers = workers or SAGA_LISTENER_WORKERS
+        self.multi_consumer = None
+        self._detenido = threading.Event()
+
+        # Eventos de un mismo partner se aplican en orden; partners distintos en paralelo
+        self.ejecutor = None
+
+        # Reproceso de eventos que quedaron en ERROR en saga_logs
+        self.reintentador = None
+
         self.coordinador = CoordinadorPartnersCoreografico()
 
+        # Tabla de despacho tópico -> parser -> tipo de evento -> manejador, construida una vez
+        self.registro = RegistroSagas()
+        self.registro.registrar_saga(self._definicion_saga_partners())
+        self.topics = self.registro.topicos()
+
+    def _definicion_saga_partners(self) -> list:
+        """Tópicos de la saga de partners: (tópico, tipo de evento, parser, manejador)"""
+        return [
+            ('comando-crear-partner', CreatePartner, self._process_create_partner_message, self.coordinador.procesar_evento),  # Topic que inicia la saga
+            ('PartnerCreado', PartnerCreated, self._process_partner_created_message, self.coordinador.procesar_evento),
+            ('ContratoCreado', ContratoCreado, self._process_contrato_creado_message, self.coordinador.procesar_evento),
+            ('contrato-aprobado', ContratoAprobado, self._process_contrato_aprobado_message, self._handle_contrato_aprobado),  # Resultado de compliance
+            ('contrato-rechazado', ContratoRechazado, self._process_contrato_rechazado_message, self._handle_contrato_rechazado),  # Rechazo de compliance
+            ('revision-contrato', RevisionContrato, self._process_revision_contrato_message, self._handle_revision_contrato),  # Revisión de contrato
+        ]
+
     def connect(self):
         """Conecta al broker de Pulsar y crea consumers para todos los tópicos"""
         try:
             logger.info(f"🔌 Connecting to Pulsar at {self.pulsar_url}")
             self.client = pulsar.Client(self.pulsar_url)
             
-            for topic, event_type in self.topics.items():
-                # Usar BytesSchema para compatibilidad con sistemas existentes
-                consumer = self.client.subscribe(
-                    topic,
-                    subscription_name=f"{self.subscription_prefix}-{topic}",
-                    schema=pulsar.schema.BytesSchema()  # Bytes schema para compatibilidad
+            if self.modo == 'multi-topico':
+                # Un solo consumer suscrito a todos los tópicos de la saga
+                self.multi_consumer = self.client.subscribe(
+                    list(self.topics.keys()),
+                    subscription_name=f"{self.subscription_prefix}-multi",
+                    schema=pulsar.schema.BytesSchema()
                 )
-                self.consumers[topic] = consumer
-                logger.info(f"✅ Subscribed to topic: {topic} for event: {event_type.__name__}")
+                logger.info(f"✅ Subscribed multi-topic consumer to: {list(self.topics.keys())}")
+            else:
+                for topic, event_type in self.topics.items():
+                    # Usar BytesSchema para compatibilidad con sistemas existentes
+                    consumer = self.client.subscribe(
+                        topic,
+                        subscription_name=f"{self.subscription_prefix}-{topic}",
+                        schema=pulsar.schema.BytesSchema()  # Bytes schema para compatibilidad
+                    )
+                    self.consumers[topic] = consumer
+                    logger.info(f"✅ Subscribed to topic: {topic} for event: {event_type.__name__}")
             
             # Crear productor para eventos de revisión
             self.revision_producer = self.client.create_producer(
@@ -94,19 +164,7 @@ class PulsarSagaChoreographyListener:
             if not content:
                 raise ValueError(f"No se pudo decodificar mensaje del topic {topic}")
             
-            evento = None
-            if topic == 'comando-crear-partner':
-                evento = self._process_create_partner_message(content)
-            elif topic == 'PartnerCreado':
-                evento = self._process_partner_created_message(content)
-            elif topic == 'ContratoCreado':
-                evento = self._process_contrato_creado_message(content)
-            elif topic == 'contrato-aprobado':
-                evento = self._process_contrato_aprobado_message(content)
-            elif topic == 'contrato-rechazado':
-                evento = self._process_contrato_rechazado_message(content)
-            elif topic == 'revision-contrato':
-                evento = self._process_revision_contrato_message(content)
+            evento = self.registro.entrada(topic).parser(content)
             
             if evento:
                 logger.info(f"✨ Created event: {type(evento).__name__} for partner_id: {evento.partner_id}")
@@ -120,107 +178,16 @@ class PulsarSagaChoreographyListener:
 
 
     
-    def _extract_partner_id_from_content(self, content: str, content_type: str = "unknown") -> str:
-        """
-        Extrae partner_id de diferentes tipos de contenido, manejando casos especiales
-        """
-        try:
-            # Intentar parsear como JSON primero
-            try:
-                data = json.loads(content)
-                partner_id = data.get("partner_id")
-                if partner_id and isinstance(partner_id, str):
-                    # Validar que no sea un formulario completo
-                    if self._is_valid_partner_id(partner_id):
-                        return partner_id
-                    else:
-                        # Intentar extraer UUID del contenido malformado
-                        extracted_id = self._extract_uuid_from_malformed_content(partner_id)
-                        if extracted_id:
-                            logger.warning(f"⚠️ Extracted UUID from malformed partner_id: {extracted_id}")
-                            return extracted_id
-                
-                # Si no hay partner_id válido, usar el string completo
-                partner_id = str(data)
-                
-            except json.JSONDecodeError:
-                # Si no es JSON válido, limpiar el contenido
-                clean_content = ''.join(char for char in content if char.isprintable())
-                logger.info(f'📥 Cleaned {content_type} content: {clean_content[:100]}...')
-                
-                # Manejar el prefijo 'H' como en el consumer existente
-                if clean_content and clean_content[0] == 'H':
-                    partner_id = clean_content[1:]  # Remover el prefijo 'H'
-                    logger.info(f'📥 Extracted partner_id from prefixed message: {partner_id[:50]}...')
-                else:
-                    partner_id = clean_content
-                    logger.info(f'📥 Using content as partner_id: {partner_id[:50]}...')
-            
-            # Validar que el partner_id extraído sea válido
-            if not partner_id:
-                raise ValueError(f"No se pudo extraer partner_id del mensaje: {content[:100]}...")
-            
-            if len(partner_id) > 200:
-                logger.warning(f"⚠️ Partner ID muy largo ({len(partner_id)} chars), posiblemente malformado")
-                # Intentar extraer UUID
-                extracted_id = self._extract_uuid_from_malformed_content(partner_id)
-                if extracted_id:
-                    logger.info(f"✅ Extracted UUID from long content: {extracted_id}")
-                    return extracted_id
-                else:
-                    partner_id = partner_id[:50]
-                    logger.warning(f"⚠️ Using truncated partner_id: {partner_id}")
-            
-            return partner_id
-            
-        except Exception as e:
-            logger.error(f"❌ Error extracting partner_id from {content_type}: {e}")
-            raise
-    
-    def _is_valid_partner_id(self, partner_id: str) -> bool:
-        """
-        Valida si un partner_id tiene formato válido (UUID o ID corto)
-        """
-        import re
-        
-        # Verificar si es UUID
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        if re.match(uuid_pattern, partner_id, re.IGNORECASE):
-            return True
-        
-        if len(partner_id) < 50 and partner_id.replace('-', '').replace('_', '').isalnum():
-            return True
-
-        if any(char in partner_id for char in ['@', '+', ',', ' ']):
-            return False
-        
-        return True
-    
-    def _extract_uuid_from_malformed_content(self, content: str) -> str:
-        """
-        Intenta extraer un UUID de contenido malformado
-        """
-        import re
-        
-        # Buscar patrón UUID en el contenido
-        uuid_pattern = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
-        match = re.search(uuid_pattern, content, re.IGNORECASE)
-        
-        if match:
-            return match.group(0)
-        
-        return None
-    
     def _process_create_partner_message(self, content: str) -> CreatePartner:
         """Procesa mensajes del topic comando-crear-partner y crea eventos CreatePartner"""
         try:
-            temp_partner_id = f"temp-{str(uuid.uuid4())[:8]}"
+            correlacion_id = extraer_id_comando(content) or ""
             
             logger.info(f"📝 CreatePartner received with form data: {content[:100]}...")
-            logger.info(f"🆔 Generated temporary partner_id: {temp_partner_id}")
+            logger.info(f"🆔 Command correlation id: {correlacion_id or 'N/A'}")
             logger.info(f"⏭️ Real partner_id will come from PartnerCreated event")
             
-            return CreatePartner(partner_id=temp_partner_id)
+            return CreatePartner(correlacion_id=correlacion_id)
             
         except Exception as e:
             logger.error(f"❌ Error processing CreatePartner message: {e}")
@@ -229,10 +196,11 @@ class PulsarSagaChoreographyListener:
     def _process_partner_created_message(self, content: str) -> PartnerCreated:
         """Procesa mensajes del topic PartnerCreado y crea eventos PartnerCreated"""
         try:
-            partner_id = self._extract_partner_id_from_content(content, "PartnerCreated")
+            partner_id = extraer_partner_id(content, "PartnerCreated")
+            correlacion_id = extraer_correlacion_id(content) or ""
             
-            logger.info(f"✅ Created PartnerCreated event for partner_id: {partner_id}")
-            return PartnerCreated(partner_id=partner_id)
+            logger.info(f"✅ Created PartnerCreated event for partner_id: {partner_id} (correlation id: {correlacion_id or 'N/A'})")
+            return PartnerCreated(partner_id=partner_id, correlacion_id=correlacion_id)
             
         except Exception as e:
             logger.error(f"❌ Error processing PartnerCreado message: {e}")
@@ -337,38 +305,99 @@ class PulsarSagaChoreographyListener:
         logger.info(f"📡 Starting to listen for events on topic: {topic}")
         
         try:
-            while True:
-                logger.info(f"⏳ Waiting for messages on topic {topic}...")
-                msg = consumer.receive()
-                
+            while not self._detenido.is_set():
                 try:
-                    # Procesar el mensaje y crear evento de dominio
-                    evento = self.process_message(topic, msg.data())
-                    
-                    # Manejar eventos de compliance con lógica específica
-                    if isinstance(evento, ContratoAprobado):
-                        self._handle_contrato_aprobado(evento)
-                    elif isinstance(evento, ContratoRechazado):
-                        self._handle_contrato_rechazado(evento)
-                    elif isinstance(evento, RevisionContrato):
-                        self._handle_revision_contrato(evento)
-                    else:
-                        # Procesar el evento en la saga coreográfica normal
-                        self.coordinador.procesar_evento(evento)
-                    
-                    # Confirmar el mensaje
-                    consumer.acknowledge(msg)
-                    logger.info(f"✅ Successfully processed event from topic {topic}")
-                    
-                except Exception as e:
-                    logger.error(f'Error processing message from topic {topic}: {e}')
-                    consumer.negative_acknowledge(msg)
+                    # Con timeout para notar close() aunque el tópico no tenga tráfico
+                    msg = consumer.receive(timeout_millis=SAGA_LISTENER_RECEIVE_TIMEOUT_MS)
+                except pulsar.Timeout:
+                    continue
+                self._recibir_mensaje(consumer, topic, msg)
                     
         except Exception as e:
-            logger.error(f'Fatal error in listener for topic {topic}')
+            if self._detenido.is_set():
+                return
+            logger.error(f'Fatal error in listener for topic {topic}: {e}')
             raise
+
+    def listen_multi_topic(self):
+        """
+        Recibe de todos los tópicos con un único consumer y reparte los mensajes
+        en un pool fijo de workers, independiente de la cantidad de tópicos
+        """
+        consumer = self.multi_consumer
+        logger.info(f"📡 Listening on {len(self.topics)} topics with {self.workers} workers")
+        while not self._detenido.is_set():
+            try:
+                msg = consumer.receive(timeout_millis=SAGA_LISTENER_RECEIVE_TIMEOUT_MS)
+            except pulsar.Timeout:
+                continue
+            except Exception as e:
+                if self._detenido.is_set():
+                    break
+                logger.error(f'Fatal error in multi-topic listener: {e}')
+                raise
+
+            self._recibir_mensaje(consumer, self._topico_corto(msg.topic_name()), msg)
+
+    def _topico_corto(self, topic_name: str) -> str:
+        """
+        Convierte 'persistent://public/default/PartnerCreado' en 'PartnerCreado'; en
+        tópicos particionados también quita el sufijo '-partition-N'
+        """
+        topico = topic_name.rsplit('/', 1)[-1]
+        base, separador, particion = topico.rpartition('-partition-')
+        if separador and particion.isdigit() and base in self.topics:
+            return base
+        return topico
+
+    def _recibir_mensaje(self, consumer, topic: str, msg):
+        """
+        Convierte el mensaje en evento de dominio y lo encola en el worker de su partner.
+        El encolado bloquea si la cola está llena, frenando el receive() del llamador
+        """
+        try:
+            evento = self.process_message(topic, msg.data())
+        except Exception as e:
+            logger.error(f'Error processing message from topic {topic}: {e}')
+            consumer.negative_acknowledge(msg)
+            return
+
+        if isinstance(evento, CreatePartner):
+            # Anotado antes de encolarlo: su PartnerCreado corre en el worker del partner y
+            # podría adelantarse al del comando y no encontrar la correlación
+            self.coordinador.anotar_comando(evento)
+
+        if self.ejecutor is None:
+            self._procesar_evento(consumer, topic, msg, evento)
+        else:
+            # CreatePartner aún no tiene partner_id: se ordena por su id de correlación
+            clave = evento.partner_id or getattr(evento, 'correlacion_id', '')
+            self.ejecutor.enviar(clave, self._procesar_evento, consumer, topic, msg, evento)
+
+    def _procesar_evento(self, consumer, topic: str, msg, evento):
+        """
+        Aplica el evento en la saga y confirma (o rechaza) el mensaje en su consumer. Un
+        evento que quedó en espera de su predecesor retiene la confirmación: el mensaje
+        se resuelve cuando el coordinador lo aplica o lo descarta
+        """
+        confirmacion = ConfirmacionMensaje(consumer, msg)
+        try:
+            # Eventos de compliance tienen manejador propio; el resto va directo al coordinador
+            self.registro.entrada(topic).manejador(evento, confirmacion)
+        except Exception as e:
+            logger.error(f'Error processing message from topic {topic}: {e}')
+            if not confirmacion.retenida:
+                confirmacion.rechazar()
+            return
+
+        if confirmacion.retenida:
+            logger.info(f"⏸️ Event from topic {topic} waiting for its predecessor, ack deferred")
+            return
+        # Confirmar el mensaje
+        confirmacion.confirmar()
+        logger.info(f"✅ Successfully processed event from topic {topic}")
     
-    def _handle_contrato_aprobado(self, evento: ContratoAprobado):
+    def _handle_contrato_aprobado(self, evento: ContratoAprobado, confirmacion=None):
         """Maneja eventos de contrato aprobado - finaliza la saga exitosamente"""
         try:
             logger.info(f"🎉 Contrato APROBADO para partner {evento.partner_id}")
@@ -376,7 +405,7 @@ class PulsarSagaChoreographyListener:
             logger.info(f"✅ Validaciones pasadas: {', '.join(evento.validaciones_pasadas)}")
             
             # Procesar en la saga - el coordinador ya maneja la finalización
-            self.coordinador.procesar_evento(evento)
+            self.coordinador.procesar_evento(evento, confirmacion)
             
             logger.info(f"🏁 Saga completada exitosamente para partner {evento.partner_id}")
             
@@ -384,7 +413,7 @@ class PulsarSagaChoreographyListener:
             logger.error(f"❌ Error manejando contrato aprobado: {e}")
             raise
     
-    def _handle_contrato_rechazado(self, evento: ContratoRechazado):
+    def _handle_contrato_rechazado(self, evento: ContratoRechazado, confirmacion=None):
         """Maneja eventos de contrato rechazado - crea evento de revisión"""
         try:
             logger.warning(f"❌ Contrato RECHAZADO para partner {evento.partner_id}")
@@ -392,7 +421,7 @@ class PulsarSagaChoreographyListener:
             logger.warning(f"⚠️ Validación fallida: {evento.validacion_fallida}")
             
             # Procesar en la saga para registrar el rechazo
-            self.coordinador.procesar_evento(evento)
+            self.coordinador.procesar_evento(evento, confirmacion)
             
             # Crear evento de revisión
             evento_revision = RevisionContrato(
@@ -437,7 +466,7 @@ class PulsarSagaChoreographyListener:
             logger.error(f"❌ Error manejando contrato rechazado: {e}")
             raise
     
-    def _handle_revision_contrato(self, evento: RevisionContrato):
+    def _handle_revision_contrato(self, evento: RevisionContrato, confirmacion=None):
         """Maneja eventos de revisión de contrato - registra la revisión pendiente"""
         try:
             logger.info(f"🔄 Handling RevisionContrato event. Type: {type(evento)}, Partner: {evento.partner_id}")
@@ -453,7 +482,7 @@ class PulsarSagaChoreographyListener:
             
             # Procesar en la saga para registrar la revisión
             logger.info(f"🎯 Calling coordinador.procesar_evento with {type(evento).__name__}")
-            self.coordinador.procesar_evento(evento)
+            self.coordinador.procesar_evento(evento, confirmacion)
             logger.info(f"⏳ Saga mantiene estado de revisión pendiente para partner {evento.partner_id}")
             logger.info(f"📝 Esperando resolución de revisión manual...")
             
@@ -463,12 +492,31 @@ class PulsarSagaChoreographyListener:
     
     def listen(self):
         """
-        Escucha todos los tópicos en threads separados
+        Escucha todos los tópicos, con un consumer multi-tópico o con un thread por tópico
         """
-        if not self.consumers:
+        if not self.consumers and not self.multi_consumer:
             self.connect()
         
+        if SAGA_REPLAY_AL_INICIAR:
+            # Antes de consumir, para que los eventos nuevos partan del estado reconstruido
+            try:
+                reconstruir_estado_sagas(self.coordinador, self.coordinador.estado_saga, lote=SAGA_REPLAY_LOTE)
+            except Exception as e:
+                logger.error(f"❌ No se pudo reconstruir el estado de sagas desde saga_logs: {e}")
+
         logger.info(f"🎭 Starting choreography listener for topics: {list(self.topics.keys())}")
+        self.ejecutor = EjecutorPorClave(self.workers, SAGA_LISTENER_COLA_MAX, nombre='saga-worker')
+        self.coordinador.asignar_ejecutor(self.ejecutor)
+        if SAGA_REINTENTO_HABILITADO:
+            self.reintentador = ReintentadorSagaLogs(self.coordinador)
+            self.reintentador.iniciar()
+
+        if self.modo == 'multi-topico':
+            try:
+                self.listen_multi_topic()
+            except KeyboardInterrupt:
+                logger.info("🛑 Choreography listener stopped by user")
+            return
         
         # Crear un thread para cada tópico
         threads = []
@@ -485,11 +533,24 @@ class PulsarSagaChoreographyListener:
         except KeyboardInterrupt:
             logger.info("🛑 Choreography listener stopped by user")
     
+    def metricas(self) -> list:
+        """Profundidad y acumulados de cada cola de workers"""
+        return self.ejecutor.metricas() if self.ejecutor else []
+
     def close(self):
         """Cierra las conexiones de Pulsar"""
+        self._detenido.set()
         try:
+            # El reintentador encola en el ejecutor: se detiene antes que él
+            if self.reintentador:
+                self.reintentador.detener()
+            if self.ejecutor:
+                # Los temporizadores que venzan durante el cierre no quedan en colas sin worker
+                self.coordinador.asignar_ejecutor(None)
+                self.ejecutor.cerrar()
             if self.revision_producer:
                 self.revision_producer.close()
+            self.coordinador.cerrar()
             if self.client:
                 self.client.close()
             logger.info("📡 Pulsar choreography listener closed")
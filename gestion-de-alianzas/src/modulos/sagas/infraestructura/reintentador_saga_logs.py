@@ -0,0 +1,186 @@
+"""
+Reintento en segundo plano de eventos de saga que quedaron en ERROR
+"""
+import json
+import logging
+import threading
+from concurrent.futures import Future, wait
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+from ..config.db import SagaSessionFactory
+from ..config.settings import (
+    SAGA_REINTENTO_INTERVALO_SEGUNDOS, SAGA_REINTENTO_LOTE, SAGA_REINTENTO_MAX_INTENTOS,
+    SAGA_REINTENTO_BACKOFF_BASE_SEGUNDOS, SAGA_REINTENTO_BACKOFF_MAX_SEGUNDOS, SAGA_REINTENTO_TIMEOUT_SEGUNDOS,
+    SAGA_REINTENTO_LEASE_SEGUNDOS
+)
+from .repositorios import saga_log_consultas as consultas
+
+logger = logging.getLogger(__name__)
+
+
+class ReintentadorSagaLogs:
+    """
+    Reclama lotes de saga logs en ERROR y los reprocesa con el coordinador.
+
+    Cada ronda usa dos transacciones cortas. La primera reclama el lote con FOR UPDATE
+    SKIP LOCKED, suma el intento y toma un lease de ``lease_segundos``; al confirmarla
+    no quedan bloqueos ni conexiones tomadas mientras se reprocesa. La segunda registra
+    los resultados: un UPDATE en bloque para los exitosos y un executemany para los
+    fallidos, que vuelven a ERROR con su backoff. Varias réplicas pueden ejecutarlo a
+    la vez sin procesar dos veces la misma fila. Un log deja de reintentarse al
+    superar ``max_intentos``.
+
+    Cada reproceso se encola en el ``EjecutorPorClave`` del coordinador bajo el
+    partner_id del log, de modo que nunca corre en paralelo con los eventos de ese
+    partner. La ronda espera los resultados hasta ``timeout_segundos``; los que no
+    terminan siguen con su lease tomado y su resultado se registra en una ronda
+    posterior, cuando terminen. Los resultados llevan el intento reclamado, así que
+    uno que llega tras vencer el lease y ser reclamado de nuevo se descarta.
+    """
+
+    def __init__(
+        self,
+        coordinador,
+        session_factory=SagaSessionFactory,
+        intervalo_segundos: float = SAGA_REINTENTO_INTERVALO_SEGUNDOS,
+        lote: int = SAGA_REINTENTO_LOTE,
+        max_intentos: int = SAGA_REINTENTO_MAX_INTENTOS,
+        backoff_base_segundos: float = SAGA_REINTENTO_BACKOFF_BASE_SEGUNDOS,
+        backoff_max_segundos: float = SAGA_REINTENTO_BACKOFF_MAX_SEGUNDOS,
+        timeout_segundos: float = SAGA_REINTENTO_TIMEOUT_SEGUNDOS,
+        lease_segundos: float = SAGA_REINTENTO_LEASE_SEGUNDOS,
+    ):
+        if lease_segundos <= timeout_segundos:
+            raise ValueError("lease_segundos debe ser mayor que timeout_segundos")
+        self.coordinador = coordinador
+        self._session_factory = session_factory
+        self.intervalo_segundos = intervalo_segundos
+        self.lote = lote
+        self.max_intentos = max_intentos
+        self.backoff_base_segundos = backoff_base_segundos
+        self.backoff_max_segundos = backoff_max_segundos
+        self.timeout_segundos = timeout_segundos
+        self.lease_segundos = lease_segundos
+        # Reprocesos que no terminaron dentro de su ronda: (log, futuro)
+        self._tardios: List[tuple] = []
+        self._detenido = threading.Event()
+        self._hilo = None
+
+    def iniciar(self) -> None:
+        if self._hilo is not None:
+            return
+        self._hilo = threading.Thread(target=self._ejecutar, name='saga-log-reintentos', daemon=True)
+        self._hilo.start()
+        logger.info(f"🔁 Reintentador de saga logs iniciado (cada {self.intervalo_segundos}s, lotes de {self.lote})")
+
+    def detener(self, timeout: float = 10.0) -> None:
+        self._detenido.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+
+    def procesar_lote(self) -> Tuple[int, int]:
+        """Reclama y reprocesa un lote; retorna (exitosos, fallidos o sin terminar)."""
+        self._registrar_tardios()
+
+        reclamados = self._reclamar()
+        if not reclamados:
+            return 0, 0
+
+        futuros = {self._enviar(log): log for log in reclamados}
+        terminados, pendientes = wait(futuros, timeout=self.timeout_segundos)
+        for futuro in pendientes:
+            log = futuros[futuro]
+            logger.warning(
+                f"⚠️ Reintento de {log.tipo_evento} ({log.id}) no terminó en {self.timeout_segundos}s; "
+                f"conserva su lease y se registrará al terminar"
+            )
+            self._tardios.append((log, futuro))
+
+        exitosos, fallidos = self._registrar((futuros[futuro], futuro) for futuro in terminados)
+        logger.info(
+            f"🔁 Reintento de saga logs: {exitosos} procesados, {fallidos} fallidos, {len(pendientes)} sin terminar"
+        )
+        return exitosos, fallidos + len(pendientes)
+
+    def _reclamar(self) -> list:
+        """Primera transacción: toma el lease de un lote y libera los bloqueos al confirmar."""
+        stmt = consultas.sentencia_reclamar_reintentos(
+            self.coordinador.tipos_reprocesables(), self.max_intentos, self.lote, datetime.utcnow(),
+            self.backoff_base_segundos, self.backoff_max_segundos, self.lease_segundos
+        )
+        with self._session_factory() as session:
+            with session.begin():
+                return session.execute(stmt).all()
+
+    def _registrar_tardios(self) -> None:
+        terminados = [(log, futuro) for log, futuro in self._tardios if futuro.done()]
+        if not terminados:
+            return
+        self._tardios = [(log, futuro) for log, futuro in self._tardios if not futuro.done()]
+        exitosos, fallidos = self._registrar(terminados)
+        logger.info(f"🔁 Reintentos tardíos de saga logs: {exitosos} procesados, {fallidos} fallidos")
+
+    def _registrar(self, resultados: Iterable[tuple]) -> Tuple[int, int]:
+        """Segunda transacción: registra el resultado de reprocesos ya terminados."""
+        exitosos: List[tuple] = []
+        fallidos: List[dict] = []
+        for log, futuro in resultados:
+            error = futuro.exception()
+            if error is None:
+                exitosos.append((log.id, log.timestamp, log.intentos))
+            else:
+                logger.warning(f"⚠️ Reintento {log.intentos - 1} de {log.tipo_evento} ({log.id}) falló: {error}")
+                fallidos.append({
+                    'b_id': log.id, 'b_timestamp': log.timestamp, 'b_intentos': log.intentos,
+                    'b_mensaje': str(error),
+                })
+        if not (exitosos or fallidos):
+            return 0, 0
+
+        ahora = datetime.utcnow()
+        with self._session_factory() as session:
+            with session.begin():
+                if exitosos:
+                    session.execute(consultas.sentencia_marcar_procesados(exitosos, ahora))
+                if fallidos:
+                    session.execute(
+                        consultas.sentencia_marcar_fallidos(ahora, self.backoff_base_segundos, self.backoff_max_segundos),
+                        fallidos
+                    )
+        return len(exitosos), len(fallidos)
+
+    def _enviar(self, dto) -> Future:
+        """Encola el reproceso del log en el worker de su partner (o lo ejecuta aquí si no hay ejecutor)."""
+        futuro = Future()
+        try:
+            evento_data = json.loads(dto.evento_data)
+        except ValueError as e:
+            futuro.set_exception(e)
+            return futuro
+        ejecutor = getattr(self.coordinador, 'ejecutor', None)
+        if ejecutor is None:
+            self._reprocesar(futuro, dto.tipo_evento, evento_data)
+        else:
+            clave = dto.partner_id or evento_data.get('partner_id') or ''
+            ejecutor.enviar(clave, self._reprocesar, futuro, dto.tipo_evento, evento_data)
+        return futuro
+
+    def _reprocesar(self, futuro: Future, tipo_evento: str, evento_data: dict) -> None:
+        try:
+            self.coordinador.reprocesar_evento(tipo_evento, evento_data)
+        except Exception as e:
+            futuro.set_exception(e)
+        else:
+            futuro.set_result(None)
+
+    def _ejecutar(self) -> None:
+        while not self._detenido.is_set():
+            try:
+                exitosos, fallidos = self.procesar_lote()
+                # Lote completo: puede haber más pendientes, seguir sin esperar
+                if exitosos + fallidos >= self.lote:
+                    continue
+            except Exception as e:
+                logger.error(f"❌ Error en ronda de reintentos de saga logs: {e}")
+            self._detenido.wait(self.intervalo_segundos)
@@ -0,0 +1,172 @@
+"""
+Reconstrucción del estado de sagas (saga_estados) a partir del historial en saga_logs
+"""
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+
+from ..config.db import SagaSessionFactory
+from .dto import SagaLog as SagaLogDTO
+
+logger = logging.getLogger(__name__)
+
+SAGA_INICIADA = 'SAGA_INICIADA'
+SAGA_FINALIZADA = 'SAGA_FINALIZADA'
+SAGA_TIMEOUT = 'SAGA_TIMEOUT'
+
+
+class ReconstructorEstadoSagas:
+    """
+    Pliega filas de saga_logs, ordenadas por (partner_id, timestamp), en el estado de
+    cada saga con las mismas reglas de coreografía del coordinador:
+
+    - ``SAGA_INICIADA`` abre una saga nueva para el partner (reemplaza la anterior);
+    - un evento de la saga se aplica si el coordinador permite que siga al último;
+    - ``SAGA_FINALIZADA`` y ``SAGA_TIMEOUT`` fijan el estado terminal.
+
+    Como las filas de un partner llegan juntas, solo se mantiene el estado compacto
+    del partner en curso: al cambiar de partner, ``aplicar`` entrega el estado final
+    del anterior. La memoria es constante, sin importar cuántas sagas o filas se lean.
+    """
+
+    def __init__(self, coordinador):
+        self.coordinador = coordinador
+        self.partner_id: Optional[str] = None
+        self.estado: Optional[dict] = None
+        self.filas = 0
+        self.descartadas = 0
+        self.sagas = 0
+
+    def aplicar(self, partner_id: Optional[str], saga_id, tipo_evento: str, timestamp: datetime,
+                evento_data: str) -> Optional[Tuple[str, dict]]:
+        """Aplica una fila; retorna (partner_id, estado) del partner anterior si este terminó."""
+        self.filas += 1
+        if not partner_id:
+            # Sin partner (CreatePartner) o anterior a la columna partner_id sin completar
+            self.descartadas += 1
+            return None
+
+        terminado = None
+        if partner_id != self.partner_id:
+            terminado = self.terminar()
+            self.partner_id = partner_id
+
+        if tipo_evento == SAGA_INICIADA:
+            self.estado = {
+                'saga_id': str(saga_id),
+                'estado': 'INICIADA',
+                'ultimo_evento': None,
+                'iniciada_en': timestamp,
+                'actualizada_en': timestamp,
+                'finalizada_en': None,
+            }
+            return terminado
+
+        estado = self.estado
+        if estado is None or estado['saga_id'] != str(saga_id):
+            # Eventos sin saga o de una saga ya reemplazada
+            self.descartadas += 1
+            return terminado
+
+        if tipo_evento == SAGA_FINALIZADA:
+            datos = self._cargar(evento_data)
+            estado['estado'] = datos.get('estado_final') or ('COMPLETADA' if datos.get('exitoso') else 'FALLIDA')
+            estado['actualizada_en'] = estado['finalizada_en'] = timestamp
+        elif tipo_evento == SAGA_TIMEOUT:
+            estado['estado'] = 'EXPIRADA'
+            estado['actualizada_en'] = estado['finalizada_en'] = timestamp
+        elif tipo_evento in self.coordinador.tipos_por_nombre:
+            tipo = self.coordinador.tipos_por_nombre[tipo_evento]
+            anterior = self.coordinador.tipos_por_nombre.get(estado['ultimo_evento'])
+            if anterior is not None and not self.coordinador.puede_procesar_evento(anterior, tipo):
+                self.descartadas += 1
+                return terminado
+            estado['ultimo_evento'] = tipo_evento
+            estado['actualizada_en'] = timestamp
+        else:
+            self.descartadas += 1
+        return terminado
+
+    def terminar(self) -> Optional[Tuple[str, dict]]:
+        """Entrega el estado final del partner en curso, si tiene saga, y lo olvida."""
+        partner_id, estado = self.partner_id, self.estado
+        self.partner_id = self.estado = None
+        if estado is None:
+            return None
+        self.sagas += 1
+        return partner_id, estado
+
+    def _cargar(self, evento_data: str) -> dict:
+        try:
+            datos = json.loads(evento_data)
+        except (TypeError, ValueError):
+            return {}
+        return datos if isinstance(datos, dict) else {}
+
+
+def reconstruir_estado_sagas(
+    coordinador,
+    estado_repository,
+    session_factory=SagaSessionFactory,
+    desde: Optional[datetime] = None,
+    lote: int = 5000,
+) -> dict:
+    """
+    Recorre saga_logs en orden de (partner_id, timestamp, id) con un cursor de servidor
+    (``yield_per``), pliega un partner a la vez y escribe cada saga terminada de plegar
+    en saga_estados con upserts por lotes de ``lote`` sagas. Las filas sin partner_id
+    se descartan: en tablas anteriores a esa columna debe completarse antes con
+    ``migrar_saga_logs_correlacion``. Retorna estadísticas de la reconstrucción.
+    """
+    inicio = time.perf_counter()
+    reconstructor = ReconstructorEstadoSagas(coordinador)
+    pendientes: Dict[str, dict] = {}
+    activas = 0
+
+    def escribir(terminado: Optional[Tuple[str, dict]]) -> None:
+        nonlocal pendientes, activas
+        if terminado is None:
+            return
+        partner_id, estado = terminado
+        pendientes[partner_id] = estado
+        # Los temporizadores viven en memoria: las sagas activas reconstruidas vuelven a
+        # tener su vencimiento, descontado el tiempo que ya llevan sin eventos
+        if estado['estado'] == 'INICIADA':
+            coordinador.rearmar_vencimiento(partner_id, estado['actualizada_en'])
+            activas += 1
+        if len(pendientes) >= lote:
+            estado_repository.guardar_lote(pendientes)
+            pendientes = {}
+
+    # El índice (partner_id, timestamp) entrega las filas de cada partner juntas y en orden
+    stmt = select(
+        SagaLogDTO.partner_id, SagaLogDTO.saga_id, SagaLogDTO.tipo_evento,
+        SagaLogDTO.timestamp, SagaLogDTO.evento_data,
+    ).where(SagaLogDTO.partner_id.is_not(None)).order_by(
+        SagaLogDTO.partner_id, SagaLogDTO.timestamp, SagaLogDTO.id
+    ).execution_options(yield_per=lote)
+    if desde is not None:
+        stmt = stmt.where(SagaLogDTO.timestamp >= desde)
+
+    with session_factory() as session:
+        for partner_id, saga_id, tipo_evento, timestamp, evento_data in session.execute(stmt):
+            escribir(reconstructor.aplicar(partner_id, saga_id, tipo_evento, timestamp, evento_data))
+            if reconstructor.filas % 100000 == 0:
+                logger.info(f"🔄 Replay de saga_logs: {reconstructor.filas} filas, {reconstructor.sagas} sagas")
+    escribir(reconstructor.terminar())
+    if pendientes:
+        estado_repository.guardar_lote(pendientes)
+
+    estadisticas = {
+        'filas': reconstructor.filas,
+        'descartadas': reconstructor.descartadas,
+        'sagas': reconstructor.sagas,
+        'activas': activas,
+        'segundos': round(time.perf_counter() - inicio, 1),
+    }
+    logger.info(f"✅ Estado de sagas reconstruido desde saga_logs: {estadisticas}")
+    return estadisticas
@@ -1,4 +1,9 @@
 """Repositorios de infraestructura del módulo de sagas."""
 from .saga_log_repository import SagaLogRepository
+from .saga_log_repository_async import SagaLogRepositoryAsync
+from .saga_estado_repository import SagaEstadoRepository
+from .saga_estado_consultas_async import SagaEstadoConsultasAsync
+from .saga_estadisticas_consultas_async import SagaEstadisticasConsultasAsync
 
-__all__ = ['SagaLogRepository']
\ No newline at end of file
+__all__ = ['SagaLogRepository', 'SagaLogRepositoryAsync', 'SagaEstadoRepository', 'SagaEstadoConsultasAsync',
+           'SagaEstadisticasConsultasAsync']
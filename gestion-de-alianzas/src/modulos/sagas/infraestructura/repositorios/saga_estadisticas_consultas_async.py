@@ -0,0 +1,50 @@
+"""Consultas async de las estadísticas horarias de sagas para la API de sagas."""
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import select
+
+from src.modulos.alianzas.infrastructure.db import SessionFactory
+
+from ..dto import SagaEstadisticaHoraria as SagaEstadisticaHorariaDTO
+from ..estadisticas_sagas import VALIDACION_FALLIDA, inicio_de_hora
+
+
+class SagaEstadisticasConsultasAsync:
+    """
+    Lee saga_estadisticas_horarias por rango de horas sobre su llave primaria
+    (hora, metrica, detalle). El costo depende de las horas pedidas, no del
+    tamaño del historial en saga_logs.
+    """
+
+    def __init__(self, session_factory=SessionFactory):
+        self._session_factory = session_factory
+
+    async def obtener(self, desde: datetime, hasta: datetime) -> Dict:
+        """Totales, desglose de validaciones fallidas y serie por hora en [desde, hasta)."""
+        stmt = select(
+            SagaEstadisticaHorariaDTO.hora, SagaEstadisticaHorariaDTO.metrica,
+            SagaEstadisticaHorariaDTO.detalle, SagaEstadisticaHorariaDTO.cantidad,
+        ).where(
+            SagaEstadisticaHorariaDTO.hora >= inicio_de_hora(desde),
+            SagaEstadisticaHorariaDTO.hora < hasta,
+        ).order_by(SagaEstadisticaHorariaDTO.hora)
+
+        totales: Dict[str, int] = {}
+        validaciones: Dict[str, int] = {}
+        por_hora: Dict[datetime, Dict[str, int]] = {}
+        async with self._session_factory() as session:
+            for hora, metrica, detalle, cantidad in await session.execute(stmt):
+                totales[metrica] = totales.get(metrica, 0) + cantidad
+                if metrica == VALIDACION_FALLIDA:
+                    validaciones[detalle] = validaciones.get(detalle, 0) + cantidad
+                conteos_hora = por_hora.setdefault(hora, {})
+                conteos_hora[metrica] = conteos_hora.get(metrica, 0) + cantidad
+
+        return {
+            'desde': desde,
+            'hasta': hasta,
+            'totales': totales,
+            'validacion_fallida': validaciones,
+            'por_hora': [{'hora': hora, 'conteos': conteos} for hora, conteos in por_hora.items()],
+        }
@@ -0,0 +1,76 @@
+"""Consultas async de solo lectura sobre saga_estados para la API de sagas."""
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import or_, select
+
+from src.modulos.alianzas.infrastructure.db import SessionFactory
+
+from ..dto import SagaEstado as SagaEstadoDTO
+
+# Posición de la última saga leída: (actualizada_en, saga_id)
+CursorEstado = Tuple[datetime, str]
+
+LIMITE_PAGINA = 100
+
+
+def cursor_de_estado(estado: dict) -> CursorEstado:
+    """Cursor para pedir la página que sigue a ``estado``."""
+    return estado['actualizada_en'], estado['saga_id']
+
+
+class SagaEstadoConsultasAsync:
+    """
+    Lecturas de saga_estados desde código async, sobre el pool del engine de alianzas.
+
+    El listado está paginado por LIMIT y cursor (actualizada_en, saga_id): con filtro
+    de estado usa idx_saga_estados_estado_actualizada y sin él
+    idx_saga_estados_actualizada, así que cada página es un rango de índice.
+    """
+
+    def __init__(self, session_factory=SessionFactory):
+        self._session_factory = session_factory
+
+    async def obtener_por_partner_id(self, partner_id: str) -> Optional[dict]:
+        """Estado actual de la saga de un partner, o None si no tiene saga."""
+        async with self._session_factory() as session:
+            stmt = select(SagaEstadoDTO).where(SagaEstadoDTO.partner_id == partner_id)
+            dto = (await session.execute(stmt)).scalar_one_or_none()
+            return self._convertir_dto_a_estado(dto) if dto else None
+
+    async def listar(
+        self,
+        estado: Optional[str] = None,
+        desde: Optional[datetime] = None,
+        limite: int = LIMITE_PAGINA,
+        despues_de: Optional[CursorEstado] = None,
+    ) -> List[dict]:
+        """Una página de sagas actualizadas desde ``desde``, en orden de actualización."""
+        stmt = select(SagaEstadoDTO)
+        if estado is not None:
+            stmt = stmt.where(SagaEstadoDTO.estado == estado)
+        if desde is not None:
+            stmt = stmt.where(SagaEstadoDTO.actualizada_en >= desde)
+        if despues_de is not None:
+            actualizada_en, saga_id = despues_de
+            # actualizada_en >= :ts acota el rango del índice; el OR desempata por saga_id
+            stmt = stmt.where(
+                SagaEstadoDTO.actualizada_en >= actualizada_en,
+                or_(SagaEstadoDTO.actualizada_en > actualizada_en, SagaEstadoDTO.saga_id > saga_id),
+            )
+        stmt = stmt.order_by(SagaEstadoDTO.actualizada_en, SagaEstadoDTO.saga_id).limit(limite)
+
+        async with self._session_factory() as session:
+            result = await session.execute(stmt)
+            return [self._convertir_dto_a_estado(dto) for dto in result.scalars()]
+
+    def _convertir_dto_a_estado(self, dto: SagaEstadoDTO) -> dict:
+        return {
+            'saga_id': str(dto.saga_id),
+            'partner_id': dto.partner_id,
+            'estado': dto.estado,
+            'ultimo_evento': dto.ultimo_evento,
+            'iniciada_en': dto.iniciada_en,
+            'actualizada_en': dto.actualizada_en,
+            'finalizada_en': dto.finalizada_en,
+        }
@@ -0,0 +1,190 @@
+"""Repositorio del estado de sagas: tabla saga_estados con cache LRU en memoria."""
+import atexit
+import logging
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from ...config.db import get_saga_session
+from ...config.settings import SAGA_ESTADO_CACHE_MAX, SAGA_ESTADO_CACHE_TTL_SEGUNDOS, SAGA_ESTADO_FLUSH_MS
+from ...dominio.repositorios.saga_estado_repository import ISagaEstadoRepository
+from ..cache import CacheLRU
+from ..dto import SagaEstado as SagaEstadoDTO
+
+logger = logging.getLogger(__name__)
+
+
+class SagaEstadoRepository(ISagaEstadoRepository):
+    """
+    Estado de saga persistido en una fila por saga, con una cache LRU acotada delante.
+
+    Las lecturas del camino caliente se resuelven en la cache; la tabla solo se
+    consulta en un fallo de cache (reinicio, desalojo o evento atendido por otra
+    réplica). Si la base de datos no está disponible se continúa solo en memoria.
+
+    ``guardar`` es O(1) y no toca la base de datos: toma una copia de la fila y la deja
+    pendiente por partner, de modo que varias transiciones seguidas de una saga se
+    escriben una sola vez. Un hilo de fondo vuelca las pendientes cada ``flush_ms``
+    con un único upsert por lotes; si falla, las filas vuelven a quedar pendientes salvo
+    que una transición más nueva las haya reemplazado. ``cerrar`` vuelca lo que quede.
+    """
+
+    def __init__(self, session_factory=get_saga_session, cache: Optional[CacheLRU] = None,
+                 flush_ms: int = SAGA_ESTADO_FLUSH_MS):
+        self._session_factory = session_factory
+        self._cache = cache or CacheLRU(SAGA_ESTADO_CACHE_MAX, SAGA_ESTADO_CACHE_TTL_SEGUNDOS)
+        self._flush_segundos = flush_ms / 1000.0
+        # partner_id -> (estado, fila): el estado responde lecturas si la cache lo desalojó
+        # antes del volcado; la fila es la copia que se escribe
+        self._pendientes: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._detenido = threading.Event()
+        self._escritor = threading.Thread(target=self._ejecutar, name='saga-estados-write-behind', daemon=True)
+        self._escritor.start()
+        atexit.register(self.cerrar)
+
+    def obtener(self, partner_id: str) -> Optional[dict]:
+        estado = self._cache.obtener(partner_id)
+        if estado is not None:
+            return estado
+
+        with self._lock:
+            pendiente = self._pendientes.get(partner_id)
+        if pendiente is not None:
+            self._cache.guardar(partner_id, pendiente[0])
+            return pendiente[0]
+
+        try:
+            with self._session_factory() as session:
+                stmt = select(SagaEstadoDTO).where(SagaEstadoDTO.partner_id == partner_id)
+                dto = session.execute(stmt).scalar_one_or_none()
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo leer saga_estados para partner {partner_id}: {e}")
+            return None
+
+        if dto is None:
+            return None
+
+        estado = self._convertir_dto_a_estado(dto)
+        self._cache.guardar(partner_id, estado)
+        return estado
+
+    def guardar(self, partner_id: str, estado: dict) -> None:
+        self._cache.guardar(partner_id, estado)
+        fila = self._convertir_estado_a_fila(partner_id, estado)
+        with self._lock:
+            self._pendientes[partner_id] = (estado, fila)
+
+    def volcar(self) -> int:
+        """Escribe las filas pendientes en un único upsert; retorna cuántas se enviaron."""
+        with self._lock:
+            pendientes, self._pendientes = self._pendientes, {}
+        if not pendientes:
+            return 0
+
+        try:
+            with self._session_factory() as session:
+                session.execute(self._sentencia_upsert(), [fila for _, fila in pendientes.values()])
+                session.commit()
+        except Exception:
+            with self._lock:
+                for partner_id, pendiente in pendientes.items():
+                    # Una transición posterior ya dejó una fila más nueva para ese partner
+                    self._pendientes.setdefault(partner_id, pendiente)
+            raise
+        return len(pendientes)
+
+    def cerrar(self, timeout: float = 10.0) -> None:
+        """Detiene el hilo de volcado tras escribir las filas pendientes."""
+        if self._detenido.is_set():
+            return
+        self._detenido.set()
+        self._escritor.join(timeout)
+        try:
+            self.volcar()
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo volcar saga_estados al cerrar: {e}")
+
+    def guardar_lote(self, estados: Dict[str, dict]) -> None:
+        """
+        Upsert de muchas sagas en un solo executemany (reconstrucción desde saga_logs).
+        Solo reemplaza filas con ``actualizada_en`` anterior: un replay no pisa el estado
+        más nuevo que otra réplica ya escribió, ni las filas pendientes de este proceso,
+        que se vuelcan después. Las entradas de cache de esos partners se descartan para
+        que la próxima lectura tome el estado vigente; los errores de base de datos se
+        propagan.
+        """
+        if not estados:
+            return
+        filas = [self._convertir_estado_a_fila(partner_id, estado) for partner_id, estado in estados.items()]
+        with self._session_factory() as session:
+            session.execute(self._sentencia_upsert(solo_si_mas_reciente=True), filas)
+            session.commit()
+        for partner_id in estados:
+            self._cache.eliminar(partner_id)
+
+    def desalojar(self, partner_id: str) -> None:
+        self._cache.eliminar(partner_id)
+
+    def eliminar(self, partner_id: str) -> None:
+        self._cache.eliminar(partner_id)
+        with self._lock:
+            self._pendientes.pop(partner_id, None)
+        try:
+            with self._session_factory() as session:
+                session.execute(delete(SagaEstadoDTO).where(SagaEstadoDTO.partner_id == partner_id))
+                session.commit()
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo eliminar saga_estados para partner {partner_id}: {e}")
+
+    def _sentencia_upsert(self, solo_si_mas_reciente: bool = False):
+        stmt = insert(SagaEstadoDTO)
+        condicion = None
+        if solo_si_mas_reciente:
+            condicion = SagaEstadoDTO.__table__.c.actualizada_en < stmt.excluded.actualizada_en
+        # Una saga nueva del mismo partner reemplaza a la anterior: saga_id e iniciada_en
+        # también se actualizan, o una saga reiniciada conservaría el id de la previa
+        return stmt.on_conflict_do_update(
+            where=condicion,
+            index_elements=[SagaEstadoDTO.partner_id],
+            set_={
+                'saga_id': stmt.excluded.saga_id,
+                'estado': stmt.excluded.estado,
+                'ultimo_evento': stmt.excluded.ultimo_evento,
+                'iniciada_en': stmt.excluded.iniciada_en,
+                'actualizada_en': stmt.excluded.actualizada_en,
+                'finalizada_en': stmt.excluded.finalizada_en,
+            }
+        )
+
+    def _convertir_estado_a_fila(self, partner_id: str, estado: dict) -> dict:
+        return {
+            'saga_id': estado['saga_id'],
+            'partner_id': partner_id,
+            'estado': estado['estado'],
+            'ultimo_evento': estado.get('ultimo_evento'),
+            'iniciada_en': estado['iniciada_en'],
+            'actualizada_en': estado['actualizada_en'],
+            'finalizada_en': estado.get('finalizada_en'),
+        }
+
+    def _ejecutar(self) -> None:
+        while not self._detenido.wait(self._flush_segundos):
+            try:
+                self.volcar()
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudo persistir saga_estados, se mantiene en memoria y se reintentará: {e}")
+
+    def _convertir_dto_a_estado(self, dto: SagaEstadoDTO) -> dict:
+        """Convierte la fila persistida al diccionario de estado usado por el coordinador."""
+        return {
+            'saga_id': str(dto.saga_id),
+            'estado': dto.estado,
+            'eventos': [dto.ultimo_evento] if dto.ultimo_evento else [],
+            'ultimo_evento': dto.ultimo_evento,
+            'iniciada_en': dto.iniciada_en,
+            'actualizada_en': dto.actualizada_en,
+            'finalizada_en': dto.finalizada_en,
+        }
@@ -0,0 +1,275 @@
+"""Consultas y conversiones de saga_logs compartidas por los repositorios sync y async."""
+from datetime import datetime, timedelta
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, func, or_, select, tuple_, update
+
+from ..dto import SagaLog as SagaLogDTO, EstadoEventoDTO
+from ...dominio.entidades.saga_log import SagaLog, EstadoEvento, ORIGENES_TRANSICION
+
+# Posición de la última fila leída: (timestamp, id). Las páginas siguientes continúan
+# desde ese punto por índice en lugar de saltar filas con OFFSET.
+Cursor = Tuple[datetime, str]
+
+LIMITE_PAGINA = 100
+
+
+def cursor_de(saga_log: SagaLog) -> Cursor:
+    """Cursor para pedir la página que sigue a ``saga_log``."""
+    return saga_log.timestamp, saga_log.id
+
+
+def _despues_de(stmt, despues_de: Optional[Cursor]):
+    if despues_de is None:
+        return stmt
+    timestamp, log_id = despues_de
+    # timestamp >= :ts acota el rango del índice; el OR desempata por id
+    return stmt.where(
+        SagaLogDTO.timestamp >= timestamp,
+        or_(SagaLogDTO.timestamp > timestamp, SagaLogDTO.id > log_id),
+    )
+
+
+def _paginar(stmt, limite: Optional[int], despues_de: Optional[Cursor]):
+    stmt = _despues_de(stmt, despues_de).order_by(SagaLogDTO.timestamp, SagaLogDTO.id)
+    return stmt.limit(limite) if limite else stmt
+
+
+def consulta_por_id(log_id: str):
+    return select(SagaLogDTO).where(SagaLogDTO.id == log_id)
+
+
+def consulta_por_saga_id(saga_id: str, limite: Optional[int] = None, despues_de: Optional[Cursor] = None):
+    """Logs de una saga en orden cronológico (idx_saga_logs_saga_id_timestamp)."""
+    return _paginar(select(SagaLogDTO).where(SagaLogDTO.saga_id == saga_id), limite, despues_de)
+
+
+def consulta_por_partner_id(partner_id: str, limite: int = LIMITE_PAGINA, despues_de: Optional[Cursor] = None):
+    """Logs de un partner, de todas sus sagas, en orden cronológico (idx_saga_logs_partner_id_timestamp)."""
+    return _paginar(select(SagaLogDTO).where(SagaLogDTO.partner_id == partner_id), limite, despues_de)
+
+
+def consulta_por_contrato_id(contrato_id: str, limite: int = LIMITE_PAGINA, despues_de: Optional[Cursor] = None):
+    """Logs de un contrato en orden cronológico (idx_saga_logs_contrato_id_timestamp)."""
+    return _paginar(select(SagaLogDTO).where(SagaLogDTO.contrato_id == contrato_id), limite, despues_de)
+
+
+def consulta_por_estado(estado: EstadoEvento, limite: int = LIMITE_PAGINA, despues_de: Optional[Cursor] = None):
+    """Logs en un estado en orden cronológico (idx_saga_logs_estado)."""
+    stmt = select(SagaLogDTO).where(SagaLogDTO.estado == convertir_estado_a_dto(estado))
+    return _paginar(stmt, limite, despues_de)
+
+
+def consulta_pendientes(max_intentos: int = 3, limite: int = LIMITE_PAGINA, despues_de: Optional[Cursor] = None):
+    """Logs en ERROR que aún no agotan sus intentos (idx_saga_logs_estado)."""
+    stmt = select(SagaLogDTO).where(and_(
+        SagaLogDTO.estado == EstadoEventoDTO.ERROR,
+        SagaLogDTO.intentos <= max_intentos,
+    ))
+    return _paginar(stmt, limite, despues_de)
+
+
+def _retardo_reintento(backoff_base_segundos: float, backoff_max_segundos: float):
+    """base * 2^(intentos - 1) segundos, acotado a backoff_max_segundos"""
+    return func.least(backoff_base_segundos * func.power(2, SagaLogDTO.intentos - 1), backoff_max_segundos)
+
+
+def sentencia_reclamar_reintentos(
+    tipos_evento: Iterable[str], max_intentos: int, lote: int, ahora: datetime,
+    backoff_base_segundos: float, backoff_max_segundos: float, lease_segundos: float
+):
+    """
+    Reclama un lote de logs en ERROR cuyo backoff ya venció y les toma un lease: suma
+    el intento y fija ``proximo_intento = ahora + lease`` en un único UPDATE ... RETURNING
+    sobre las filas elegidas con FOR UPDATE SKIP LOCKED. Al confirmar la transacción los
+    bloqueos se liberan, pero ninguna réplica vuelve a reclamar la fila hasta que venza
+    el lease o se registre su resultado.
+
+    RECIBIDO no se reclama: es el estado de los logs informativos y de todo el
+    historial anterior al registro de resultados, que no debe volver a ejecutarse.
+    Un log sin ``proximo_intento`` (recién fallado) espera el retardo de su intento
+    contado desde su última actualización.
+    """
+    tabla = SagaLogDTO.__table__
+    vence_en = func.coalesce(
+        SagaLogDTO.proximo_intento,
+        SagaLogDTO.actualizado_en + func.make_interval(
+            0, 0, 0, 0, 0, 0, _retardo_reintento(backoff_base_segundos, backoff_max_segundos)
+        ),
+    )
+    elegidos = (
+        select(SagaLogDTO.id, SagaLogDTO.timestamp)
+        .where(
+            SagaLogDTO.estado == EstadoEventoDTO.ERROR,
+            SagaLogDTO.intentos <= max_intentos,
+            SagaLogDTO.tipo_evento.in_(list(tipos_evento)),
+            vence_en <= ahora,
+        )
+        .order_by(SagaLogDTO.timestamp)
+        .limit(lote)
+        .with_for_update(skip_locked=True)
+    )
+    return (
+        update(tabla)
+        .where(tuple_(tabla.c.id, tabla.c.timestamp).in_(elegidos))
+        .values(
+            intentos=tabla.c.intentos + 1,
+            proximo_intento=ahora + timedelta(seconds=lease_segundos),
+            actualizado_en=ahora,
+        )
+        .returning(
+            tabla.c.id, tabla.c.timestamp, tabla.c.tipo_evento, tabla.c.evento_data,
+            tabla.c.partner_id, tabla.c.intentos,
+        )
+    )
+
+
+def sentencia_marcar_procesados(claves: Iterable[Tuple[str, datetime, int]], ahora: datetime):
+    """
+    UPDATE único que cierra como PROCESADO todos los logs reintentados con éxito.
+    ``claves`` son (id, timestamp, intentos): la llave primaria de saga_logs particionada
+    y el intento reclamado, que descarta el resultado si otra ronda ya volvió a reclamarlo.
+    """
+    claves = list(claves)
+    tabla = SagaLogDTO.__table__
+    return (
+        update(tabla)
+        # La lista de timestamps permite descartar particiones al planificar
+        .where(
+            tuple_(tabla.c.id, tabla.c.timestamp, tabla.c.intentos).in_(claves),
+            tabla.c.timestamp.in_(list({timestamp for _, timestamp, _ in claves})),
+        )
+        .values(
+            estado=EstadoEventoDTO.PROCESADO, procesado_en=ahora, mensaje_error=None,
+            proximo_intento=None, actualizado_en=ahora,
+        )
+    )
+
+
+def sentencia_marcar_fallidos(ahora: datetime, backoff_base_segundos: float, backoff_max_segundos: float):
+    """
+    UPDATE para executemany con parámetros ``b_id``, ``b_timestamp``, ``b_intentos`` y
+    ``b_mensaje``: sigue en ERROR y el próximo intento se programa tras su backoff. El
+    intento ya se sumó al reclamar; ``b_intentos`` descarta resultados de leases vencidos.
+    """
+    tabla = SagaLogDTO.__table__
+    retardo = func.make_interval(0, 0, 0, 0, 0, 0, _retardo_reintento(backoff_base_segundos, backoff_max_segundos))
+    return (
+        update(tabla)
+        .where(
+            tabla.c.id == bindparam('b_id'), tabla.c.timestamp == bindparam('b_timestamp'),
+            tabla.c.intentos == bindparam('b_intentos'),
+        )
+        .values(
+            estado=EstadoEventoDTO.ERROR,
+            mensaje_error=bindparam('b_mensaje'),
+            proximo_intento=retardo + ahora,
+            actualizado_en=ahora,
+        )
+    )
+
+
+def sentencia_actualizar(saga_log: SagaLog):
+    """UPDATE de los campos mutables de un log por su llave (id, timestamp)."""
+    return (
+        update(SagaLogDTO)
+        .where(SagaLogDTO.id == saga_log.id, SagaLogDTO.timestamp == saga_log.timestamp)
+        .values(
+            estado=convertir_estado_a_dto(saga_log.estado),
+            mensaje_error=saga_log.mensaje_error,
+            intentos=saga_log.intentos,
+            procesado_en=saga_log.procesado_en,
+            actualizado_en=datetime.utcnow(),
+        )
+    )
+
+
+def sentencia_transicion(
+    log_id: str, estado: EstadoEvento, mensaje_error: Optional[str] = None, timestamp: Optional[datetime] = None
+):
+    """
+    UPDATE condicional que lleva el log a ``estado`` solo si está en un estado de
+    origen permitido, y retorna la fila resultante (ninguna si no aplicaba).
+
+    Con ``timestamp`` el UPDATE usa la llave primaria completa y toca una sola
+    partición; sin él, Postgres busca el id en todas.
+    """
+    ahora = datetime.utcnow()
+    valores = {'estado': convertir_estado_a_dto(estado), 'actualizado_en': ahora}
+    if estado == EstadoEvento.PROCESADO:
+        valores['procesado_en'] = ahora
+    elif estado == EstadoEvento.ERROR:
+        valores['mensaje_error'] = mensaje_error
+        valores['intentos'] = SagaLogDTO.intentos + 1
+
+    origenes = [convertir_estado_a_dto(origen) for origen in ORIGENES_TRANSICION[estado]]
+    condiciones = [SagaLogDTO.id == log_id, SagaLogDTO.estado.in_(origenes)]
+    if timestamp is not None:
+        condiciones.append(SagaLogDTO.timestamp == timestamp)
+    return (
+        update(SagaLogDTO)
+        .where(*condiciones)
+        .values(**valores)
+        .returning(SagaLogDTO)
+    )
+
+
+def convertir_estado_a_dto(estado: EstadoEvento) -> EstadoEventoDTO:
+    """Convierte estado de dominio a DTO."""
+    return EstadoEventoDTO(estado.value)
+
+
+def convertir_dto_a_entidad(dto: SagaLogDTO) -> SagaLog:
+    """Convierte un DTO a entidad de dominio."""
+    saga_log = SagaLog(
+        saga_id=str(dto.saga_id),
+        tipo_evento=dto.tipo_evento,
+        evento_data=dto.evento_data,
+        estado=EstadoEvento(dto.estado.value),
+        timestamp=dto.timestamp,
+        mensaje_error=dto.mensaje_error,
+        intentos=dto.intentos,
+        procesado_en=dto.procesado_en,
+        partner_id=dto.partner_id,
+        contrato_id=dto.contrato_id
+    )
+    # Entidad genera un id nuevo al construirse; se conserva el persistido
+    saga_log._id = str(dto.id)
+    return saga_log
+
+
+def convertir_entidad_a_dto(entidad: SagaLog) -> SagaLogDTO:
+    """Convierte una entidad de dominio a DTO."""
+    return SagaLogDTO(
+        id=entidad.id,
+        saga_id=entidad.saga_id,
+        tipo_evento=entidad.tipo_evento,
+        evento_data=entidad.evento_data,
+        estado=convertir_estado_a_dto(entidad.estado),
+        timestamp=entidad.timestamp,
+        mensaje_error=entidad.mensaje_error,
+        intentos=entidad.intentos,
+        procesado_en=entidad.procesado_en,
+        partner_id=entidad.partner_id,
+        contrato_id=entidad.contrato_id
+    )
+
+
+def convertir_entidad_a_fila(entidad: SagaLog) -> dict:
+    """Convierte una entidad de dominio a los valores de una fila para inserción masiva."""
+    ahora = datetime.utcnow()
+    return {
+        'id': entidad.id,
+        'saga_id': entidad.saga_id,
+        'tipo_evento': entidad.tipo_evento,
+        'evento_data': entidad.evento_data,
+        'estado': convertir_estado_a_dto(entidad.estado),
+        'timestamp': entidad.timestamp,
+        'mensaje_error': entidad.mensaje_error,
+        'intentos': entidad.intentos,
+        'procesado_en': entidad.procesado_en,
+        'partner_id': entidad.partner_id,
+        'contrato_id': entidad.contrato_id,
+        'creado_en': ahora,
+        'actualizado_en': ahora,
+    }
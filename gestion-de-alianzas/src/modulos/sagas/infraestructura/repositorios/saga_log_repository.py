@@ -1,70 +1,114 @@
-"""Implementación concreta del repositorio de saga log usando SQLAlchemy async."""
+"""Implementación concreta del repositorio de saga log usando SQLAlchemy (sync)."""
+from contextlib import contextmanager
+from datetime import datetime
 from typing import List, Optional
-from sqlalchemy import and_, or_, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import insert
 
 from src.seedwork.dominio.repositorio import Repositorio
 
-from ...config.db import get_saga_session
+from ...config.db import SagaSessionFactory
 
-from ..dto import SagaLog as SagaLogDTO, EstadoEventoDTO
+from ..dto import SagaLog as SagaLogDTO
 from ...dominio.entidades.saga_log import SagaLog, EstadoEvento
-from ...dominio.repositorios.saga_log_repository import ISagaLogRepository
-
-
-class SagaLogRepository(Repositorio):
-    """Implementación del repositorio de saga log usando SQLAlchemy async."""
-    def __init__(self, session=None):
-        self._session = session
-        self._owns_session = session is None 
-
-    @property
-    def session(self):
-        """Obtiene la sesión de BD de forma lazy"""
-        if self._session is None:
-            self._session = get_saga_session()
-        return self._session
-    
-    def agregar(self, saga_log: SagaLog) -> None:
+from ...dominio.repositorios.saga_log_repository import ISagaLogRepositorySync
+from . import saga_log_consultas as consultas
+from .saga_log_consultas import Cursor
+
+
+class SagaLogRepository(Repositorio, ISagaLogRepositorySync):
+    """
+    Implementación del repositorio de saga log usando SQLAlchemy.
+
+    Cada operación abre su propia sesión del pool (sesión por unidad de trabajo),
+    por lo que una misma instancia puede compartirse entre los hilos del listener.
+    Es la variante usada por el coordinador, que corre en hilos sin event loop;
+    las lecturas desde código async usan SagaLogRepositoryAsync.
+    """
+    def __init__(self, session_factory=SagaSessionFactory):
+        self._session_factory = session_factory
+
+    @contextmanager
+    def _unidad_de_trabajo(self):
+        """Sesión transaccional: commit al salir, rollback ante error y devolución al pool."""
+        session = self._session_factory()
         try:
-            """Agrega un nuevo log de saga."""
-            saga_log_dto = self._convertir_entidad_a_dto(saga_log)
-            self.session.add(saga_log_dto)
-            self.session.commit()
-        except Exception as e:
-            self.session.rollback()   # ← obligatorio
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
             raise
+        finally:
+            session.close()
+
+    def agregar(self, saga_log: SagaLog) -> None:
+        """Agrega un nuevo log de saga."""
+        with self._unidad_de_trabajo() as session:
+            session.add(consultas.convertir_entidad_a_dto(saga_log))
+
+    def agregar_lote(self, saga_logs: List[SagaLog]) -> None:
+        """Agrega varios logs de saga en un único INSERT multi-fila y un solo commit."""
+        if not saga_logs:
+            return
+        filas = [consultas.convertir_entidad_a_fila(saga_log) for saga_log in saga_logs]
+        with self._unidad_de_trabajo() as session:
+            session.execute(insert(SagaLogDTO), filas)
 
     def obtener_por_id(self, log_id: str) -> Optional[SagaLog]:
         """Obtiene un log por su ID."""
-        stmt = select(SagaLogDTO).where(SagaLogDTO.id == log_id)
-        result = self.session.execute(stmt)
-        saga_log_dto = result.scalar_one_or_none()
-        
-        if saga_log_dto:
-            return self._convertir_dto_a_entidad(saga_log_dto)
+        with self._unidad_de_trabajo() as session:
+            saga_log_dto = session.execute(consultas.consulta_por_id(log_id)).scalar_one_or_none()
+            if saga_log_dto:
+                return consultas.convertir_dto_a_entidad(saga_log_dto)
         return None
-    
-    def _convertir_entidad_a_dto(self, entidad: SagaLog) -> SagaLogDTO:
-        """Convierte una entidad de dominio a DTO."""
-        return SagaLogDTO(
-            id=entidad.id,
-            saga_id=entidad.saga_id,
-            tipo_evento=entidad.tipo_evento,
-            evento_data=entidad.evento_data,
-            estado=self._convertir_estado_a_dto(entidad.estado),
-            timestamp=entidad.timestamp,
-            mensaje_error=entidad.mensaje_error,
-            intentos=entidad.intentos,
-            procesado_en=entidad.procesado_en
-        )
-    
-    def _convertir_estado_a_dto(self, estado: EstadoEvento) -> EstadoEventoDTO:
-        """Convierte estado de dominio a DTO."""
-        mapping = {
-            EstadoEvento.RECIBIDO: EstadoEventoDTO.RECIBIDO,
-            EstadoEvento.PROCESANDO: EstadoEventoDTO.PROCESANDO,
-            EstadoEvento.PROCESADO: EstadoEventoDTO.PROCESADO,
-            EstadoEvento.ERROR: EstadoEventoDTO.ERROR,
-        }
-        return mapping[estado]
\ No newline at end of file
+
+    def obtener_por_saga_id(self, saga_id: str) -> List[SagaLog]:
+        """Obtiene todos los logs de una saga específica."""
+        return self._listar(consultas.consulta_por_saga_id(saga_id))
+
+    def obtener_por_partner_id(
+        self, partner_id: str, limite: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs de un partner, de todas sus sagas."""
+        return self._listar(consultas.consulta_por_partner_id(partner_id, limite, despues_de))
+
+    def obtener_por_contrato_id(
+        self, contrato_id: str, limite: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs de un contrato."""
+        return self._listar(consultas.consulta_por_contrato_id(contrato_id, limite, despues_de))
+
+    def obtener_por_estado(
+        self, estado: EstadoEvento, limite: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs por estado específico."""
+        return self._listar(consultas.consulta_por_estado(estado, limite, despues_de))
+
+    def actualizar(self, saga_log: SagaLog) -> None:
+        """Actualiza un log existente."""
+        with self._unidad_de_trabajo() as session:
+            session.execute(consultas.sentencia_actualizar(saga_log))
+
+    def transicionar(
+        self, log_id: str, estado: EstadoEvento, mensaje_error: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[SagaLog]:
+        """Cambia el estado de un log en un único UPDATE condicional; None si la transición no aplica."""
+        with self._unidad_de_trabajo() as session:
+            dto = session.execute(consultas.sentencia_transicion(log_id, estado, mensaje_error, timestamp)).scalar_one_or_none()
+            return consultas.convertir_dto_a_entidad(dto) if dto else None
+
+    def obtener_eventos_pendientes(
+        self, max_intentos: int = 3, limite: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de eventos que pueden ser reprocesados."""
+        return self._listar(consultas.consulta_pendientes(max_intentos, limite, despues_de))
+
+    def obtener_historial_saga(
+        self, saga_id: str, limit: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página del historial de una saga ordenado por timestamp."""
+        return self._listar(consultas.consulta_por_saga_id(saga_id, limit, despues_de))
+
+    def _listar(self, stmt) -> List[SagaLog]:
+        with self._unidad_de_trabajo() as session:
+            return [consultas.convertir_dto_a_entidad(dto) for dto in session.execute(stmt).scalars()]
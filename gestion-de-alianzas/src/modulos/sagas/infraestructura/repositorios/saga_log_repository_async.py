@@ -0,0 +1,104 @@
+"""Implementación async del repositorio de saga log sobre el engine asyncpg de alianzas."""
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import insert
+
+from src.modulos.alianzas.infrastructure.db import SessionFactory
+
+from ..dto import SagaLog as SagaLogDTO
+from ...dominio.entidades.saga_log import SagaLog, EstadoEvento
+from ...dominio.repositorios.saga_log_repository import ISagaLogRepository
+from . import saga_log_consultas as consultas
+from .saga_log_consultas import Cursor
+
+
+class SagaLogRepositoryAsync(ISagaLogRepository):
+    """
+    Repositorio de saga log para código async (API, reprocesos), compartiendo el
+    pool del engine de alianzas.
+
+    Las consultas de listado están paginadas por LIMIT y cursor (timestamp, id) sobre
+    idx_saga_logs_saga_id_timestamp e idx_saga_logs_estado, de modo que leer el
+    historial nunca recorre la tabla completa.
+    """
+
+    def __init__(self, session_factory=SessionFactory):
+        self._session_factory = session_factory
+
+    async def agregar(self, saga_log: SagaLog) -> None:
+        """Agrega un nuevo log de saga."""
+        async with self._session_factory() as session:
+            async with session.begin():
+                session.add(consultas.convertir_entidad_a_dto(saga_log))
+
+    async def agregar_lote(self, saga_logs: List[SagaLog]) -> None:
+        """Agrega varios logs de saga en un único INSERT multi-fila."""
+        if not saga_logs:
+            return
+        filas = [consultas.convertir_entidad_a_fila(saga_log) for saga_log in saga_logs]
+        async with self._session_factory() as session:
+            async with session.begin():
+                await session.execute(insert(SagaLogDTO), filas)
+
+    async def obtener_por_id(self, log_id: str) -> Optional[SagaLog]:
+        """Obtiene un log por su ID."""
+        async with self._session_factory() as session:
+            result = await session.execute(consultas.consulta_por_id(log_id))
+            dto = result.scalar_one_or_none()
+            return consultas.convertir_dto_a_entidad(dto) if dto else None
+
+    async def obtener_por_saga_id(self, saga_id: str) -> List[SagaLog]:
+        """Obtiene todos los logs de una saga específica."""
+        return await self._listar(consultas.consulta_por_saga_id(saga_id))
+
+    async def obtener_por_partner_id(
+        self, partner_id: str, limite: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs de un partner, de todas sus sagas."""
+        return await self._listar(consultas.consulta_por_partner_id(partner_id, limite, despues_de))
+
+    async def obtener_por_contrato_id(
+        self, contrato_id: str, limite: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs de un contrato."""
+        return await self._listar(consultas.consulta_por_contrato_id(contrato_id, limite, despues_de))
+
+    async def obtener_por_estado(
+        self, estado: EstadoEvento, limite: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de logs por estado específico."""
+        return await self._listar(consultas.consulta_por_estado(estado, limite, despues_de))
+
+    async def actualizar(self, saga_log: SagaLog) -> None:
+        """Actualiza un log existente."""
+        async with self._session_factory() as session:
+            async with session.begin():
+                await session.execute(consultas.sentencia_actualizar(saga_log))
+
+    async def transicionar(
+        self, log_id: str, estado: EstadoEvento, mensaje_error: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[SagaLog]:
+        """Cambia el estado de un log en un único UPDATE condicional; None si la transición no aplica."""
+        async with self._session_factory() as session:
+            async with session.begin():
+                result = await session.execute(consultas.sentencia_transicion(log_id, estado, mensaje_error, timestamp))
+                dto = result.scalar_one_or_none()
+                return consultas.convertir_dto_a_entidad(dto) if dto else None
+
+    async def obtener_eventos_pendientes(
+        self, max_intentos: int = 3, limite: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página de eventos que pueden ser reprocesados."""
+        return await self._listar(consultas.consulta_pendientes(max_intentos, limite, despues_de))
+
+    async def obtener_historial_saga(
+        self, saga_id: str, limit: int = consultas.LIMITE_PAGINA, despues_de: Optional[Cursor] = None
+    ) -> List[SagaLog]:
+        """Obtiene una página del historial de una saga ordenado por timestamp."""
+        return await self._listar(consultas.consulta_por_saga_id(saga_id, limit, despues_de))
+
+    async def _listar(self, stmt) -> List[SagaLog]:
+        async with self._session_factory() as session:
+            result = await session.execute(stmt)
+            return [consultas.convertir_dto_a_entidad(dto) for dto in result.scalars()]
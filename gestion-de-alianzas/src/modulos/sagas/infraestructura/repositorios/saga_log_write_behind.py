@@ -0,0 +1,215 @@
+"""Repositorio de saga log con escritura diferida (write-behind) por lotes."""
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from ...config.settings import SAGA_LOG_COLA_MAX, SAGA_LOG_FLUSH_MS, SAGA_LOG_LOTE_MAX
+from ...dominio.entidades.saga_log import SagaLog, EstadoEvento
+from .saga_log_repository import SagaLogRepository
+
+logger = logging.getLogger(__name__)
+
+_FIN = object()
+# Pide al escritor que escriba el lote en curso sin esperar el intervalo
+_AHORA = object()
+
+
+class SagaLogRepositoryWriteBehind:
+    """
+    Envuelve un SagaLogRepository y difiere las inserciones de saga_logs.
+
+    ``agregar`` solo encola el log; un hilo de fondo lo escribe junto con otros en
+    un INSERT multi-fila cada ``lote_max`` filas o cada ``flush_ms`` milisegundos,
+    lo que ocurra primero. La cola es acotada: si se llena, ``agregar`` bloquea al
+    productor (backpressure) en lugar de crecer sin límite. ``cerrar`` vacía la
+    cola antes de terminar y se registra también en ``atexit``.
+
+    Cada log encolado recibe un número de secuencia y el escritor publica el último
+    escrito. Una lectura espera solo a los logs encolados antes de ella, y una
+    transición solo al INSERT de su propio log, si aún está en cola; ninguna espera a
+    que la cola quede vacía.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[SagaLogRepository] = None,
+        lote_max: int = SAGA_LOG_LOTE_MAX,
+        flush_ms: int = SAGA_LOG_FLUSH_MS,
+        cola_max: int = SAGA_LOG_COLA_MAX,
+    ):
+        self._repository = repository or SagaLogRepository()
+        self._lote_max = lote_max
+        self._flush_segundos = flush_ms / 1000.0
+        self._cola: queue.Queue = queue.Queue(maxsize=cola_max)
+        self._cerrado = False
+        # Asigna la secuencia y encola en el mismo orden; también serializa agregar y cerrar
+        self._lock = threading.Lock()
+        self._encolados = 0
+        self._escritos = 0
+        self._en_cola: Dict[str, int] = {}
+        self._escrito = threading.Condition()
+        self._escritor = threading.Thread(target=self._ejecutar, name="saga-log-write-behind", daemon=True)
+        self._escritor.start()
+        atexit.register(self.cerrar)
+
+    def agregar(self, saga_log: SagaLog) -> None:
+        """Encola el log para su escritura diferida."""
+        with self._lock:
+            if not self._cerrado:
+                self._encolados += 1
+                self._en_cola[saga_log.id] = self._encolados
+                self._cola.put((self._encolados, saga_log))
+                return
+        # Tras cerrar ya no hay escritor: se escribe directo
+        self._repository.agregar(saga_log)
+
+    def obtener_por_id(self, log_id: str) -> Optional[SagaLog]:
+        self.vaciar()
+        return self._repository.obtener_por_id(log_id)
+
+    def obtener_por_saga_id(self, saga_id: str) -> List[SagaLog]:
+        self.vaciar()
+        return self._repository.obtener_por_saga_id(saga_id)
+
+    def obtener_por_partner_id(self, partner_id: str, *args, **kwargs) -> List[SagaLog]:
+        self.vaciar()
+        return self._repository.obtener_por_partner_id(partner_id, *args, **kwargs)
+
+    def obtener_por_contrato_id(self, contrato_id: str, *args, **kwargs) -> List[SagaLog]:
+        self.vaciar()
+        return self._repository.obtener_por_contrato_id(contrato_id, *args, **kwargs)
+
+    def obtener_por_estado(self, estado: EstadoEvento, *args, **kwargs) -> List[SagaLog]:
+        self.vaciar()
+        return self._repository.obtener_por_estado(estado, *args, **kwargs)
+
+    def actualizar(self, saga_log: SagaLog) -> None:
+        # El INSERT del log puede estar aún en cola
+        self._esperar_log(saga_log.id)
+        self._repository.actualizar(saga_log)
+
+    def transicionar(
+        self, log_id: str, estado: EstadoEvento, mensaje_error: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Optional[SagaLog]:
+        self._esperar_log(log_id)
+        return self._repository.transicionar(log_id, estado, mensaje_error, timestamp)
+
+    def obtener_eventos_pendientes(self, *args, **kwargs) -> List[SagaLog]:
+        self.vaciar()
+        return self._repository.obtener_eventos_pendientes(*args, **kwargs)
+
+    def obtener_historial_saga(self, saga_id: str, *args, **kwargs) -> List[SagaLog]:
+        self.vaciar()
+        return self._repository.obtener_historial_saga(saga_id, *args, **kwargs)
+
+    def vaciar(self, timeout: Optional[float] = None) -> bool:
+        """
+        Bloquea hasta que estén escritos los logs encolados antes de la llamada (no los
+        que lleguen después); retorna False si vence ``timeout``.
+        """
+        return self._esperar_secuencia(self._encolados, timeout)
+
+    def _esperar_log(self, log_id: str, timeout: Optional[float] = None) -> bool:
+        """Espera el INSERT de un log solo si sigue en cola."""
+        with self._lock:
+            secuencia = self._en_cola.get(log_id)
+        if secuencia is None:
+            return True
+        return self._esperar_secuencia(secuencia, timeout)
+
+    def _esperar_secuencia(self, secuencia: int, timeout: Optional[float] = None) -> bool:
+        if self._escritos >= secuencia:
+            return True
+        try:
+            # El escritor cierra el lote en curso en lugar de esperar el intervalo
+            self._cola.put_nowait(_AHORA)
+        except queue.Full:
+            pass  # Con la cola llena los lotes ya salen completos
+        with self._escrito:
+            return self._escrito.wait_for(
+                lambda: self._escritos >= secuencia or not self._escritor.is_alive(), timeout
+            )
+
+    def cerrar(self, timeout: float = 10.0) -> None:
+        """Detiene el hilo escritor tras persistir lo que quede en la cola."""
+        with self._lock:
+            if self._cerrado:
+                return
+            # Bajo el lock: ningún agregar queda encolado después de _FIN
+            self._cerrado = True
+            self._cola.put(_FIN)
+        self._escritor.join(timeout)
+        if self._escritor.is_alive():
+            logger.warning(f"⚠️ Saga log write-behind no terminó en {timeout}s; quedan {self._cola.qsize()} logs en cola")
+        else:
+            logger.info("📝 Saga log write-behind cerrado, cola vaciada")
+
+    def _ejecutar(self) -> None:
+        terminar = False
+        while not terminar:
+            lote: List[tuple] = []
+            elemento = self._cola.get()
+            if elemento is _FIN:
+                terminar = True
+            elif elemento is not _AHORA:
+                lote.append(elemento)
+
+            limite = time.monotonic() + self._flush_segundos
+            while lote and not terminar and elemento is not _AHORA and len(lote) < self._lote_max:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    elemento = self._cola.get(timeout=restante)
+                except queue.Empty:
+                    break
+                if elemento is _FIN:
+                    terminar = True
+                elif elemento is not _AHORA:
+                    lote.append(elemento)
+
+            # Al cerrar se drena lo que quede sin esperar el intervalo
+            while terminar:
+                try:
+                    elemento = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if elemento is not _FIN and elemento is not _AHORA:
+                    lote.append(elemento)
+
+            if not lote:
+                continue
+            try:
+                self._escribir([saga_log for _, saga_log in lote])
+            finally:
+                # Escrito o descartado tras reintentar uno a uno: quien espera puede seguir
+                with self._lock:
+                    for _, saga_log in lote:
+                        self._en_cola.pop(saga_log.id, None)
+                with self._escrito:
+                    self._escritos = lote[-1][0]
+                    self._escrito.notify_all()
+
+    def _escribir(self, lote: List[SagaLog]) -> None:
+        if not lote:
+            return
+        try:
+            self._repository.agregar_lote(lote)
+            logger.debug(f"📝 {len(lote)} saga logs escritos en lote")
+        except Exception as e:
+            # Aislar las filas problemáticas para no perder el lote completo
+            logger.warning(f"⚠️ Falló la inserción por lote de {len(lote)} saga logs, reintentando uno a uno: {e}")
+            perdidos = 0
+            for saga_log in lote:
+                try:
+                    self._repository.agregar(saga_log)
+                except Exception as error:
+                    perdidos += 1
+                    logger.error(f"❌ No se pudo persistir saga log {saga_log.id} ({saga_log.tipo_evento}): {error}")
+            if perdidos:
+                logger.error(f"❌ {perdidos} de {len(lote)} saga logs no pudieron persistirse")
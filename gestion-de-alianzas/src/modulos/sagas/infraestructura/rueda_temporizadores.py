@@ -0,0 +1,95 @@
+"""
+Rueda de temporizadores (hashed timing wheel) para vencimientos de sagas
+"""
+import logging
+import threading
+import time
+from typing import Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class RuedaTemporizadores:
+    """
+    Temporizadores por clave con programación y cancelación O(1).
+
+    La rueda tiene ``ranuras`` posiciones de ``resolucion_segundos`` cada una; un
+    retardo mayor que una vuelta completa se guarda con el número de vueltas que
+    faltan. Programar una clave que ya tiene temporizador lo reemplaza. Las acciones
+    vencidas se ejecutan en el hilo de la rueda.
+    """
+
+    def __init__(self, resolucion_segundos: float = 1.0, ranuras: int = 3600, nombre: str = 'rueda'):
+        if resolucion_segundos <= 0 or ranuras <= 0:
+            raise ValueError("resolucion_segundos y ranuras deben ser mayores que cero")
+        self.resolucion_segundos = resolucion_segundos
+        self.nombre = nombre
+        self._ranuras: list[dict] = [{} for _ in range(ranuras)]
+        self._ubicacion: dict = {}
+        self._actual = 0
+        self._lock = threading.Lock()
+        self._detenida = threading.Event()
+        self._hilo = None
+
+    def programar(self, clave: Hashable, retardo_segundos: float, accion: Callable[[], None]) -> None:
+        """Ejecuta ``accion`` tras ``retardo_segundos``, reemplazando el temporizador previo de la clave."""
+        ticks = max(1, int(-(-retardo_segundos // self.resolucion_segundos)))
+        vueltas, desplazamiento = divmod(ticks, len(self._ranuras))
+        if desplazamiento == 0:
+            vueltas, desplazamiento = vueltas - 1, len(self._ranuras)
+        with self._lock:
+            self._quitar(clave)
+            indice = (self._actual + desplazamiento) % len(self._ranuras)
+            self._ranuras[indice][clave] = [vueltas, accion]
+            self._ubicacion[clave] = indice
+
+    def cancelar(self, clave: Hashable) -> None:
+        with self._lock:
+            self._quitar(clave)
+
+    def __len__(self) -> int:
+        return len(self._ubicacion)
+
+    def avanzar(self) -> int:
+        """Avanza un tick y ejecuta las acciones vencidas; retorna cuántas se ejecutaron."""
+        vencidas = []
+        with self._lock:
+            self._actual = (self._actual + 1) % len(self._ranuras)
+            ranura = self._ranuras[self._actual]
+            for clave, entrada in list(ranura.items()):
+                if entrada[0] > 0:
+                    entrada[0] -= 1
+                else:
+                    del ranura[clave]
+                    del self._ubicacion[clave]
+                    vencidas.append((clave, entrada[1]))
+
+        for clave, accion in vencidas:
+            try:
+                accion()
+            except Exception as e:
+                logger.error(f"❌ Error ejecutando temporizador {self.nombre} para {clave}: {e}")
+        return len(vencidas)
+
+    def iniciar(self) -> None:
+        """Arranca el hilo que avanza la rueda cada ``resolucion_segundos``."""
+        if self._hilo is not None:
+            return
+        self._hilo = threading.Thread(target=self._ejecutar, name=self.nombre, daemon=True)
+        self._hilo.start()
+
+    def detener(self) -> None:
+        self._detenida.set()
+        if self._hilo is not None:
+            self._hilo.join(self.resolucion_segundos * 2)
+
+    def _ejecutar(self) -> None:
+        siguiente = time.monotonic() + self.resolucion_segundos
+        while not self._detenida.wait(max(0.0, siguiente - time.monotonic())):
+            self.avanzar()
+            siguiente += self.resolucion_segundos
+
+    def _quitar(self, clave: Hashable) -> None:
+        indice = self._ubicacion.pop(clave, None)
+        if indice is not None:
+            self._ranuras[indice].pop(clave, None)
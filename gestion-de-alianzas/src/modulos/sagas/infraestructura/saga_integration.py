@@ -10,6 +10,7 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
 
 from src.modulos.sagas.infraestructura.pulsar_saga_listener import PulsarSagaChoreographyListener
+from src.modulos.sagas.infraestructura.particiones_saga_logs import MantenimientoParticionesSagaLogs
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +23,7 @@ class SagaIntegration:
     def __init__(self):
         self.saga_listener = None
         self.saga_thread = None
+        self.mantenimiento_particiones = None
     
     def start_saga_listener(self):
         """
@@ -29,6 +31,10 @@ class SagaIntegration:
         """
         try:
             logger.info("🎭 Iniciando saga listener...")
+
+            # Particiones de saga_logs del mes actual y siguientes, y retención de las vencidas
+            self.mantenimiento_particiones = MantenimientoParticionesSagaLogs()
+            self.mantenimiento_particiones.iniciar()
             
             def run_saga_listener():
                 try:
@@ -54,6 +60,8 @@ class SagaIntegration:
         if self.saga_listener:
             self.saga_listener.close()
             logger.info("🎭 Saga listener cerrado")
+        if self.mantenimiento_particiones:
+            self.mantenimiento_particiones.detener()
 
 
 # Instancia global
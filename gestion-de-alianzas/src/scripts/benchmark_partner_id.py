@@ -0,0 +1,133 @@
+# scripts/benchmark_partner_id.py
+"""
+Microbenchmark de la extracción de partner_id de mensajes PartnerCreado.
+
+Compara el costo por mensaje de la implementación anterior del listener (regex
+compilado en cada llamada, limpieza carácter a carácter, json.loads con excepción)
+contra modulos.sagas.infraestructura.partner_id sobre un corpus de payloads JSON,
+strings Avro con prefijo de longitud y contenido malformado. Antes de medir
+verifica que ambas versiones extraigan el mismo partner_id.
+
+Uso (desde gestion-de-alianzas/):
+    python -m src.scripts.benchmark_partner_id --repeticiones 20000
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import timeit
+import uuid
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(current_dir)
+sys.path.insert(0, src_dir)
+
+from modulos.sagas.infraestructura.partner_id import extraer_partner_id
+
+logger = logging.getLogger(__name__)
+
+
+def _is_valid_partner_id_anterior(partner_id: str) -> bool:
+    import re
+
+    uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+    if re.match(uuid_pattern, partner_id, re.IGNORECASE):
+        return True
+    if len(partner_id) < 50 and partner_id.replace('-', '').replace('_', '').isalnum():
+        return True
+    if any(char in partner_id for char in ['@', '+', ',', ' ']):
+        return False
+    return True
+
+
+def _extract_uuid_anterior(content: str) -> str:
+    import re
+
+    uuid_pattern = r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+    match = re.search(uuid_pattern, content, re.IGNORECASE)
+    if match:
+        return match.group(0)
+    return None
+
+
+def extraer_partner_id_anterior(content: str, content_type: str = "unknown") -> str:
+    """Implementación previa de PulsarSagaChoreographyListener._extract_partner_id_from_content"""
+    try:
+        data = json.loads(content)
+        partner_id = data.get("partner_id")
+        if partner_id and isinstance(partner_id, str):
+            if _is_valid_partner_id_anterior(partner_id):
+                return partner_id
+            extracted_id = _extract_uuid_anterior(partner_id)
+            if extracted_id:
+                logger.warning(f"⚠️ Extracted UUID from malformed partner_id: {extracted_id}")
+                return extracted_id
+        partner_id = str(data)
+    except json.JSONDecodeError:
+        clean_content = ''.join(char for char in content if char.isprintable())
+        logger.info(f'📥 Cleaned {content_type} content: {clean_content[:100]}...')
+        if clean_content and clean_content[0] == 'H':
+            partner_id = clean_content[1:]
+            logger.info(f'📥 Extracted partner_id from prefixed message: {partner_id[:50]}...')
+        else:
+            partner_id = clean_content
+            logger.info(f'📥 Using content as partner_id: {partner_id[:50]}...')
+
+    if not partner_id:
+        raise ValueError(f"No se pudo extraer partner_id del mensaje: {content[:100]}...")
+
+    if len(partner_id) > 200:
+        logger.warning(f"⚠️ Partner ID muy largo ({len(partner_id)} chars), posiblemente malformado")
+        extracted_id = _extract_uuid_anterior(partner_id)
+        if extracted_id:
+            return extracted_id
+        partner_id = partner_id[:50]
+    return partner_id
+
+
+def construir_corpus() -> dict[str, str]:
+    partner_id = str(uuid.uuid4())
+    formulario = f"nombre=Acme S.A., email=contacto@acme.com, telefono=+57 300 000 0000, id={partner_id}"
+    return {
+        'json-uuid': json.dumps({"partner_id": partner_id, "evento": "PartnerCreado"}),
+        'json-id-corto': json.dumps({"partner_id": "partner_123"}),
+        'json-formulario': json.dumps({"partner_id": formulario}),
+        'avro-uuid': 'H' + partner_id,
+        'avro-con-control': '\x00\x02H' + partner_id,
+        'texto-uuid': partner_id,
+        'texto-largo': ('x' * 250) + partner_id + ('y' * 50),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=20000)
+    args = parser.parse_args()
+
+    # Sin salida de logs; con INFO habilitado la versión anterior paga además sus logs por mensaje
+    logging.basicConfig(level=logging.ERROR)
+
+    corpus = construir_corpus()
+    for nombre, payload in corpus.items():
+        anterior = extraer_partner_id_anterior(payload)
+        nuevo = extraer_partner_id(payload)
+        if anterior != nuevo:
+            raise SystemExit(f"❌ Resultado distinto para {nombre}: {anterior!r} != {nuevo!r}")
+
+    print(f"{'payload':<18} {'antes (µs)':>12} {'después (µs)':>14} {'mejora':>8}")
+    total_antes = total_despues = 0.0
+    for nombre, payload in corpus.items():
+        antes = timeit.timeit(lambda: extraer_partner_id_anterior(payload), number=args.repeticiones)
+        despues = timeit.timeit(lambda: extraer_partner_id(payload), number=args.repeticiones)
+        total_antes += antes
+        total_despues += despues
+        print(f"{nombre:<18} {antes / args.repeticiones * 1e6:>12.2f} "
+              f"{despues / args.repeticiones * 1e6:>14.2f} {antes / despues:>7.1f}x")
+
+    print(f"{'total':<18} {total_antes / args.repeticiones * 1e6:>12.2f} "
+          f"{total_despues / args.repeticiones * 1e6:>14.2f} {total_antes / total_despues:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -56,6 +56,12 @@ async def main():
         await conn.run_sync(Base.metadata.create_all)
         print("✅ Tables created successfully!")
 
+        if 'saga_logs' in Base.metadata.tables:
+            from datetime import date
+            from modulos.sagas.infraestructura.particiones_saga_logs import crear_particiones
+            particiones = await conn.run_sync(lambda sync_conn: crear_particiones(sync_conn, date.today()))
+            print(f"✅ saga_logs partitions created: {particiones}")
+
 if __name__ == "__main__":
     try:
         asyncio.run(main())
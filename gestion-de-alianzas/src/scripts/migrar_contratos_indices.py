@@ -0,0 +1,75 @@
+# scripts/migrar_contratos_indices.py
+"""
+Crea los índices compuestos de la paginación de contratos y el índice único de
+partner_id (creación idempotente desde PartnerCreado) en una tabla contratos
+existente, y elimina el índice simple de partner_id que reemplazan.
+
+create_tables.py no modifica tablas ya creadas. Este script construye cada índice
+declarado en ContratoRow con CREATE INDEX CONCURRENTLY (sin bloquear escrituras),
+descarta los inválidos que haya dejado una ejecución interrumpida y borra
+ix_contratos_partner_id con DROP INDEX CONCURRENTLY. Es idempotente.
+
+Si hay partners con más de un contrato (reentregas anteriores al índice único), el
+script los lista y se detiene antes de crear índices: hay que depurarlos primero.
+
+Uso (desde gestion-de-alianzas/):
+    DATABASE_URL=postgresql+asyncpg://... python -m src.scripts.migrar_contratos_indices
+"""
+import asyncio
+
+from sqlalchemy import text
+
+from src.modulos.alianzas.infrastructure.db import engine
+from src.modulos.alianzas.infrastructure.models import ContratoRow
+
+# Nombre que SQLAlchemy le dio al índice de partner_id (index=True)
+INDICE_ANTERIOR = 'ix_contratos_partner_id'
+
+
+async def _descartar_indice_invalido(conn, nombre: str) -> None:
+    invalido = (await conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_index x JOIN pg_class c ON c.oid = x.indexrelid "
+        "WHERE c.relname = :nombre AND NOT x.indisvalid)"
+    ), {'nombre': nombre})).scalar()
+    if invalido:
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}"))
+        print(f"🧹 {nombre} inválido descartado")
+
+
+async def _duplicados(conn, tabla: str, columnas: str) -> list:
+    return (await conn.execute(text(
+        f"SELECT {columnas}, count(*) FROM {tabla} GROUP BY {columnas} HAVING count(*) > 1 LIMIT 20"
+    ))).all()
+
+
+async def main():
+    tabla = ContratoRow.__table__
+    async with engine.connect() as conn:
+        # CREATE/DROP INDEX CONCURRENTLY no pueden ejecutarse dentro de una transacción
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for indice in (i for i in tabla.indexes if i.unique):
+            columnas = ', '.join(columna.name for columna in indice.columns)
+            duplicados = await _duplicados(conn, tabla.name, columnas)
+            if duplicados:
+                print(f"❌ {indice.name}: hay valores repetidos de ({columnas}), depúralos antes de migrar:")
+                for fila in duplicados:
+                    print(f"   {tuple(fila)}")
+                await engine.dispose()
+                raise SystemExit(1)
+
+        for indice in sorted(tabla.indexes, key=lambda i: i.name):
+            columnas = ', '.join(columna.name for columna in indice.columns)
+            unico = 'UNIQUE ' if indice.unique else ''
+            await _descartar_indice_invalido(conn, indice.name)
+            await conn.execute(text(
+                f"CREATE {unico}INDEX CONCURRENTLY IF NOT EXISTS {indice.name} ON {tabla.name} ({columnas})"
+            ))
+            print(f"✅ {indice.name} ({columnas})")
+
+        await conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {INDICE_ANTERIOR}"))
+        print(f"✅ {INDICE_ANTERIOR} eliminado")
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+# scripts/migrar_saga_logs_correlacion.py
+"""
+Agrega las columnas partner_id y contrato_id a una tabla saga_logs existente.
+
+create_tables.py solo crea tablas nuevas. Este script agrega las columnas, las
+completa desde evento_data por lotes (para no bloquear la tabla con un único
+UPDATE gigante) y crea los índices con CREATE INDEX CONCURRENTLY; si saga_logs está
+particionada, los construye partición por partición y los adjunta al índice de la
+tabla padre. Es idempotente.
+
+Uso (desde gestion-de-alianzas/):
+    DATABASE_URL_SYNC=postgresql://... python -m src.scripts.migrar_saga_logs_correlacion --lote 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(current_dir)
+sys.path.insert(0, src_dir)
+
+from sqlalchemy import text
+
+from modulos.sagas.config.db import engine
+from modulos.sagas.infraestructura.particiones_saga_logs import crear_indice_concurrente
+
+COLUMNAS = [
+    "ALTER TABLE saga_logs ADD COLUMN IF NOT EXISTS partner_id VARCHAR(200)",
+    "ALTER TABLE saga_logs ADD COLUMN IF NOT EXISTS contrato_id VARCHAR(200)",
+]
+
+# Solo se interpreta evento_data que parece un objeto JSON; el resto queda en NULL
+COMPLETAR_LOTE = text("""
+    WITH lote AS (
+        SELECT id, timestamp FROM saga_logs
+        WHERE partner_id IS NULL AND contrato_id IS NULL
+          AND id > :desde AND evento_data ~ '^\\s*\\{.*\\}\\s*$'
+        ORDER BY id
+        LIMIT :lote
+    )
+    UPDATE saga_logs s
+    SET partner_id = NULLIF(s.evento_data::jsonb ->> 'partner_id', ''),
+        contrato_id = NULLIF(s.evento_data::jsonb ->> 'contrato_id', '')
+    FROM lote
+    WHERE s.id = lote.id AND s.timestamp = lote.timestamp
+    RETURNING s.id
+""")
+
+INDICES = [
+    ('idx_saga_logs_partner_id_timestamp', ['partner_id', 'timestamp']),
+    ('idx_saga_logs_contrato_id_timestamp', ['contrato_id', 'timestamp']),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lote', type=int, default=5000)
+    args = parser.parse_args()
+
+    with engine.begin() as conn:
+        for sentencia in COLUMNAS:
+            conn.execute(text(sentencia))
+    print("✅ Columnas partner_id y contrato_id disponibles")
+
+    desde = '00000000-0000-0000-0000-000000000000'
+    total = 0
+    inicio = time.perf_counter()
+    while True:
+        with engine.begin() as conn:
+            ids = [str(fila[0]) for fila in conn.execute(COMPLETAR_LOTE, {'desde': desde, 'lote': args.lote})]
+        if not ids:
+            break
+        total += len(ids)
+        desde = max(ids)
+        print(f"   {total} filas completadas...")
+    print(f"✅ {total} filas completadas en {time.perf_counter() - inicio:.1f}s")
+
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for nombre, columnas in INDICES:
+            crear_indice_concurrente(conn, nombre, columnas)
+    print("✅ Índices de correlación creados")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+# scripts/migrar_saga_logs_indice_estado.py
+"""
+Redefine idx_saga_logs_estado de (estado) a (estado, timestamp) en una tabla
+saga_logs existente.
+
+create_tables.py no modifica índices ya creados. Este script construye el índice
+nuevo con CREATE INDEX CONCURRENTLY (partición por partición si saga_logs está
+particionada), elimina el anterior y renombra el nuevo. Es idempotente.
+
+Uso (desde gestion-de-alianzas/):
+    DATABASE_URL_SYNC=postgresql://... python -m src.scripts.migrar_saga_logs_indice_estado
+"""
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(current_dir)
+sys.path.insert(0, src_dir)
+
+from sqlalchemy import text
+
+from modulos.sagas.config.db import engine
+from modulos.sagas.infraestructura.particiones_saga_logs import (
+    columnas_indice, crear_indice_concurrente, es_particionada
+)
+
+INDICE = 'idx_saga_logs_estado'
+NUEVO = 'idx_saga_logs_estado_timestamp'
+COLUMNAS = ['estado', 'timestamp']
+
+
+def main():
+    # CREATE/DROP INDEX CONCURRENTLY no pueden ejecutarse dentro de una transacción
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if columnas_indice(conn, INDICE) == COLUMNAS:
+            print(f"✅ {INDICE} ya cubre ({', '.join(COLUMNAS)})")
+            return
+
+        crear_indice_concurrente(conn, NUEVO, COLUMNAS)
+        print(f"✅ {NUEVO} creado")
+
+        # En una tabla particionada el índice padre no admite DROP CONCURRENTLY
+        concurrente = '' if es_particionada(conn) else ' CONCURRENTLY'
+        conn.execute(text(f"DROP INDEX{concurrente} IF EXISTS {INDICE}"))
+        conn.execute(text(f"ALTER INDEX {NUEVO} RENAME TO {INDICE}"))
+    print(f"✅ {INDICE} redefinido como ({', '.join(COLUMNAS)})")
+
+
+if __name__ == '__main__':
+    main()
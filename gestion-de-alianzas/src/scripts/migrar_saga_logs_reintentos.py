@@ -0,0 +1,31 @@
+# scripts/migrar_saga_logs_reintentos.py
+"""
+Agrega la columna proximo_intento (lease y backoff de los reintentos) a una tabla
+saga_logs existente.
+
+create_tables.py solo crea tablas nuevas. Una columna nullable sin default solo
+cambia el catálogo (no reescribe la tabla ni sus particiones). Es idempotente.
+
+Uso (desde gestion-de-alianzas/):
+    DATABASE_URL_SYNC=postgresql://... python -m src.scripts.migrar_saga_logs_reintentos
+"""
+import os
+import sys
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(current_dir)
+sys.path.insert(0, src_dir)
+
+from sqlalchemy import text
+
+from modulos.sagas.config.db import engine
+
+
+def main():
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE saga_logs ADD COLUMN IF NOT EXISTS proximo_intento TIMESTAMP"))
+    print("✅ Columna proximo_intento disponible")
+
+
+if __name__ == '__main__':
+    main()
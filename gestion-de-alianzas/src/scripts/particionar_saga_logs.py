@@ -0,0 +1,82 @@
+# scripts/particionar_saga_logs.py
+"""
+Convierte una tabla saga_logs existente (sin particionar) en la tabla particionada
+por mes.
+
+Renombra la tabla actual a saga_logs_sin_particionar junto con sus índices y
+restricciones, crea saga_logs particionada con las particiones de todos los meses
+presentes más las futuras, y copia las filas mes a mes. La tabla original se
+conserva para verificarla y eliminarla manualmente.
+
+Uso (desde gestion-de-alianzas/):
+    DATABASE_URL_SYNC=postgresql://... python -m src.scripts.particionar_saga_logs
+"""
+import os
+import sys
+from datetime import date
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(current_dir)
+sys.path.insert(0, src_dir)
+
+from sqlalchemy import text
+
+from modulos.sagas.config.db import engine
+from modulos.sagas.infraestructura.dto import SagaLog as SagaLogDTO
+from modulos.sagas.infraestructura.particiones_saga_logs import (
+    TABLA, crear_particiones, primer_dia_del_mes
+)
+
+ANTERIOR = f'{TABLA}_sin_particionar'
+
+
+def main():
+    with engine.begin() as conn:
+        particionada = conn.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = :tabla)"
+        ), {'tabla': TABLA}).scalar()
+        if particionada:
+            print(f"✅ {TABLA} ya está particionada")
+            return
+
+        # Los nombres de índices y restricciones son únicos por esquema: se liberan para la nueva tabla
+        conn.execute(text(f"ALTER TABLE {TABLA} RENAME TO {ANTERIOR}"))
+        for (restriccion,) in conn.execute(text(
+            "SELECT conname FROM pg_constraint WHERE conrelid = CAST(:tabla AS regclass)"
+        ), {'tabla': ANTERIOR}).all():
+            conn.execute(text(f'ALTER TABLE {ANTERIOR} RENAME CONSTRAINT "{restriccion}" TO "{restriccion}_sin_particionar"'))
+        for (indice,) in conn.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE tablename = :tabla"
+        ), {'tabla': ANTERIOR}).all():
+            conn.execute(text(f'ALTER INDEX "{indice}" RENAME TO "{indice}_sin_particionar"'))
+
+        SagaLogDTO.__table__.create(conn)
+
+        desde = conn.execute(text(f"SELECT min(timestamp) FROM {ANTERIOR}")).scalar()
+        hoy = date.today()
+        inicio = primer_dia_del_mes(desde.date()) if desde else primer_dia_del_mes(hoy)
+        meses = (hoy.year - inicio.year) * 12 + (hoy.month - inicio.month)
+        # crear_particiones parte del mes dado; se cubren desde el más antiguo hasta los futuros
+        particiones = crear_particiones(conn, inicio, meses + 3)
+        print(f"✅ {len(particiones)} particiones creadas")
+
+        columnas = ', '.join(columna.name for columna in SagaLogDTO.__table__.columns)
+        for mes in range(meses + 1):
+            a = primer_dia_del_mes(inicio, mes)
+            b = primer_dia_del_mes(a, 1)
+            copiadas = conn.execute(text(
+                f"INSERT INTO {TABLA} ({columnas}) SELECT {columnas} FROM {ANTERIOR} "
+                f"WHERE timestamp >= :a AND timestamp < :b"
+            ), {'a': a, 'b': b}).rowcount
+            print(f"   {a:%Y-%m}: {copiadas} filas")
+        posteriores = conn.execute(text(
+            f"INSERT INTO {TABLA} ({columnas}) SELECT {columnas} FROM {ANTERIOR} WHERE timestamp >= :b"
+        ), {'b': primer_dia_del_mes(hoy, 1)}).rowcount
+        print(f"   posteriores a {hoy:%Y-%m}: {posteriores} filas")
+
+    print(f"✅ {TABLA} particionada; {ANTERIOR} se conserva para verificación")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+# scripts/replay_saga_logs.py
+"""
+Reconstruye saga_estados a partir del historial en saga_logs.
+
+Lee saga_logs en orden de (partner_id, timestamp) con un cursor de servidor, aplica
+las reglas de coreografía de CoordinadorPartnersCoreografico un partner a la vez y
+escribe el estado de cada saga con upserts por lotes, en memoria constante. Útil tras una pérdida de saga_estados o para verificarla.
+
+Uso (desde gestion-de-alianzas/):
+    DATABASE_URL_SYNC=postgresql://... python -m src.scripts.replay_saga_logs --lote 5000
+    DATABASE_URL_SYNC=postgresql://... python -m src.scripts.replay_saga_logs --desde 2025-01-01T00:00:00
+"""
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(current_dir)
+sys.path.insert(0, src_dir)
+
+from modulos.sagas.aplicacion.coordinadores.saga_partners import CoordinadorPartnersCoreografico
+from modulos.sagas.infraestructura.replay_saga_logs import reconstruir_estado_sagas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lote', type=int, default=5000, help='Filas por lectura del cursor y sagas por upsert')
+    parser.add_argument('--desde', type=datetime.fromisoformat, default=None,
+                        help='Solo logs desde este instante (las sagas iniciadas antes se ignoran)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    coordinador = CoordinadorPartnersCoreografico()
+    try:
+        estadisticas = reconstruir_estado_sagas(
+            coordinador, coordinador.estado_saga, desde=args.desde, lote=args.lote
+        )
+    finally:
+        coordinador.cerrar()
+
+    print(f"✅ {estadisticas['filas']} filas leídas ({estadisticas['descartadas']} descartadas), "
+          f"{estadisticas['sagas']} sagas escritas en {estadisticas['segundos']}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# scripts/stress_saga_log_repository.py
+"""
+Prueba de carga de SagaLogRepository compartido entre los hilos del listener de saga.
+
+Lanza un hilo por cada tópico que escucha PulsarSagaChoreographyListener, todos
+escribiendo con la misma instancia del repositorio, y verifica que no se pierdan
+escrituras. Se repite para varios tamaños de pool para comparar el throughput.
+
+Uso (desde gestion-de-alianzas/):
+    DATABASE_URL_SYNC=postgresql://... python -m src.scripts.stress_saga_log_repository --eventos 500 --pools 1,2,4,8
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.dirname(current_dir)
+sys.path.insert(0, src_dir)
+
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.orm import sessionmaker
+
+from modulos.sagas.config.db import DATABASE_URL
+from modulos.sagas.dominio.entidades.saga_log import SagaLog, EstadoEvento
+from modulos.sagas.infraestructura.dto import SagaLog as SagaLogDTO
+from modulos.sagas.infraestructura.repositorios.saga_log_repository import SagaLogRepository
+
+TOPICOS = [
+    'comando-crear-partner',
+    'PartnerCreado',
+    'ContratoCreado',
+    'contrato-aprobado',
+    'contrato-rechazado',
+    'revision-contrato',
+]
+
+
+def ejecutar_ronda(pool_size: int, eventos_por_topico: int) -> tuple[int, int, float]:
+    engine = create_engine(DATABASE_URL, pool_size=pool_size, max_overflow=0, pool_pre_ping=True)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    repository = SagaLogRepository(session_factory)
+
+    saga_ids = {topico: str(uuid.uuid4()) for topico in TOPICOS}
+    errores = []
+    barrera = threading.Barrier(len(TOPICOS))
+
+    def escribir(topico: str):
+        barrera.wait()
+        for i in range(eventos_por_topico):
+            try:
+                repository.agregar(SagaLog(
+                    saga_id=saga_ids[topico],
+                    tipo_evento=topico,
+                    evento_data=f'{{"secuencia": {i}}}',
+                    estado=EstadoEvento.RECIBIDO
+                ))
+            except Exception as e:
+                errores.append(e)
+
+    hilos = [threading.Thread(target=escribir, args=(topico,)) for topico in TOPICOS]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    with session_factory() as session:
+        filtro = SagaLogDTO.saga_id.in_(list(saga_ids.values()))
+        escritos = session.execute(select(func.count()).select_from(SagaLogDTO).where(filtro)).scalar_one()
+        session.execute(delete(SagaLogDTO).where(filtro))
+        session.commit()
+    engine.dispose()
+
+    if errores:
+        print(f"  ⚠️ {len(errores)} errores, primero: {errores[0]}")
+    return len(TOPICOS) * eventos_por_topico, escritos, duracion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--eventos', type=int, default=500, help='eventos por tópico')
+    parser.add_argument('--pools', default='1,2,4,8', help='tamaños de pool a comparar')
+    args = parser.parse_args()
+
+    perdidas = False
+    for pool_size in [int(p) for p in args.pools.split(',')]:
+        esperados, escritos, duracion = ejecutar_ronda(pool_size, args.eventos)
+        print(f"pool={pool_size:>3}  escritos={escritos}/{esperados}  {duracion:.2f}s  {escritos / duracion:,.0f} eventos/s")
+        perdidas = perdidas or escritos != esperados
+
+    if perdidas:
+        print("❌ Se perdieron escrituras")
+        sys.exit(1)
+    print("✅ Sin escrituras perdidas")
+
+
+if __name__ == "__main__":
+    main()
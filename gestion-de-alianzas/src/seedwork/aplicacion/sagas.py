@@ -18,7 +18,7 @@ class CoordinadorSaga(ABC):
         ...
 
     def publicar_comando(self,evento: EventoDominio, tipo_comando: type):
-        comando = construir_comando(evento, tipo_comando)
+        comando = self.construir_comando(evento, tipo_comando)
         ejecutar_commando(comando)
 
     @abstractmethod
@@ -63,28 +63,55 @@ class CoordinadorCoreografia(CoordinadorSaga, ABC):
     ...
 
 class CoordinadorOrquestacion(CoordinadorSaga, ABC):
+    """
+    Coordinador de orquestación a partir de una lista declarativa de pasos.
+
+    Las subclases definen ``pasos`` (Inicio, Transacciones, Fin) en
+    ``inicializar_pasos``; la primera vez que se procesa un evento se compila un
+    índice de tipo de evento a (paso, posición) para no recorrer la lista por evento.
+    """
     pasos: list[Paso]
     index: int
-    
-    def obtener_paso_dado_un_evento(self, evento: EventoDominio):
-        for i, paso in enumerate(pasos):
+
+    def compilar_pasos(self):
+        """Construye el índice tipo de evento -> (paso, posición) de la definición de pasos."""
+        pasos_por_evento = dict()
+        ultima_transaccion = None
+        for i, paso in enumerate(self.pasos):
             if not isinstance(paso, Transaccion):
                 continue
+            for tipo_evento in (paso.evento, paso.error):
+                if tipo_evento in pasos_por_evento:
+                    raise ValueError(f"El evento {tipo_evento.__name__} aparece en más de un paso de la saga")
+                pasos_por_evento[tipo_evento] = (paso, i)
+            ultima_transaccion = i
+        self._pasos_por_evento = pasos_por_evento
+        self._ultima_transaccion = ultima_transaccion
 
-            if isinstance(evento, paso.evento) or isinstance(evento, paso.error):
-                return paso, i
+    def obtener_paso_dado_un_evento(self, evento: EventoDominio):
+        if getattr(self, '_pasos_por_evento', None) is None:
+            self.compilar_pasos()
+
+        # Recorrer la MRO conserva la semántica de isinstance para subclases de eventos
+        for tipo in type(evento).__mro__:
+            paso = self._pasos_por_evento.get(tipo)
+            if paso is not None:
+                return paso
         raise Exception("Evento no hace parte de la transacción")
                 
     def es_ultima_transaccion(self, index):
-        return len(self.pasos) - 1
+        return index == self._ultima_transaccion
 
     def procesar_evento(self, evento: EventoDominio):
         paso, index = self.obtener_paso_dado_un_evento(evento)
-        if es_ultima_transaccion(index) and not isinstance(evento, paso.error):
+        if self.es_ultima_transaccion(index) and not isinstance(evento, paso.error):
             self.terminar()
         elif isinstance(evento, paso.error):
-            self.publicar_comando(evento, self.pasos[index-1].compensacion)
+            # Compensar el paso anterior; si no hay transacción previa la saga termina
+            anterior = self.pasos[index-1]
+            if isinstance(anterior, Transaccion):
+                self.publicar_comando(evento, anterior.compensacion)
+            else:
+                self.terminar()
         elif isinstance(evento, paso.evento):
-            self.publicar_comando(evento, self.pasos[index+1].compensacion)
-
-
+            self.publicar_comando(evento, self.pasos[index+1].comando)
@@ -0,0 +1,21 @@
+import os
+import sys
+
+# Igual que en el contenedor: el paquete se importa como 'src.' y el código de sagas como 'modulos.'
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for ruta in (RAIZ, os.path.join(RAIZ, 'src')):
+    if ruta not in sys.path:
+        sys.path.insert(0, ruta)
+
+
+class RelojFalso:
+    """Reloj manual para probar TTLs sin esperar"""
+
+    def __init__(self, ahora: float = 0.0):
+        self.ahora = ahora
+
+    def __call__(self) -> float:
+        return self.ahora
+
+    def avanzar(self, segundos: float) -> None:
+        self.ahora += segundos
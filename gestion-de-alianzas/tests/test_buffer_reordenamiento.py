@@ -0,0 +1,77 @@
+from conftest import RelojFalso
+from src.modulos.sagas.infraestructura.buffer_reordenamiento import BufferReordenamiento
+
+
+def test_extrae_en_orden_de_llegada_el_primero_aplicable():
+    buffer = BufferReordenamiento(max_claves=10, max_por_clave=10, ttl_segundos=60, reloj=RelojFalso())
+    for elemento in ('a1', 'b1', 'a2'):
+        assert buffer.estacionar('p1', elemento)
+
+    assert buffer.extraer('p1', lambda e: e.startswith('a')) == 'a1'
+    assert buffer.extraer('p1', lambda e: e.startswith('a')) == 'a2'
+    assert buffer.extraer('p1', lambda e: e.startswith('a')) is None
+    assert buffer.extraer('p1', lambda e: True) == 'b1'
+    assert len(buffer) == 0
+
+
+def test_respeta_capacidad_por_clave_y_de_claves():
+    buffer = BufferReordenamiento(max_claves=2, max_por_clave=2, ttl_segundos=60, reloj=RelojFalso())
+    assert buffer.estacionar('p1', 1)
+    assert buffer.estacionar('p1', 2)
+    assert not buffer.estacionar('p1', 3)
+    assert buffer.estacionar('p2', 1)
+    assert not buffer.estacionar('p3', 1)
+
+    buffer.extraer('p2', lambda e: True)
+    assert buffer.estacionar('p3', 1)
+
+
+def test_extraer_descarta_expirados_de_la_clave():
+    reloj = RelojFalso()
+    buffer = BufferReordenamiento(max_claves=10, max_por_clave=10, ttl_segundos=10, reloj=reloj)
+    buffer.estacionar('p1', 'viejo')
+    reloj.avanzar(5)
+    buffer.estacionar('p1', 'nuevo')
+    reloj.avanzar(6)
+
+    assert buffer.extraer('p1', lambda e: e == 'viejo') is None
+    assert len(buffer) == 1
+    assert buffer.extraer('p1', lambda e: True) == 'nuevo'
+
+
+def test_purga_expirados_de_cualquier_clave_y_libera_capacidad():
+    reloj = RelojFalso()
+    buffer = BufferReordenamiento(max_claves=2, max_por_clave=10, ttl_segundos=10, reloj=reloj)
+    buffer.estacionar('antigua', 'a1')
+    reloj.avanzar(1)
+    buffer.estacionar('reciente', 'expira')
+    reloj.avanzar(4)
+    # La clave más antigua conserva un evento vigente: la purga no puede detenerse en ella
+    buffer.estacionar('antigua', 'a2')
+    reloj.avanzar(6.5)
+
+    assert buffer.estacionar('nueva', 'x')
+    assert len(buffer) == 2
+    assert buffer.extraer('reciente', lambda e: True) is None
+    assert buffer.extraer('antigua', lambda e: True) == 'a2'
+
+
+def test_entrega_los_descartados_por_vencimiento_o_al_vaciar():
+    reloj = RelojFalso()
+    descartados = []
+    buffer = BufferReordenamiento(max_claves=10, max_por_clave=10, ttl_segundos=10, reloj=reloj,
+                                  al_descartar=lambda clave, elemento: descartados.append((clave, elemento)))
+    buffer.estacionar('p1', 'viejo')
+    reloj.avanzar(5)
+    buffer.estacionar('p2', 'nuevo')
+    buffer.estacionar('p1', 'aplicado')
+    assert buffer.extraer('p1', lambda e: e == 'aplicado') == 'aplicado'
+    reloj.avanzar(6)
+
+    # Sin más llegadas, la purga periódica devuelve el vencido
+    assert buffer.purgar() == 1
+    assert descartados == [('p1', 'viejo')]
+
+    assert buffer.vaciar() == 1
+    assert descartados == [('p1', 'viejo'), ('p2', 'nuevo')]
+    assert len(buffer) == 0
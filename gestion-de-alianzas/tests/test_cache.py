@@ -0,0 +1,39 @@
+import pytest
+
+from conftest import RelojFalso
+from src.modulos.sagas.infraestructura.cache import CacheLRU
+
+
+def test_desaloja_el_menos_usado_al_superar_el_tamano():
+    cache = CacheLRU(max_elementos=2, ttl_segundos=60, reloj=RelojFalso())
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    assert cache.obtener('a') == 1
+    cache.guardar('c', 3)
+
+    assert cache.obtener('b') is None
+    assert cache.obtener('a') == 1
+    assert cache.obtener('c') == 3
+    assert len(cache) == 2
+
+
+def test_las_entradas_expiran_y_guardar_reinicia_el_ttl():
+    reloj = RelojFalso()
+    cache = CacheLRU(max_elementos=10, ttl_segundos=10, reloj=reloj)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    reloj.avanzar(6)
+    cache.guardar('b', 3)
+    reloj.avanzar(6)
+
+    assert 'a' not in cache
+    assert cache.obtener('b') == 3
+
+
+def test_eliminar_y_tamano_invalido():
+    cache = CacheLRU(max_elementos=1, ttl_segundos=10, reloj=RelojFalso())
+    cache.guardar('a', 1)
+    cache.eliminar('a')
+    assert cache.obtener('a') is None
+    with pytest.raises(ValueError):
+        CacheLRU(max_elementos=0, ttl_segundos=10)
@@ -0,0 +1,60 @@
+import threading
+
+import pytest
+
+from src.modulos.sagas.infraestructura.ejecutor_por_clave import EjecutorPorClave
+
+
+def test_preserva_el_orden_por_clave():
+    ejecutor = EjecutorPorClave(workers=4, cola_max=1000, nombre='prueba')
+    resultados = {}
+
+    def registrar(clave, i):
+        resultados.setdefault(clave, []).append(i)
+
+    for i in range(200):
+        for clave in ('p1', 'p2', 'p3'):
+            ejecutor.enviar(clave, registrar, clave, i)
+    ejecutor.cerrar()
+
+    assert resultados == {clave: list(range(200)) for clave in ('p1', 'p2', 'p3')}
+    assert sum(m['procesadas'] for m in ejecutor.metricas()) == 600
+
+
+def test_la_misma_clave_siempre_va_a_la_misma_cola():
+    ejecutor = EjecutorPorClave(workers=8, cola_max=10)
+    assert ejecutor.indice('partner-1') == ejecutor.indice('partner-1')
+    assert 0 <= ejecutor.indice('partner-2') < 8
+    ejecutor.cerrar()
+
+
+def test_aplica_backpressure_con_la_cola_llena():
+    ejecutor = EjecutorPorClave(workers=1, cola_max=1)
+    liberar = threading.Event()
+    ejecutor.enviar('p', liberar.wait)
+    ejecutor.enviar('p', lambda: None)
+
+    productor = threading.Thread(target=ejecutor.enviar, args=('p', lambda: None))
+    productor.start()
+    productor.join(0.2)
+    assert productor.is_alive()
+
+    liberar.set()
+    productor.join(2)
+    assert not productor.is_alive()
+    ejecutor.cerrar()
+    assert ejecutor.metricas()[0]['bloqueos'] >= 1
+
+
+def test_un_error_no_detiene_al_worker():
+    ejecutor = EjecutorPorClave(workers=1, cola_max=10)
+    hechas = []
+    ejecutor.enviar('p', lambda: 1 / 0)
+    ejecutor.enviar('p', hechas.append, 'ok')
+    ejecutor.cerrar()
+    assert hechas == ['ok']
+
+
+def test_workers_invalidos():
+    with pytest.raises(ValueError):
+        EjecutorPorClave(workers=0, cola_max=1)
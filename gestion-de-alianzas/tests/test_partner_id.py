@@ -0,0 +1,114 @@
+import importlib.util
+import os
+import uuid
+
+import pytest
+
+from conftest import RAIZ
+from src.modulos.sagas.infraestructura.partner_id import (
+    extraer_correlacion_id, extraer_id_comando, extraer_partner_id, leer_partner_creado
+)
+
+REPO = os.path.dirname(RAIZ)
+
+PARTNER_ID = str(uuid.uuid4())
+CORRELACION_ID = str(uuid.uuid4())
+
+
+def _string_opcional(valor):
+    # Rama 1 de la unión null|string + longitud en varint zigzag (36 -> 'H')
+    return b'\x00' if valor is None else b'\x02' + bytes([len(valor) * 2]) + valor.encode()
+
+
+def _partner_creado(partner_id, correlacion_id=None, legado=False):
+    # Rama no nula de data + campos de PartnerCreadoPayload
+    payload = _string_opcional(partner_id)
+    if not legado:
+        payload += _string_opcional(correlacion_id)
+    return (b'\x02' + payload).decode('utf-8')
+
+
+def test_avro_con_correlacion_id():
+    contenido = _partner_creado(PARTNER_ID, CORRELACION_ID)
+
+    assert extraer_partner_id(contenido) == PARTNER_ID
+    assert extraer_correlacion_id(contenido) == CORRELACION_ID
+
+
+def test_avro_sin_correlacion_id():
+    contenido = _partner_creado(PARTNER_ID)
+
+    assert extraer_partner_id(contenido) == PARTNER_ID
+    assert extraer_correlacion_id(contenido) is None
+
+
+def test_avro_con_el_esquema_anterior_a_correlacion_id():
+    contenido = _partner_creado(PARTNER_ID, legado=True)
+
+    assert leer_partner_creado(contenido) == {'partner_id': PARTNER_ID, 'correlacion_id': None}
+    assert extraer_partner_id(contenido) == PARTNER_ID
+    assert extraer_correlacion_id(contenido) is None
+
+
+def test_json_y_texto_plano():
+    json_ = f'{{"partner_id": "{PARTNER_ID}", "correlacion_id": "{CORRELACION_ID}"}}'
+
+    assert extraer_partner_id(json_) == PARTNER_ID
+    assert extraer_correlacion_id(json_) == CORRELACION_ID
+    assert leer_partner_creado(PARTNER_ID) is None
+    assert extraer_partner_id(PARTNER_ID) == PARTNER_ID
+
+
+def _comando_crear_partner(nombre, correlacion_id):
+    campos = [nombre, 'ana@example.com', None, None, correlacion_id]
+    return (b'\x02' + b''.join(_string_opcional(campo) for campo in campos)).decode('utf-8')
+
+
+def test_id_del_comando_viaja_en_el_payload():
+    contenido = _comando_crear_partner('Ana', CORRELACION_ID)
+
+    assert extraer_id_comando(contenido) == CORRELACION_ID
+    assert extraer_id_comando(_comando_crear_partner('Ana', None)) is None
+    assert extraer_id_comando(f'{{"data": {{"correlacion_id": "{CORRELACION_ID}"}}}}') == CORRELACION_ID
+
+
+def _esquemas(servicio, modulo):
+    """Carga el eventos.py real de otro servicio sin pasar por su paquete ``src``/``modulos``"""
+    ruta = os.path.join(REPO, servicio, *modulo.split('.')) + '.py'
+    spec = importlib.util.spec_from_file_location(f'eventos_{servicio.replace("-", "_")}', ruta)
+    eventos = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(eventos)
+    return eventos
+
+
+def test_correlacion_de_extremo_a_extremo_con_los_esquemas_reales():
+    pytest.importorskip('pulsar')
+    pytest.importorskip('fastavro')  # soporte Avro de pulsar-client
+    from pulsar.schema import AvroSchema
+
+    bff = _esquemas('partners-bff', 'src.infrastructure.eventos.schema.v1.eventos')
+    integraciones = _esquemas(
+        'gestion-de-integraciones', 'modulos.partners.infraestructura.eventos.schema.v1.eventos'
+    )
+
+    # partners-bff publica el comando como lo arma MapeadorComandoCrearPartner
+    comando = bff.ComandoCrearPartner(
+        id=CORRELACION_ID, specversion='v1', type='ComandoCrearPartner',
+        data=bff.CrearPartnerPayload(nombre='Ana', email='ana@example.com', correlacion_id=CORRELACION_ID),
+    )
+    bytes_comando = AvroSchema(bff.ComandoCrearPartner).encode(comando)
+    assert extraer_id_comando(bytes_comando.decode('utf-8')) == CORRELACION_ID
+
+    # gestion-de-integraciones lo consume y publica PartnerCreado con el mismo id
+    recibido = AvroSchema(integraciones.ComandoCrearPartner).decode(bytes_comando)
+    assert recibido.data.correlacion_id == CORRELACION_ID
+    evento = integraciones.EventoPartnerCreado(
+        id=str(uuid.uuid4()), type='PartnerCreado',
+        data=integraciones.PartnerCreadoPayload(
+            partner_id=PARTNER_ID, correlacion_id=recibido.data.correlacion_id
+        ),
+    )
+    contenido = AvroSchema(integraciones.EventoPartnerCreado).encode(evento).decode('utf-8')
+
+    assert extraer_partner_id(contenido) == PARTNER_ID
+    assert extraer_correlacion_id(contenido) == CORRELACION_ID
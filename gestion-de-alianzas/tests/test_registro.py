@@ -0,0 +1,35 @@
+import pytest
+
+from src.modulos.sagas.aplicacion.registro import RegistroSagas
+
+
+class EventoA:
+    pass
+
+
+class EventoB:
+    pass
+
+
+def test_despacha_cada_topico_a_su_parser_y_manejador():
+    recibidos = []
+    registro = RegistroSagas()
+    registro.registrar_saga([
+        ('topico-a', EventoA, lambda contenido: EventoA(), recibidos.append),
+        ('topico-b', EventoB, lambda contenido: EventoB(), recibidos.append),
+    ])
+
+    entrada = registro.entrada('topico-b')
+    entrada.manejador(entrada.parser('{}'))
+
+    assert isinstance(recibidos[0], EventoB)
+    assert registro.topicos() == {'topico-a': EventoA, 'topico-b': EventoB}
+
+
+def test_rechaza_topicos_duplicados_y_desconocidos():
+    registro = RegistroSagas()
+    registro.registrar('topico-a', EventoA, str, print)
+    with pytest.raises(ValueError):
+        registro.registrar('topico-a', EventoB, str, print)
+    with pytest.raises(ValueError):
+        registro.entrada('otro')
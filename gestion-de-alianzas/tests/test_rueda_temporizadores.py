@@ -0,0 +1,62 @@
+import pytest
+
+from src.modulos.sagas.infraestructura.rueda_temporizadores import RuedaTemporizadores
+
+
+def avanzar(rueda, ticks):
+    return sum(rueda.avanzar() for _ in range(ticks))
+
+
+def test_ejecuta_en_el_tick_del_retardo_redondeado_hacia_arriba():
+    rueda = RuedaTemporizadores(resolucion_segundos=1.0, ranuras=8)
+    vencidas = []
+    rueda.programar('a', 2.5, lambda: vencidas.append('a'))
+    rueda.programar('b', 1, lambda: vencidas.append('b'))
+
+    avanzar(rueda, 1)
+    assert vencidas == ['b']
+    avanzar(rueda, 1)
+    assert vencidas == ['b']
+    avanzar(rueda, 1)
+    assert vencidas == ['b', 'a']
+    assert len(rueda) == 0
+
+
+def test_retardos_de_varias_vueltas():
+    rueda = RuedaTemporizadores(resolucion_segundos=1.0, ranuras=4)
+    vencidas = []
+    rueda.programar('a', 4, lambda: vencidas.append('a'))
+    rueda.programar('b', 10, lambda: vencidas.append('b'))
+
+    assert avanzar(rueda, 3) == 0
+    assert avanzar(rueda, 1) == 1
+    assert avanzar(rueda, 5) == 0
+    assert avanzar(rueda, 1) == 1
+    assert vencidas == ['a', 'b']
+
+
+def test_reprogramar_reemplaza_y_cancelar_quita():
+    rueda = RuedaTemporizadores(resolucion_segundos=1.0, ranuras=8)
+    vencidas = []
+    rueda.programar('a', 1, lambda: vencidas.append('primera'))
+    rueda.programar('a', 3, lambda: vencidas.append('segunda'))
+    rueda.programar('b', 1, lambda: vencidas.append('b'))
+    rueda.cancelar('b')
+
+    avanzar(rueda, 3)
+    assert vencidas == ['segunda']
+
+
+def test_un_error_en_una_accion_no_detiene_las_demas():
+    rueda = RuedaTemporizadores(resolucion_segundos=1.0, ranuras=8)
+    vencidas = []
+    rueda.programar('a', 1, lambda: 1 / 0)
+    rueda.programar('b', 1, lambda: vencidas.append('b'))
+
+    assert rueda.avanzar() == 2
+    assert vencidas == ['b']
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        RuedaTemporizadores(resolucion_segundos=0)
@@ -9,6 +9,7 @@ class CrearPartnerDTO:
     email: str
     telefono: Optional[str] = None
     direccion: Optional[str] = None
+    correlacion_id: Optional[str] = None  # id del ComandoCrearPartner que originó la creación
 
 @dataclass
 class ActualizarPartnerDTO:
@@ -70,7 +70,8 @@ class ServicioPartners:
             self.logger.debug("Preparando evento PartnerCreado")
             try:
                 evento = PartnerCreado(
-                    partner_id=partner_guardado.id
+                    partner_id=partner_guardado.id,
+                    correlacion_id=dto.correlacion_id
                 )
                 self.logger.debug(f"Evento PartnerCreado creado: {evento}")
                 
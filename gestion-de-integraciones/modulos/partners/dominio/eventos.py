@@ -19,6 +19,7 @@ class EventoPartner(EventoDominio):
 class PartnerCreado(EventoPartner):
     """Evento disparado cuando se crea un nuevo partner"""
     partner_id: str
+    correlacion_id: Optional[str] = None
     
     def __post_init__(self):
         super().__init__()
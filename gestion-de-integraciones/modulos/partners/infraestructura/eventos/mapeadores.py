@@ -51,7 +51,8 @@ class MapeadorEventoDominioPartner:
     def _entidad_a_partner_creado(self, evento: PartnerCreado, version=LATEST_VERSION) -> EventoPartnerCreadoIntegracion:
         def v1(evento: PartnerCreado):
             payload = PartnerCreadoPayload(
-                partner_id=evento.partner_id
+                partner_id=evento.partner_id,
+                correlacion_id=evento.correlacion_id
             )
             
             evento_integracion = EventoPartnerCreadoIntegracion(
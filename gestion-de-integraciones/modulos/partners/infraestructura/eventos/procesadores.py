@@ -15,7 +15,8 @@ def procesar_comando_crear_partner(evento: ComandoCrearPartner):
         nombre=evento.data.nombre,
         email=evento.data.email,
         telefono=evento.data.telefono,
-        direccion=evento.data.direccion
+        direccion=evento.data.direccion,
+        correlacion_id=evento.data.correlacion_id
     )
 
     servicio_partners.crear_partner(dto)
\ No newline at end of file
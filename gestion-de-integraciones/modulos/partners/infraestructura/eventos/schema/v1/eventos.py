@@ -30,6 +30,8 @@ class PartnerPayload(Record):
 class PartnerCreadoPayload(Record):
     """Payload simplificado para eventos de Partner creado"""
     partner_id = String()
+    # id del ComandoCrearPartner; opcional para mantener compatibilidad del schema
+    correlacion_id = String(required=False)
 
 class PartnerActualizadoPayload(Record):
     """Payload para eventos de Partner actualizado"""
@@ -69,6 +71,9 @@ class CrearPartnerPayload(Record):
     email = String()
     telefono = String(required=False)
     direccion = String(required=False)
+    # id del comando (id de correlación de la saga). Va en el payload porque una subclase
+    # de Record no hereda los campos de EventoIntegracion: el id del sobre no se serializa
+    correlacion_id = String(required=False)
 
 # Eventos de integración específicos
 class ComandoCrearPartner(EventoIntegracion):
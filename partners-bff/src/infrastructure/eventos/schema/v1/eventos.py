@@ -21,6 +21,9 @@ class CrearPartnerPayload(Record):
     email = String()
     telefono = String(required=False)
     direccion = String(required=False)
+    # id del comando (id de correlación de la saga). Va en el payload porque una subclase
+    # de Record no hereda los campos de EventoIntegracion: el id del sobre no se serializa
+    correlacion_id = String(required=False)
 
 # Eventos de integración específicos
 class ComandoCrearPartner(EventoIntegracion):
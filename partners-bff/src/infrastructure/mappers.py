@@ -23,15 +23,17 @@ class MapeadorComandoCrearPartner:
         return version in self.versions
 
     def v1(self, obj: dict):
+        correlacion_id = str(uuid.uuid4())
         payload = CrearPartnerPayload(
             nombre = obj.get("nombre"),
             email = obj.get("email"),
             telefono = obj.get("telefono"),
-            direccion = obj.get("direccion")
+            direccion = obj.get("direccion"),
+            correlacion_id = correlacion_id
         )
         
         evento_integracion = ComandoCrearPartner(
-            id=str(uuid.uuid4()),
+            id=correlacion_id,
             time=unix_time_millis(datetime.now()),
             specversion="v1",
             type="ComandoCrearPartner",
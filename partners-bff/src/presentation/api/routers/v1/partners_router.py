@@ -27,4 +27,5 @@ async def create_partner(partner_data: dict):
         publisher.producer.send(evento)
     finally:
         publisher.close()
-    return {"message": "Evento de creación de partner publicado"}, status.HTTP_202_ACCEPTED
+    # El id de correlación (y de saga) del onboarding viaja en el payload del comando
+    return {"message": "Evento de creación de partner publicado", "correlacion_id": evento.data.correlacion_id}, status.HTTP_202_ACCEPTED